@@ -0,0 +1,90 @@
+"""Benchmark: DataFrame -> question value object mapping throughput.
+
+Compares the previous row-wise path (``df.iterrows()`` + ``from_dataframe_row``) with the
+column-wise mappers in ``src.domain.mappers``.
+
+Usage:
+    python -m benchmarks.bench_mappers [rows]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from src.domain.mappers import map_filter_questions, map_gtk_questions, map_redflag_questions
+from src.domain.value_objects import FilterQuestion, GTKQuestion, RedFlagQuestion
+
+
+def make_redflag_df(rows: int) -> pd.DataFrame:
+    ids = np.arange(1, rows + 1)
+    return pd.DataFrame({
+        "ID": ids,
+        "Category_ID": np.where(ids % 10 == 0, np.nan, ids % 8 + 1),
+        "Category_Name": [f"Category {i % 8}" for i in ids],
+        "RedFLag_ID": ids,
+        "RedFlag_Name": [f"Flag {i}" for i in ids],
+        "Scoring": np.where(ids % 3 == 0, "YES/NO", "Range(0-10)"),
+        "Weight": np.where(ids % 7 == 0, np.nan, (ids % 5) - 2),
+        "Worst_Situation": np.where(ids % 2 == 0, "10", None),
+        "Question_TR": [f"Soru {i}" for i in ids],
+        "Question_EN": [f"Question {i}" for i in ids],
+        "Hint": np.where(ids % 4 == 0, "hint", None),
+    })
+
+
+def make_filter_df(rows: int) -> pd.DataFrame:
+    ids = np.arange(1, rows + 1)
+    return pd.DataFrame({
+        "Filter_ID": ids,
+        "Filter_Name": [f"Filter {i}" for i in ids],
+        "Scoring": np.where(ids % 2 == 0, "YES/NO", "Limit"),
+        "Upper_Limit": ids % 10,
+        "Filter_Question_TR": [f"Filtre {i}" for i in ids],
+        "Filter_Question_EN": [f"Filter question {i}" for i in ids],
+    })
+
+
+def make_gtk_df(rows: int) -> pd.DataFrame:
+    ids = np.arange(1, rows + 1)
+    levels_en = ["['Never', 'Sometimes', 'Often', 'Always']", "['No', 'Yes']", None]
+    levels_tr = ["['Asla', 'Bazen', 'Sik sik', 'Her zaman']", "['Hayir', 'Evet']", None]
+    return pd.DataFrame({
+        "GTK_ID": ids,
+        "GTK_Name": [f"GTK {i}" for i in ids],
+        "Scoring": "Levels",
+        "Levels_TR": [levels_tr[i % 3] for i in ids],
+        "Levels_EN": [levels_en[i % 3] for i in ids],
+        "Question_TR": [f"Soru {i}" for i in ids],
+        "Question_EN": [f"Question {i}" for i in ids],
+        "Hint": None,
+    })
+
+
+def timed(fn, df, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(df)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(rows: int = 10_000):
+    cases = [
+        ("redflag", make_redflag_df(rows), RedFlagQuestion, map_redflag_questions),
+        ("filter", make_filter_df(rows), FilterQuestion, map_filter_questions),
+        ("gtk", make_gtk_df(rows), GTKQuestion, map_gtk_questions),
+    ]
+    print(f"Mapping {rows} rows (best of 3)")
+    print(f"{'table':<10}{'iterrows rows/s':>18}{'bulk rows/s':>16}{'speedup':>10}")
+    for name, df, cls, bulk_mapper in cases:
+        def row_wise(frame, cls=cls):
+            return [cls.from_dataframe_row(row) for _, row in frame.iterrows()]
+
+        assert row_wise(df) == bulk_mapper(df), f"{name}: mappers disagree"
+        row_time = timed(row_wise, df)
+        bulk_time = timed(bulk_mapper, df)
+        print(f"{name:<10}{rows / row_time:>18,.0f}{rows / bulk_time:>16,.0f}{row_time / bulk_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,99 @@
+"""Benchmark: per-session memory footprint of the question lists.
+
+"before": every session holds its own shuffled copies of the question objects as
+plain (dict-backed) dataclasses, as sessions did when they stored
+``randomized_questions`` / ``randomized_filters`` / ``gtk_questions``.
+"after": question objects are slotted, frozen and shared through the catalog cache;
+sessions only keep tuples of question ids.
+
+Usage:
+    python -m benchmarks.bench_session_memory [sessions]
+"""
+import copy
+import dataclasses
+import random
+import sys
+import tracemalloc
+from src.domain.value_objects import FilterQuestion, GTKQuestion, RedFlagQuestion
+
+REDFLAG_COUNT = 75
+FILTER_COUNT = 15
+GTK_COUNT = 10
+
+
+def unslotted(cls):
+    """Plain dataclass with the same fields as cls (the pre-slots layout)."""
+    fields = [(f.name, f.type, f) for f in dataclasses.fields(cls)]
+    return dataclasses.make_dataclass(f"Plain{cls.__name__}", fields)
+
+
+def make_catalog(redflag_cls, filter_cls, gtk_cls):
+    redflags = [
+        redflag_cls(
+            question_id=i, category_id=i % 8, category_name=f"Category {i % 8}",
+            redflag_id=i, redflag_name=f"Flag {i}", scoring="Range(0-10)", weight=1.0,
+            worst_situation="10", question_tr=f"Soru {i}", question_en=f"Question {i}", hint=None,
+        )
+        for i in range(1, REDFLAG_COUNT + 1)
+    ]
+    filters = [
+        filter_cls(
+            filter_id=i, filter_name=f"Filter {i}", scoring="YES/NO", upper_limit=1,
+            question_tr=f"Filtre {i}", question_en=f"Filter question {i}",
+        )
+        for i in range(1, FILTER_COUNT + 1)
+    ]
+    gtks = [
+        gtk_cls(
+            gtk_id=i, gtk_name=f"GTK {i}", scoring="Levels", levels_tr=["Asla", "Bazen", "Her zaman"],
+            levels_en=["Never", "Sometimes", "Always"], question_tr=f"Soru {i}",
+            question_en=f"Question {i}", hint=None,
+        )
+        for i in range(1, GTK_COUNT + 1)
+    ]
+    return redflags, filters, gtks
+
+
+def measure(build_session, sessions: int) -> int:
+    """Bytes allocated for `sessions` session states."""
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    states = [build_session() for _ in range(sessions)]
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(states) == sessions
+    return end - start
+
+
+def main(sessions: int = 1000):
+    plain_catalog = make_catalog(
+        unslotted(RedFlagQuestion), unslotted(FilterQuestion), unslotted(GTKQuestion)
+    )
+    shared_catalog = make_catalog(RedFlagQuestion, FilterQuestion, GTKQuestion)
+
+    def before():
+        redflags, filters, gtks = copy.deepcopy(plain_catalog)
+        return {
+            "randomized_questions": random.sample(redflags, len(redflags)),
+            "randomized_filters": random.sample(filters, len(filters)),
+            "gtk_questions": gtks,
+        }
+
+    def after():
+        redflags, filters, gtks = shared_catalog
+        return {
+            "redflag_question_order": tuple(q.question_id for q in random.sample(redflags, len(redflags))),
+            "filter_question_order": tuple(q.filter_id for q in random.sample(filters, len(filters))),
+            "gtk_question_order": tuple(q.gtk_id for q in gtks),
+        }
+
+    before_bytes = measure(before, sessions)
+    after_bytes = measure(after, sessions)
+    print(f"{sessions} sessions")
+    print(f"before: {before_bytes / sessions:>10,.0f} bytes/session")
+    print(f"after:  {after_bytes / sessions:>10,.0f} bytes/session")
+    print(f"ratio:  {before_bytes / max(after_bytes, 1):>10.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
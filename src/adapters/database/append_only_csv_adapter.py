@@ -0,0 +1,394 @@
+"""Append-only CSV adapter implementation."""
+import json
+import os
+import threading
+from contextlib import ExitStack
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterator, List, Optional, Tuple
+import pandas as pd
+from src.adapters.database.csv_adapter import CSVAdapter, assign_values, normalize_key_value, project_frame
+from src.ports.database_port import DatabasePort
+from src.utils.constants import CSV_SEPARATOR
+from src.utils.file_lock import FileLock
+
+# Compact a table once its change log grows past this size (env: CSV_LOG_COMPACT_BYTES)
+DEFAULT_COMPACT_BYTES = 1024 * 1024
+
+
+def _json_default(value):
+    """Encode values the json module doesn't know (DynamoDB-style Decimals, dates)."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        # numpy scalars
+        return value.item()
+    return str(value)
+
+
+class AppendOnlyCSVAdapter(CSVAdapter):
+    """CSV storage where writes are single appends to a change log.
+
+    Each table is a snapshot ``<table>.csv`` (same format as CSVAdapter) plus a JSON-lines
+    change log ``<table>.log``. add/update/delete append one "add", "update" or "delete"
+    entry to the log, so a write no longer rewrites the whole file. ``load_table`` folds
+    the log into the snapshot, and a background thread compacts the log back into the
+    snapshot once it grows past ``compact_bytes``.
+    """
+
+    # Process-wide folded views: file_path -> (snapshot_signature, log_offset, DataFrame)
+    # and key sets: (file_path, key_column) -> (snapshot_signature, log_offset, {keys})
+    _views = {}
+    _key_sets = {}
+    _views_lock = threading.Lock()
+    _compacting = set()
+
+    def __init__(self, compact_bytes: int = None):
+        super().__init__()
+        if compact_bytes is None:
+            compact_bytes = int(os.getenv("CSV_LOG_COMPACT_BYTES", DEFAULT_COMPACT_BYTES))
+        self.compact_bytes = compact_bytes
+
+    def load_table(
+        self, table_name: str, columns: Optional[List[str]] = None, dtypes: Optional[dict] = None
+    ) -> pd.DataFrame:
+        """Load the snapshot with the change log folded in."""
+        df = self._load_view(table_name)
+        if df is None:
+            file_path = os.path.join(self.data_dir, f"{table_name}.csv")
+            raise FileNotFoundError(f"CSV file not found: {file_path}")
+
+        if columns is not None or dtypes:
+            # reindex/astype return new frames, so the cached view is never shared
+            return project_frame(df if columns is not None else df.copy(), columns, dtypes)
+
+        df = df.copy()
+        if self._should_reorder_columns(table_name, list(df.columns)):
+            reordered_columns = self._reorder_columns(list(df.columns))
+            df = df.reindex(columns=reordered_columns)
+        return df
+
+    def iter_table(self, table_name: str, chunk_size: int = 10000) -> Iterator[pd.DataFrame]:
+        """Slice the folded view (the change log can touch any row, so the snapshot can't be streamed)."""
+        return DatabasePort.iter_table(self, table_name, chunk_size)
+
+    def add_record(self, table_name: str, newdata_dict: dict) -> bool:
+        """Append the record to the change log."""
+        self._append_log(table_name, {"op": "add", "record": newdata_dict})
+        return True
+
+    def update_record(self, table_name: str, key_dict: dict, update_dict: dict) -> None:
+        """Append a patch for the matching records to the change log."""
+        file_path = os.path.join(self.data_dir, f"{table_name}.csv")
+        with FileLock(file_path):
+            if not os.path.exists(file_path) and not os.path.exists(self._log_path(table_name)):
+                raise FileNotFoundError(f"CSV file not found: {file_path}")
+            self._append_log(table_name, {"op": "update", "key": key_dict, "fields": update_dict})
+
+    def update_records(self, table_name: str, updates: List[Tuple[dict, dict]]) -> int:
+        """Append one patch per update to the change log in a single write."""
+        if not updates:
+            return 0
+        file_path = os.path.join(self.data_dir, f"{table_name}.csv")
+        with FileLock(file_path):
+            if not os.path.exists(file_path) and not os.path.exists(self._log_path(table_name)):
+                raise FileNotFoundError(f"CSV file not found: {file_path}")
+            self._append_log_entries(
+                table_name,
+                [{"op": "update", "key": key_dict, "fields": update_dict} for key_dict, update_dict in updates],
+            )
+        return len(updates)
+
+    def write_batch(self, records: List[Tuple[str, dict]], key_column: str = "id") -> bool:
+        """Append the upserts of every table to its change log while holding all table locks."""
+        if not records:
+            return True
+        by_table = {}
+        for table_name, record in records:
+            by_table.setdefault(table_name, []).append(record)
+        paths = {t: os.path.join(self.data_dir, f"{t}.csv") for t in by_table}
+
+        with ExitStack() as stack:
+            # Lock files in a fixed order so concurrent batches can't deadlock
+            for file_path in sorted(paths.values()):
+                stack.enter_context(FileLock(file_path))
+            entries = {}
+            for table_name, table_records in by_table.items():
+                entries[table_name] = []
+                seen = set()
+                for record in table_records:
+                    key_dict = {key_column: record.get(key_column)}
+                    key = normalize_key_value(record.get(key_column))
+                    if key in seen or self.exists(table_name, key_dict):
+                        entries[table_name].append({"op": "update", "key": key_dict, "fields": record})
+                    else:
+                        entries[table_name].append({"op": "add", "record": record})
+                    seen.add(key)
+            for table_name, table_entries in entries.items():
+                self._append_log_entries(table_name, table_entries)
+        return True
+
+    def delete_record(self, table_name: str, record_id: int, id_column: str = "id") -> bool:
+        """Append a tombstone for the record to the change log."""
+        file_path = os.path.join(self.data_dir, f"{table_name}.csv")
+        with FileLock(file_path):
+            if not self.exists(table_name, {id_column: record_id}):
+                # No record found
+                return False
+            self._append_log(table_name, {"op": "delete", "key": {id_column: record_id}})
+            return True
+
+    def get_record(self, table_name: str, key_dict: dict) -> Optional[dict]:
+        """Fetch a single record from the folded view."""
+        df = self._load_view(table_name)
+        if df is None or df.empty or not key_dict:
+            return None
+        mask = self._match(df, key_dict)
+        if mask is None or not mask.any():
+            return None
+        row = df[mask].iloc[0].to_dict()
+        return {
+            k: (None if not isinstance(v, (list, dict)) and pd.isna(v) else v)
+            for k, v in row.items()
+        }
+
+    def query_index(self, table_name: str, key_dict: dict, index_name: Optional[str] = None) -> List[dict]:
+        """Fetch matching records from the folded view."""
+        df = self._load_view(table_name)
+        if df is None or df.empty or not key_dict:
+            return []
+        mask = self._match(df, key_dict)
+        if mask is None or not mask.any():
+            return []
+        return [
+            {k: (None if not isinstance(v, (list, dict)) and pd.isna(v) else v) for k, v in row.items()}
+            for row in df[mask].to_dict("records")
+        ]
+
+    def exists(self, table_name: str, key_dict: dict) -> bool:
+        """Check whether a record exists.
+
+        Single-column keys are looked up in a key set that is extended with the log
+        entries appended since the last call, so upserts and deletes stay O(1) in the
+        table size. Other keys are matched on the folded view.
+        """
+        if len(key_dict) != 1:
+            return self.get_record(table_name, key_dict) is not None
+        key_column, key_value = next(iter(key_dict.items()))
+        keys = self._key_set(table_name, key_column)
+        return keys is not None and normalize_key_value(key_value) in keys
+
+    def get_table_version(self, table_name: str) -> Optional[str]:
+        """Version token from the snapshot and change log sizes/modification times."""
+        tokens = []
+        for path in (os.path.join(self.data_dir, f"{table_name}.csv"), self._log_path(table_name)):
+            try:
+                stat = os.stat(path)
+                tokens.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+            except OSError:
+                tokens.append("-")
+        return "/".join(tokens)
+
+    def compact(self, table_name: str) -> None:
+        """Fold the change log into the snapshot and remove the log."""
+        file_path = os.path.join(self.data_dir, f"{table_name}.csv")
+        log_path = self._log_path(table_name)
+        with FileLock(file_path):
+            if not os.path.exists(log_path):
+                return
+            df = self._load_view(table_name)
+            if self._should_reorder_columns(table_name, list(df.columns)):
+                df = df.reindex(columns=self._reorder_columns(list(df.columns)))
+            tmp_path = f"{file_path}.tmp"
+            df.to_csv(tmp_path, sep=CSV_SEPARATOR, index=False)
+            os.replace(tmp_path, file_path)
+            os.remove(log_path)
+            with self._views_lock:
+                self._views.pop(file_path, None)
+        print(f"[OK] Compacted {table_name} change log")
+
+    def _log_path(self, table_name: str) -> str:
+        return os.path.join(self.data_dir, f"{table_name}.log")
+
+    def _append_log(self, table_name: str, entry: dict) -> None:
+        """Append one change log entry under the table lock."""
+        self._append_log_entries(table_name, [entry])
+
+    def _append_log_entries(self, table_name: str, entries: list) -> None:
+        """Append change log entries under the table lock with a single write."""
+        file_path = os.path.join(self.data_dir, f"{table_name}.csv")
+        log_path = self._log_path(table_name)
+        lines = "".join(json.dumps(entry, default=_json_default) + "\n" for entry in entries)
+        with FileLock(file_path):
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+            log_size = os.path.getsize(log_path)
+        if log_size >= self.compact_bytes:
+            self._schedule_compaction(table_name)
+
+    def _schedule_compaction(self, table_name: str) -> None:
+        """Start a background compaction unless one is already running for this table."""
+        file_path = os.path.join(self.data_dir, f"{table_name}.csv")
+        with self._views_lock:
+            if file_path in self._compacting:
+                return
+            self._compacting.add(file_path)
+
+        def run():
+            try:
+                self.compact(table_name)
+            except Exception as e:
+                print(f"[WARNING] Could not compact {table_name}: {e}")
+            finally:
+                with self._views_lock:
+                    self._compacting.discard(file_path)
+
+        threading.Thread(target=run, name=f"compact-{table_name}", daemon=True).start()
+
+    def _load_view(self, table_name: str) -> Optional[pd.DataFrame]:
+        """Return the folded view of a table (None if the table doesn't exist).
+
+        The view is cached per file and only the log entries appended since the last
+        call are applied, so repeated reads don't re-parse the snapshot.
+        """
+        file_path = os.path.join(self.data_dir, f"{table_name}.csv")
+        log_path = self._log_path(table_name)
+        with FileLock(file_path):
+            has_snapshot = os.path.exists(file_path)
+            if not has_snapshot and not os.path.exists(log_path):
+                return None
+
+            if has_snapshot:
+                stat = os.stat(file_path)
+                signature = (stat.st_mtime_ns, stat.st_size)
+            else:
+                signature = None
+
+            cached = self._views.get(file_path)
+            if cached is not None and cached[0] == signature:
+                _, offset, df = cached
+            else:
+                offset = 0
+                df = pd.read_csv(file_path, sep=CSV_SEPARATOR) if has_snapshot else pd.DataFrame()
+
+            if os.path.exists(log_path):
+                with open(log_path, "r", encoding="utf-8") as f:
+                    f.seek(offset)
+                    entries = [json.loads(line) for line in f if line.strip()]
+                    offset = f.tell()
+                df = self._apply_entries(df, entries)
+
+            with self._views_lock:
+                self._views[file_path] = (signature, offset, df)
+            return df
+
+    def _key_set(self, table_name: str, key_column: str) -> Optional[set]:
+        """Return the normalized keys of a table (None if the table doesn't exist).
+
+        The set starts from the snapshot's key index and only the log entries appended
+        since the last call are applied. It is rebuilt when the snapshot changes (e.g.
+        after compaction), and recomputed from the folded view when an entry can't be
+        applied by key alone (a delete by another column, or an update changing the key).
+        """
+        file_path = os.path.join(self.data_dir, f"{table_name}.csv")
+        log_path = self._log_path(table_name)
+        cache_key = (file_path, key_column)
+        with FileLock(file_path):
+            has_snapshot = os.path.exists(file_path)
+            if not has_snapshot and not os.path.exists(log_path):
+                return None
+
+            if has_snapshot:
+                stat = os.stat(file_path)
+                signature = (stat.st_mtime_ns, stat.st_size)
+            else:
+                signature = None
+
+            cached = self._key_sets.get(cache_key)
+            if cached is not None and cached[0] == signature:
+                _, offset, keys = cached
+            else:
+                offset = 0
+                keys = set(self._get_key_index(file_path, key_column)) if has_snapshot else set()
+
+            stale = False
+            if os.path.exists(log_path):
+                with open(log_path, "r", encoding="utf-8") as f:
+                    f.seek(offset)
+                    for line in f:
+                        if line.strip():
+                            stale = not self._apply_key_entry(keys, key_column, json.loads(line)) or stale
+                    offset = f.tell()
+            if stale:
+                df = self._load_view(table_name)
+                keys = set(df[key_column].map(normalize_key_value)) if key_column in df.columns else set()
+
+            with self._views_lock:
+                self._key_sets[cache_key] = (signature, offset, keys)
+            return keys
+
+    @staticmethod
+    def _apply_key_entry(keys: set, key_column: str, entry: dict) -> bool:
+        """Apply one change log entry to a key set; False if it needs the folded view."""
+        op = entry.get("op")
+        if op == "add":
+            keys.add(normalize_key_value(entry["record"].get(key_column)))
+            return True
+        key = entry.get("key", {})
+        if op == "update":
+            if key_column not in entry.get("fields", {}):
+                return True
+            new_key = normalize_key_value(entry["fields"][key_column])
+            if list(key) == [key_column]:
+                old_key = normalize_key_value(key[key_column])
+                if old_key == new_key or old_key not in keys:
+                    return True
+            return False
+        if op == "delete":
+            if list(key) != [key_column]:
+                return False
+            keys.discard(normalize_key_value(key[key_column]))
+        return True
+
+    def _apply_entries(self, df: pd.DataFrame, entries: list) -> pd.DataFrame:
+        """Apply change log entries in order; consecutive adds are concatenated at once."""
+        pending = []
+
+        def flush(frame):
+            if not pending:
+                return frame
+            added = pd.DataFrame(pending)
+            pending.clear()
+            if frame.empty and len(frame.columns) == 0:
+                return added
+            return pd.concat([frame, added], ignore_index=True)
+
+        for entry in entries:
+            op = entry.get("op")
+            if op == "add":
+                pending.append(entry["record"])
+                continue
+            df = flush(df)
+            mask = self._match(df, entry.get("key", {}))
+            if mask is None or not mask.any():
+                continue
+            if op == "update":
+                for k, v in entry.get("fields", {}).items():
+                    assign_values(df, mask, k, v)
+            elif op == "delete":
+                df = df[~mask].reset_index(drop=True)
+        return flush(df)
+
+    @staticmethod
+    def _match(df: pd.DataFrame, key_dict: dict):
+        """Boolean mask of rows matching all key columns (None if a key column is missing)."""
+        if not key_dict:
+            return None
+        mask = pd.Series(True, index=df.index)
+        for k, v in key_dict.items():
+            if k not in df.columns:
+                return None
+            mask &= df[k].map(normalize_key_value) == normalize_key_value(v)
+        return mask
@@ -0,0 +1,86 @@
+"""Process-wide cache for rarely changing catalog tables (questions, filters, categories)."""
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+# Seconds a cached catalog is trusted without re-reading storage (env: CATALOG_CACHE_TTL)
+DEFAULT_TTL_SECONDS = 300
+
+
+class CatalogCache:
+    """Thread-safe cache of mapped catalog values shared by all sessions.
+
+    Entries expire after ``ttl_seconds`` and are dropped early when the backend reports a
+    different version token for the table (e.g. the CSV file changed), or when
+    ``invalidate`` is called. Values are stored as tuples so sessions can't mutate the
+    shared copy.
+    """
+
+    def __init__(self, ttl_seconds: float = None):
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("CATALOG_CACHE_TTL", DEFAULT_TTL_SECONDS))
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> (expires_at, version, value)
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: tuple, loader: Callable[[], list], version: Optional[str] = None) -> tuple:
+        """
+        Return the cached value for key, calling loader on a miss.
+
+        Args:
+            key: Cache key; its last element must be the table name (see invalidate)
+            loader: Function loading the value from storage
+            version: Current version token of the table, or None if the backend has none
+
+        Returns:
+            Cached value as a tuple
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now and entry[1] == version:
+            with self._lock:
+                self._hits += 1
+            return entry[2]
+
+        value = tuple(loader())
+        with self._lock:
+            self._misses += 1
+            self._entries[key] = (now + self.ttl_seconds, version, value)
+        return value
+
+    def invalidate(self, table_name: str = None) -> None:
+        """Drop cached entries of one table, or everything if table_name is None."""
+        with self._lock:
+            if table_name is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[-1] == table_name]:
+                    del self._entries[key]
+
+    def stats(self) -> dict:
+        """Return cache metrics (hits, misses, hit rate and number of entries)."""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / total) if total else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_catalog_cache() -> CatalogCache:
+    """Return the process-wide catalog cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CatalogCache()
+    return _cache
@@ -1,26 +1,150 @@
 """CSV adapter implementation."""
+import csv
+import io
 import os
 import re
+import shutil
+import tempfile
+import threading
+from contextlib import ExitStack
+from typing import Iterator, List, Optional, Tuple
 import pandas as pd
 from src.ports.database_port import DatabasePort
 from src.utils.constants import CSV_SEPARATOR
+from src.utils.file_lock import FileLock
+
+
+def normalize_key_value(value):
+    """Normalize a key value so 123, 123.0, "123" and Decimal("123") compare equal."""
+    if value is None:
+        return None
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    if isinstance(value, str):
+        stripped = value.strip()
+        try:
+            value = float(stripped)
+        except ValueError:
+            return stripped
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return value
+    return int(number) if number.is_integer() else number
+
+
+def assign_values(df: pd.DataFrame, rows, column: str, value) -> None:
+    """
+    Set df.loc[rows, column] = value, adding the column if it is missing.
+
+    Numeric columns are widened to object first: pandas 3 refuses to store a Decimal or
+    str in a float64/int64 column.
+    """
+    if column not in df.columns:
+        df[column] = None
+    elif df[column].dtype != object:
+        df[column] = df[column].astype(object)
+    df.loc[rows, column] = value
+
+
+def project_frame(
+    df: pd.DataFrame, columns: Optional[List[str]] = None, dtypes: Optional[dict] = None
+) -> pd.DataFrame:
+    """Select columns (missing ones become all-NaN) and apply dtypes to a loaded table."""
+    if columns is not None:
+        df = df.reindex(columns=columns)
+    if dtypes:
+        present = {k: v for k, v in dtypes.items() if k in df.columns}
+        if present:
+            df = df.astype(present)
+    return df
+
+
+def scan_rows(file_path: str, columns: tuple) -> Iterator[Tuple[Tuple[int, int], tuple]]:
+    """
+    Yield the byte span and the values of columns for every row of a CSV file.
+
+    Rows are parsed with the csv module, so quoted fields spanning several lines are
+    handled and the spans point at whole records.
+
+    Args:
+        file_path: CSV file written with CSV_SEPARATOR
+        columns: Columns whose values are yielded
+
+    Yields:
+        ((start, end) byte offsets of the row, (value per column...)); nothing if a
+        column is missing
+    """
+    with open(file_path, "rb") as f:
+        header_line = f.readline()
+        header = next(csv.reader([header_line.decode("utf-8")], delimiter=CSV_SEPARATOR), [])
+        try:
+            positions = [header.index(c) for c in columns]
+        except ValueError:
+            return
+        consumed = [len(header_line)]
+
+        def lines():
+            for line in f:
+                consumed[0] += len(line)
+                yield line.decode("utf-8")
+
+        start = consumed[0]
+        for row in csv.reader(lines(), delimiter=CSV_SEPARATOR):
+            end = consumed[0]
+            if row:
+                # Empty fields are missing values, as for pandas
+                yield (start, end), tuple((row[i] or None) if i < len(row) else None for i in positions)
+            start = end
+
+
+def read_rows_at(file_path: str, spans: List[Tuple[int, int]]) -> pd.DataFrame:
+    """Read the rows at byte spans (from scan_rows) of a CSV file with their header."""
+    with open(file_path, "rb") as f:
+        chunks = [f.readline()]
+        for start, end in sorted(spans):
+            f.seek(start)
+            chunks.append(f.read(end - start))
+    return pd.read_csv(io.BytesIO(b"".join(chunks)), sep=CSV_SEPARATOR)
 
 
 class CSVAdapter(DatabasePort):
     """CSV file implementation of DatabasePort."""
 
+    # Process-wide key indexes: (file_path, key_column) -> (file_signature, {key: byte_span})
+    # and attribute indexes: (file_path, (columns...)) -> (file_signature, {values: [byte_spans]})
+    _key_indexes = {}
+    _key_indexes_lock = threading.Lock()
+
     def __init__(self):
         base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
         self.data_dir = os.path.join(base_dir, "data")
         os.makedirs(self.data_dir, exist_ok=True)
 
-    def load_table(self, table_name: str) -> pd.DataFrame:
-        """Load semicolon-separated CSV from data/."""
+    def load_table(
+        self, table_name: str, columns: Optional[List[str]] = None, dtypes: Optional[dict] = None
+    ) -> pd.DataFrame:
+        """Load semicolon-separated CSV from data/.
+
+        With columns, only those columns are parsed (usecols); dtypes are applied while
+        parsing.
+        """
         file_path = os.path.join(self.data_dir, f"{table_name}.csv")
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"CSV file not found: {file_path}")
 
-        df = pd.read_csv(file_path, sep=CSV_SEPARATOR)
+        if columns is not None or dtypes:
+            header = list(pd.read_csv(file_path, sep=CSV_SEPARATOR, nrows=0).columns)
+            usecols = [c for c in columns if c in header] if columns is not None else None
+            dtype = {k: v for k, v in (dtypes or {}).items() if k in header} or None
+            df = pd.read_csv(file_path, sep=CSV_SEPARATOR, usecols=usecols, dtype=dtype)
+            if columns is not None:
+                return project_frame(df, columns, dtypes)
+        else:
+            df = pd.read_csv(file_path, sep=CSV_SEPARATOR)
         
         # Only reorder columns for session response tables that have Q/F columns
         if self._should_reorder_columns(table_name, list(df.columns)):
@@ -29,6 +153,29 @@ class CSVAdapter(DatabasePort):
         
         return df
 
+    def iter_table(self, table_name: str, chunk_size: int = 10000) -> Iterator[pd.DataFrame]:
+        """Read the CSV in chunks of chunk_size rows.
+
+        Writes rewrite the whole file in place, so the chunks are read from a copy taken
+        under the table lock; callers can update the table while iterating (e.g. the
+        re-scoring job) without the reader seeing a half-rewritten file.
+        """
+        file_path = os.path.join(self.data_dir, f"{table_name}.csv")
+        with FileLock(file_path):
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"CSV file not found: {file_path}")
+            fd, snapshot_path = tempfile.mkstemp(prefix=f"{table_name}.", suffix=".csv")
+            os.close(fd)
+            shutil.copyfile(file_path, snapshot_path)
+
+        try:
+            for chunk in pd.read_csv(snapshot_path, sep=CSV_SEPARATOR, chunksize=chunk_size):
+                if self._should_reorder_columns(table_name, list(chunk.columns)):
+                    chunk = chunk.reindex(columns=self._reorder_columns(list(chunk.columns)))
+                yield chunk
+        finally:
+            os.remove(snapshot_path)
+
     def add_record(self, table_name: str, newdata_dict: dict) -> bool:
         """Append record into semicolon-separated CSV in data/.
         
@@ -37,99 +184,374 @@ class CSVAdapter(DatabasePort):
         """
         file_path = os.path.join(self.data_dir, f"{table_name}.csv")
 
-        if os.path.exists(file_path):
-            existing_data = pd.read_csv(file_path, sep=CSV_SEPARATOR)
-            # Get existing columns and reorder them properly
-            existing_columns = list(existing_data.columns)
+        with FileLock(file_path):
+            if os.path.exists(file_path):
+                existing_data = pd.read_csv(file_path, sep=CSV_SEPARATOR)
+                # Get existing columns and reorder them properly
+                existing_columns = list(existing_data.columns)
             
-            # Create new row with all existing columns, filling missing ones with None
-            new_row = {}
-            for col in existing_columns:
-                new_row[col] = newdata_dict.get(col)
+                # Create new row with all existing columns, filling missing ones with None
+                new_row = {}
+                for col in existing_columns:
+                    new_row[col] = newdata_dict.get(col)
             
-            # Add any new columns that don't exist in the file
-            for col, val in newdata_dict.items():
-                if col not in existing_columns:
-                    new_row[col] = val
-                    existing_columns.append(col)
+                # Add any new columns that don't exist in the file
+                for col, val in newdata_dict.items():
+                    if col not in existing_columns:
+                        new_row[col] = val
+                        existing_columns.append(col)
             
-            # Reorder columns only if this table needs Q/F column reordering
-            if self._should_reorder_columns(table_name, existing_columns):
-                reordered_columns = self._reorder_columns(existing_columns)
-            else:
-                reordered_columns = existing_columns
+                # Reorder columns only if this table needs Q/F column reordering
+                if self._should_reorder_columns(table_name, existing_columns):
+                    reordered_columns = self._reorder_columns(existing_columns)
+                else:
+                    reordered_columns = existing_columns
             
-            # Create DataFrame with properly ordered columns
-            temp = pd.DataFrame([new_row], columns=reordered_columns)
-            # Reorder existing data to match
-            existing_data = existing_data.reindex(columns=reordered_columns)
-            updated_data = pd.concat([existing_data, temp], ignore_index=True)
-        else:
-            # First record: use the order from newdata_dict, but reorder Q and F columns if needed
-            columns_list = list(newdata_dict.keys())
-            if self._should_reorder_columns(table_name, columns_list):
-                reordered_columns = self._reorder_columns(columns_list)
+                # Create DataFrame with properly ordered columns
+                temp = pd.DataFrame([new_row], columns=reordered_columns)
+                # Reorder existing data to match
+                existing_data = existing_data.reindex(columns=reordered_columns)
+                updated_data = pd.concat([existing_data, temp], ignore_index=True)
             else:
-                reordered_columns = columns_list
-            temp = pd.DataFrame([newdata_dict], columns=reordered_columns)
-            updated_data = temp
+                # First record: use the order from newdata_dict, but reorder Q and F columns if needed
+                columns_list = list(newdata_dict.keys())
+                if self._should_reorder_columns(table_name, columns_list):
+                    reordered_columns = self._reorder_columns(columns_list)
+                else:
+                    reordered_columns = columns_list
+                temp = pd.DataFrame([newdata_dict], columns=reordered_columns)
+                updated_data = temp
 
-        updated_data.to_csv(file_path, sep=CSV_SEPARATOR, index=False)
-        # Data saved to CSV
-        return True
+            updated_data.to_csv(file_path, sep=CSV_SEPARATOR, index=False)
+            # Data saved to CSV
+            return True
 
     def update_record(self, table_name: str, key_dict: dict, update_dict: dict) -> None:
         """Update record in semicolon-separated CSV."""
         file_path = os.path.join(self.data_dir, f"{table_name}.csv")
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"CSV file not found: {file_path}")
+        with FileLock(file_path):
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"CSV file not found: {file_path}")
 
-        df = pd.read_csv(file_path, sep=CSV_SEPARATOR)
+            df = pd.read_csv(file_path, sep=CSV_SEPARATOR)
 
-        mask = pd.Series(True, index=df.index)
-        for k, v in key_dict.items():
-            mask &= df[k] == v
+            mask = pd.Series(True, index=df.index)
+            for k, v in key_dict.items():
+                # Match keys the way the key index does, so 5, 5.0 and "5" find the same row
+                mask &= df[k].map(normalize_key_value) == normalize_key_value(v)
 
-        if mask.any():
-            for k, v in update_dict.items():
-                df.loc[mask, k] = v
+            if mask.any():
+                for k, v in update_dict.items():
+                    assign_values(df, mask, k, v)
             
-            # Reorder columns only if this table needs Q/F column reordering
-            if self._should_reorder_columns(table_name, list(df.columns)):
-                reordered_columns = self._reorder_columns(list(df.columns))
-                df = df.reindex(columns=reordered_columns)
+                # Reorder columns only if this table needs Q/F column reordering
+                if self._should_reorder_columns(table_name, list(df.columns)):
+                    reordered_columns = self._reorder_columns(list(df.columns))
+                    df = df.reindex(columns=reordered_columns)
             
-            df.to_csv(file_path, sep=CSV_SEPARATOR, index=False)
-            # Record updated in CSV
-        else:
-            # No matching record found
-            pass
+                df.to_csv(file_path, sep=CSV_SEPARATOR, index=False)
+                # Record updated in CSV
+            else:
+                # No matching record found
+                pass
+
+    def update_records(self, table_name: str, updates: List[Tuple[dict, dict]]) -> int:
+        """Apply all updates with a single read and write of the CSV file.
+
+        Rows are located through the first key column; any further key columns are
+        checked on the matched row.
+        """
+        if not updates:
+            return 0
+        file_path = os.path.join(self.data_dir, f"{table_name}.csv")
+        with FileLock(file_path):
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"CSV file not found: {file_path}")
+
+            df = pd.read_csv(file_path, sep=CSV_SEPARATOR)
+            positions = {}
+            applied = 0
+            for key_dict, update_dict in updates:
+                key_column = next(iter(key_dict))
+                if key_column not in df.columns:
+                    continue
+                if key_column not in positions:
+                    positions[key_column] = {}
+                    for position, value in enumerate(df[key_column].tolist()):
+                        positions[key_column].setdefault(normalize_key_value(value), position)
+                position = positions[key_column].get(normalize_key_value(key_dict[key_column]))
+                if position is None:
+                    continue
+                if any(
+                    k not in df.columns or normalize_key_value(df.at[position, k]) != normalize_key_value(v)
+                    for k, v in key_dict.items()
+                ):
+                    continue
+                for k, v in update_dict.items():
+                    assign_values(df, position, k, v)
+                applied += 1
+
+            if applied:
+                if self._should_reorder_columns(table_name, list(df.columns)):
+                    df = df.reindex(columns=self._reorder_columns(list(df.columns)))
+                df.to_csv(file_path, sep=CSV_SEPARATOR, index=False)
+            return applied
 
     def delete_record(self, table_name: str, record_id: int, id_column: str = "id") -> bool:
         """Delete a record from CSV by ID."""
         file_path = os.path.join(self.data_dir, f"{table_name}.csv")
-        if not os.path.exists(file_path):
-            # CSV file not found
-            return False
+        with FileLock(file_path):
+            if not os.path.exists(file_path):
+                # CSV file not found
+                return False
 
-        df = pd.read_csv(file_path, sep=CSV_SEPARATOR)
+            df = pd.read_csv(file_path, sep=CSV_SEPARATOR)
         
-        if id_column not in df.columns:
-            # Column not found
+            if id_column not in df.columns:
+                # Column not found
+                return False
+
+            # Find and delete the record
+            initial_count = len(df)
+            df = df[df[id_column] != record_id]
+            deleted_count = initial_count - len(df)
+
+            if deleted_count > 0:
+                df.to_csv(file_path, sep=CSV_SEPARATOR, index=False)
+                # Deleted record successfully
+                return True
+            else:
+                # No record found
+                return False
+
+    def get_record(self, table_name: str, key_dict: dict) -> Optional[dict]:
+        """Fetch a single record by key using the cached key index.
+
+        The index (key -> byte span of the row) is reused until the file changes. The
+        matching row is then read on its own by seeking to it.
+        """
+        file_path = os.path.join(self.data_dir, f"{table_name}.csv")
+        if not os.path.exists(file_path) or not key_dict:
+            return None
+
+        # Use the first key column for the index; verify the remaining ones on the row
+        key_column, key_value = next(iter(key_dict.items()))
+        index = self._get_key_index(file_path, key_column)
+        span = index.get(normalize_key_value(key_value))
+        if span is None:
+            return None
+
+        row_df = read_rows_at(file_path, [span])
+        if row_df.empty:
+            return None
+        record = {
+            k: (None if not isinstance(v, (list, dict)) and pd.isna(v) else v)
+            for k, v in row_df.iloc[0].to_dict().items()
+        }
+        for k, v in key_dict.items():
+            if normalize_key_value(record.get(k)) != normalize_key_value(v):
+                return None
+        return record
+
+    def exists(self, table_name: str, key_dict: dict) -> bool:
+        """Check whether a record exists using only the key index."""
+        file_path = os.path.join(self.data_dir, f"{table_name}.csv")
+        if not os.path.exists(file_path) or not key_dict:
             return False
+        if len(key_dict) > 1:
+            return self.get_record(table_name, key_dict) is not None
+        key_column, key_value = next(iter(key_dict.items()))
+        return normalize_key_value(key_value) in self._get_key_index(file_path, key_column)
 
-        # Find and delete the record
-        initial_count = len(df)
-        df = df[df[id_column] != record_id]
-        deleted_count = initial_count - len(df)
+    def query_index(self, table_name: str, key_dict: dict, index_name: Optional[str] = None) -> List[dict]:
+        """Fetch matching records through a cached in-memory index on the key_dict columns.
 
-        if deleted_count > 0:
-            df.to_csv(file_path, sep=CSV_SEPARATOR, index=False)
-            # Deleted record successfully
+        The index maps the indexed values to the byte spans of the rows, which are then
+        read on their own.
+        """
+        file_path = os.path.join(self.data_dir, f"{table_name}.csv")
+        if not os.path.exists(file_path) or not key_dict:
+            return []
+
+        columns = tuple(key_dict.keys())
+        index = self._get_attribute_index(file_path, columns)
+        spans = index.get(tuple(normalize_key_value(v) for v in key_dict.values()))
+        if not spans:
+            return []
+
+        rows = read_rows_at(file_path, spans)
+        return [
+            {k: (None if not isinstance(v, (list, dict)) and pd.isna(v) else v) for k, v in row.items()}
+            for row in rows.to_dict("records")
+        ]
+
+    def upsert_record(
+        self, table_name: str, record: dict, key_column: str = "id", overwrite: bool = True
+    ) -> bool:
+        """Insert the record, or update the existing row with the same key."""
+        key_dict = {key_column: record.get(key_column)}
+        file_path = os.path.join(self.data_dir, f"{table_name}.csv")
+        with FileLock(file_path):
+            if self.exists(table_name, key_dict):
+                if not overwrite:
+                    return False
+                self.update_record(table_name, key_dict, record)
+                return True
+            return self.add_record(table_name, record)
+
+    def write_batch(self, records: List[Tuple[str, dict]], key_column: str = "id") -> bool:
+        """Upsert records into several CSV files under all of their file locks.
+
+        Every file is read once and written to a temporary file before any of them is
+        replaced, so a failure while preparing the batch leaves all tables untouched.
+        """
+        if not records:
             return True
-        else:
-            # No record found
-            return False
+        by_table = {}
+        for table_name, record in records:
+            by_table.setdefault(table_name, []).append(record)
+        paths = {t: os.path.join(self.data_dir, f"{t}.csv") for t in by_table}
+
+        with ExitStack() as stack:
+            # Lock files in a fixed order so concurrent batches can't deadlock
+            for file_path in sorted(paths.values()):
+                stack.enter_context(FileLock(file_path))
+            staged = []
+            try:
+                for table_name, table_records in by_table.items():
+                    file_path = paths[table_name]
+                    if os.path.exists(file_path):
+                        df = pd.read_csv(file_path, sep=CSV_SEPARATOR)
+                    else:
+                        df = pd.DataFrame()
+                    df = self._upsert_rows(table_name, df, table_records, key_column)
+                    temp_path = f"{file_path}.tmp"
+                    df.to_csv(temp_path, sep=CSV_SEPARATOR, index=False)
+                    staged.append((temp_path, file_path))
+            except Exception as e:
+                for temp_path, _ in staged:
+                    os.remove(temp_path)
+                print(f"[ERROR] Could not write batch: {e}")
+                return False
+            for temp_path, file_path in staged:
+                os.replace(temp_path, file_path)
+        return True
+
+    def _upsert_rows(
+        self, table_name: str, df: pd.DataFrame, records: List[dict], key_column: str
+    ) -> pd.DataFrame:
+        """Update rows whose key matches a record and append the other records."""
+        positions = {}
+        if key_column in df.columns:
+            for position, value in enumerate(df[key_column].tolist()):
+                positions.setdefault(normalize_key_value(value), position)
+
+        new_rows = []
+        for record in records:
+            position = positions.get(normalize_key_value(record.get(key_column)))
+            if position is None:
+                positions[normalize_key_value(record.get(key_column))] = len(df) + len(new_rows)
+                new_rows.append(dict(record))
+                continue
+            if position >= len(df):
+                # Same key twice in one batch: the later record wins
+                new_rows[position - len(df)].update(record)
+                continue
+            for k, v in record.items():
+                assign_values(df, position, k, v)
+
+        columns = list(df.columns)
+        for record in new_rows:
+            columns.extend(k for k in record if k not in columns)
+        if new_rows:
+            df = pd.concat([df, pd.DataFrame(new_rows)], ignore_index=True) if len(df) else pd.DataFrame(new_rows)
+        if self._should_reorder_columns(table_name, columns):
+            columns = self._reorder_columns(columns)
+        return df.reindex(columns=columns)
+
+    def update_aggregates(
+        self,
+        table_name: str,
+        key_dict: dict,
+        increments: Optional[dict] = None,
+        minimums: Optional[dict] = None,
+        maximums: Optional[dict] = None,
+        sets: Optional[dict] = None,
+    ) -> Optional[dict]:
+        """Apply counters and min/max to a record as one read-modify-write under a file lock."""
+        file_path = os.path.join(self.data_dir, f"{table_name}.csv")
+        with FileLock(file_path):
+            record = self.get_record(table_name, key_dict)
+            is_new = record is None
+            if is_new:
+                record = dict(key_dict)
+
+            for field, value in (increments or {}).items():
+                current = normalize_key_value(record.get(field))
+                record[field] = (current if current is not None else 0) + normalize_key_value(value)
+            for field, value in (minimums or {}).items():
+                current = normalize_key_value(record.get(field))
+                value = normalize_key_value(value)
+                if current is None or current > value:
+                    record[field] = value
+            for field, value in (maximums or {}).items():
+                current = normalize_key_value(record.get(field))
+                value = normalize_key_value(value)
+                if current is None or current < value:
+                    record[field] = value
+            record.update(sets or {})
+
+            if is_new:
+                self.add_record(table_name, record)
+            else:
+                self.update_record(table_name, key_dict, record)
+            return record
+
+    def get_table_version(self, table_name: str) -> Optional[str]:
+        """Version token from the CSV file's modification time and size."""
+        file_path = os.path.join(self.data_dir, f"{table_name}.csv")
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def _get_key_index(self, file_path: str, key_column: str) -> dict:
+        """Return {normalized key: byte span of the row} for a CSV file, rebuilding it if the file changed."""
+        stat = os.stat(file_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cache_key = (file_path, key_column)
+
+        cached = self._key_indexes.get(cache_key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        index = {}
+        for span, (value,) in scan_rows(file_path, (key_column,)):
+            # Keep the first occurrence, matching the previous "first match" behaviour
+            index.setdefault(normalize_key_value(value), span)
+
+        with self._key_indexes_lock:
+            self._key_indexes[cache_key] = (signature, index)
+        return index
+
+    def _get_attribute_index(self, file_path: str, columns: tuple) -> dict:
+        """Return {normalized values of columns: [byte spans of the rows]}, rebuilding it if the file changed."""
+        stat = os.stat(file_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cache_key = (file_path, columns)
+
+        cached = self._key_indexes.get(cache_key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        index = {}
+        for span, row in scan_rows(file_path, columns):
+            index.setdefault(tuple(normalize_key_value(v) for v in row), []).append(span)
+
+        with self._key_indexes_lock:
+            self._key_indexes[cache_key] = (signature, index)
+        return index
 
     def _should_reorder_columns(self, table_name: str, columns: list) -> bool:
         """
@@ -1,41 +1,115 @@
 """Database handler factory that selects the appropriate adapter."""
+import os
 from src.ports.database_port import DatabasePort
 from src.adapters.database.dynamodb_adapter import DynamoDBAdapter
 from src.adapters.database.csv_adapter import CSVAdapter
+from src.adapters.database.append_only_csv_adapter import AppendOnlyCSVAdapter
+from src.adapters.database.sqlite_adapter import SQLiteAdapter
+from src.adapters.database.catalog_cache import get_catalog_cache
+
+# Local (non-DynamoDB) storage backends, selected with LOCAL_DB_BACKEND
+LOCAL_BACKENDS = {
+    "csv": CSVAdapter,
+    "csv_append": AppendOnlyCSVAdapter,
+    "sqlite": SQLiteAdapter,
+}
+DEFAULT_LOCAL_BACKEND = "csv"
 
 
 class DatabaseHandler:
-    """Factory that creates the appropriate database adapter based on configuration."""
+    """Factory that creates the appropriate database adapter based on configuration.
+
+    Writes through the handler invalidate cached catalog copies of the written table.
+    """
 
-    def __init__(self, db_read_allowed: bool = False, db_write_allowed: bool = False):
+    def __init__(self, db_read_allowed: bool = False, db_write_allowed: bool = False, local_backend: str = None):
         """
         Initialize database handler.
         
         Args:
             db_read_allowed: If True, use DynamoDB for reads
             db_write_allowed: If True, use DynamoDB for writes
+            local_backend: Local storage used when DynamoDB is disabled, one of
+                LOCAL_BACKENDS (env: LOCAL_DB_BACKEND, default "csv")
         """
         if db_read_allowed or db_write_allowed:
             self.backend: DatabasePort = DynamoDBAdapter()
         else:
-            self.backend: DatabasePort = CSVAdapter()
+            if local_backend is None:
+                local_backend = os.getenv("LOCAL_DB_BACKEND", DEFAULT_LOCAL_BACKEND)
+            if local_backend not in LOCAL_BACKENDS:
+                raise ValueError(
+                    f"Unknown local backend: {local_backend}. Choose from {sorted(LOCAL_BACKENDS)}"
+                )
+            self.backend: DatabasePort = LOCAL_BACKENDS[local_backend]()
+
+    def load_table(self, table_name: str, columns: list = None, dtypes: dict = None):
+        """Load data from a table (optionally only some columns, with the given dtypes)."""
+        return self.backend.load_table(table_name, columns=columns, dtypes=dtypes)
 
-    def load_table(self, table_name: str):
-        """Load data from a table."""
-        return self.backend.load_table(table_name)
+    def iter_table(self, table_name: str, chunk_size: int = 10000):
+        """Yield the rows of a table in DataFrame chunks."""
+        return self.backend.iter_table(table_name, chunk_size)
 
     def add_record(self, table_name: str, newdata_dict: dict):
         """Add a new record to a table."""
+        get_catalog_cache().invalidate(table_name)
         return self.backend.add_record(table_name, newdata_dict)
 
     def update_record(self, table_name: str, key_dict: dict, update_dict: dict):
         """Update an existing record in a table."""
+        get_catalog_cache().invalidate(table_name)
         return self.backend.update_record(table_name, key_dict, update_dict)
 
+    def update_records(self, table_name: str, updates: list) -> int:
+        """Apply many (key_dict, update_dict) updates to one table."""
+        get_catalog_cache().invalidate(table_name)
+        return self.backend.update_records(table_name, updates)
+
     def delete_record(self, table_name: str, record_id: int, id_column: str = "id") -> bool:
         """Delete a record from a table by ID."""
+        get_catalog_cache().invalidate(table_name)
         return self.backend.delete_record(table_name, record_id, id_column)
 
+    def get_record(self, table_name: str, key_dict: dict):
+        """Fetch a single record by its primary key."""
+        return self.backend.get_record(table_name, key_dict)
+
+    def exists(self, table_name: str, key_dict: dict) -> bool:
+        """Check whether a record with the given primary key exists."""
+        return self.backend.exists(table_name, key_dict)
+
+    def query_index(self, table_name: str, key_dict: dict, index_name: str = None) -> list:
+        """Fetch all records whose attributes equal key_dict using a secondary index."""
+        return self.backend.query_index(table_name, key_dict, index_name)
+
+    def upsert_record(self, table_name: str, record: dict, key_column: str = "id", overwrite: bool = True) -> bool:
+        """Insert a record, or replace the existing record with the same key."""
+        get_catalog_cache().invalidate(table_name)
+        return self.backend.upsert_record(table_name, record, key_column, overwrite)
+
+    def write_batch(self, records: list, key_column: str = "id") -> bool:
+        """Write (table_name, record) pairs to several tables as one unit."""
+        for table_name in {table_name for table_name, _ in records}:
+            get_catalog_cache().invalidate(table_name)
+        return self.backend.write_batch(records, key_column)
+
+    def update_aggregates(
+        self,
+        table_name: str,
+        key_dict: dict,
+        increments: dict = None,
+        minimums: dict = None,
+        maximums: dict = None,
+        sets: dict = None,
+    ):
+        """Atomically update counters and running min/max values of one record."""
+        return self.backend.update_aggregates(table_name, key_dict, increments, minimums, maximums, sets)
+
+    def get_table_version(self, table_name: str):
+        """Return a token that changes whenever the table changes (None if unsupported)."""
+        return self.backend.get_table_version(table_name)
+
     def close(self):
         """Close the database connection."""
         self.backend.close()
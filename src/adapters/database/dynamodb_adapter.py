@@ -1,35 +1,178 @@
 """DynamoDB adapter implementation."""
+import os
+import queue
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Iterator, List, Optional, Tuple
 import pandas as pd
+from boto3.dynamodb.types import TypeSerializer
+from src.adapters.database.csv_adapter import project_frame
+from src.adapters.database.table_schema import find_index
 from src.infrastructure.connection_manager import ConnectionManager
 from src.ports.database_port import DatabasePort
 
+# Parallel scan segments used for full-table reads (env: DYNAMODB_SCAN_SEGMENTS)
+DEFAULT_SCAN_SEGMENTS = 1
+# Most items a single TransactWriteItems call accepts
+MAX_TRANSACTION_ITEMS = 100
+
+
+def _decimals_to_numbers(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert object columns holding only Decimals (and missing values) to numeric dtypes.
+
+    Each column is converted with one vectorized ``pd.to_numeric`` call instead of a
+    per-cell ``float()``. Columns of whole numbers without gaps (ids, counters) become
+    int64, the others float64. Columns mixing Decimals with other types are left as is.
+    """
+    for column in df.columns:
+        series = df[column]
+        if series.dtype != object or pd.api.types.infer_dtype(series, skipna=True) != "decimal":
+            continue
+        numbers = pd.to_numeric(series, errors="coerce")
+        if not numbers.isna().any() and (numbers % 1 == 0).all():
+            numbers = numbers.astype("int64")
+        df[column] = numbers
+    return df
+
 
 class DynamoDBAdapter(DatabasePort):
-    """DynamoDB implementation of DatabasePort."""
+    """DynamoDB implementation of DatabasePort.
+
+    Full-table reads can use a parallel scan: the table is split into ``scan_segments``
+    segments (Segment/TotalSegments) scanned by a thread pool, and pages are handed to the
+    reader through a bounded queue so ``iter_table`` never holds more than a few pages
+    per segment in memory. Each worker scans through its own thread's resource.
+    """
 
-    def __init__(self):
+    def __init__(self, scan_segments: int = None):
+        """
+        Initialize DynamoDB adapter.
+
+        Args:
+            scan_segments: Number of parallel scan segments for full-table reads
+                (env: DYNAMODB_SCAN_SEGMENTS, default 1 = serial scan)
+        """
+        # Uses the process-wide connection pool, so construction is cheap after the first call
         self.conn_manager = ConnectionManager()
         self.dynamodb = self.conn_manager.connect()
+        self.client = self.conn_manager.client
+        if scan_segments is None:
+            scan_segments = int(os.getenv("DYNAMODB_SCAN_SEGMENTS", DEFAULT_SCAN_SEGMENTS))
+        self.scan_segments = max(1, scan_segments)
 
-    def load_table(self, table_name: str) -> pd.DataFrame:
-        table = self.dynamodb.Table(table_name)
-        response = table.scan()
-        items = response["Items"]
+    def load_table(
+        self,
+        table_name: str,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[dict] = None,
+        segments: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Scan the whole table into a DataFrame.
 
-        while "LastEvaluatedKey" in response:
-            response = table.scan(ExclusiveStartKey=response["LastEvaluatedKey"])
-            items.extend(response["Items"])
+        Number attributes come back from DynamoDB as Decimals; they are converted to
+        int64/float64 columns (see ``_to_frame``).
 
-        df = pd.DataFrame(items).reset_index(drop=True)
-        
+        Args:
+            table_name: Name of the table
+            columns: Only fetch these attributes (ProjectionExpression); all if None
+            dtypes: Optional {column: dtype} applied after loading
+            segments: Parallel scan segments (defaults to the adapter's scan_segments)
+        """
+        items = []
+        for page in self._scan_pages(table_name, columns, segments):
+            items.extend(page)
+        return project_frame(self._to_frame(table_name, items, columns), dtypes=dtypes)
+
+    def iter_table(
+        self,
+        table_name: str,
+        chunk_size: int = 10000,
+        columns: Optional[List[str]] = None,
+        segments: Optional[int] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Scan the table, yielding a DataFrame whenever chunk_size items have been read."""
+        items = []
+        for page in self._scan_pages(table_name, columns, segments):
+            items.extend(page)
+            while len(items) >= chunk_size:
+                yield self._to_frame(table_name, items[:chunk_size], columns)
+                items = items[chunk_size:]
+        if items:
+            yield self._to_frame(table_name, items, columns)
+
+    def _to_frame(self, table_name: str, items: list, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Build a DataFrame from scanned items with number attributes as numeric columns."""
+        df = _decimals_to_numbers(pd.DataFrame(items).reset_index(drop=True))
+        if columns:
+            return df.reindex(columns=columns)
         # Only reorder columns for session response tables that have Q/F columns
         if not df.empty and self._should_reorder_columns(table_name, list(df.columns)):
-            reordered_columns = self._reorder_columns(list(df.columns))
-            df = df.reindex(columns=reordered_columns)
-        
+            df = df.reindex(columns=self._reorder_columns(list(df.columns)))
         return df
 
+    def _scan_pages(
+        self, table_name: str, columns: Optional[List[str]] = None, segments: Optional[int] = None
+    ) -> Iterator[list]:
+        """Yield scan pages (lists of items), from parallel segments if segments > 1."""
+        segments = self.scan_segments if segments is None else max(1, segments)
+        scan_kwargs = {}
+        if columns:
+            names = {f"#c{i}": column for i, column in enumerate(columns)}
+            scan_kwargs["ProjectionExpression"] = ", ".join(names.keys())
+            scan_kwargs["ExpressionAttributeNames"] = names
+
+        if segments == 1:
+            yield from self._segment_pages(table_name, scan_kwargs)
+            return
+
+        pages = queue.Queue(maxsize=segments * 2)
+        stop = threading.Event()
+        done = object()
+
+        def scan_segment(segment):
+            try:
+                segment_kwargs = dict(scan_kwargs, Segment=segment, TotalSegments=segments)
+                for page in self._segment_pages(table_name, segment_kwargs):
+                    if stop.is_set():
+                        return
+                    pages.put(page)
+            except Exception as e:
+                pages.put(e)
+            finally:
+                pages.put(done)
+
+        finished = 0
+        with ThreadPoolExecutor(max_workers=segments, thread_name_prefix=f"scan-{table_name}") as executor:
+            for segment in range(segments):
+                executor.submit(scan_segment, segment)
+            try:
+                while finished < segments:
+                    page = pages.get()
+                    if page is done:
+                        finished += 1
+                    elif isinstance(page, Exception):
+                        raise page
+                    else:
+                        yield page
+            finally:
+                # Let workers blocked on the full queue finish when the reader stops early
+                stop.set()
+                while finished < segments:
+                    if pages.get() is done:
+                        finished += 1
+
+    def _segment_pages(self, table_name: str, scan_kwargs: dict) -> Iterator[list]:
+        """Yield the pages of one (serial or segment) scan, using the calling thread's resource."""
+        table = self.conn_manager.thread_resource().Table(table_name)
+        response = table.scan(**scan_kwargs)
+        yield response["Items"]
+        while "LastEvaluatedKey" in response:
+            response = table.scan(ExclusiveStartKey=response["LastEvaluatedKey"], **scan_kwargs)
+            yield response["Items"]
+
     def add_record(self, table_name: str, newdata_dict: dict) -> bool:
         try:
             # Reorder dictionary keys only for session response tables with Q/F columns
@@ -97,6 +240,213 @@ class DynamoDBAdapter(DatabasePort):
             # Error deleting DynamoDB record
             return False
 
+    def get_record(self, table_name: str, key_dict: dict) -> Optional[dict]:
+        """Fetch a single item with GetItem (no table scan)."""
+        try:
+            table = self.dynamodb.Table(table_name)
+            response = table.get_item(Key=key_dict)
+            return response.get("Item")
+        except Exception as e:
+            print(f"[WARNING] Could not get record from {table_name}: {e}")
+            return None
+
+    def exists(self, table_name: str, key_dict: dict) -> bool:
+        """Check existence with a GetItem that only projects the key attributes."""
+        try:
+            table = self.dynamodb.Table(table_name)
+            names = {f"#k{i}": k for i, k in enumerate(key_dict.keys())}
+            response = table.get_item(
+                Key=key_dict,
+                ProjectionExpression=", ".join(names.keys()),
+                ExpressionAttributeNames=names,
+            )
+            return "Item" in response
+        except Exception as e:
+            print(f"[WARNING] Could not check record in {table_name}: {e}")
+            return False
+
+    def query_index(self, table_name: str, key_dict: dict, index_name: Optional[str] = None) -> List[dict]:
+        """Query a global secondary index on the key_dict attributes.
+
+        The index is taken from config/dynamodb_tables.yaml when not given. Tables without
+        a matching index (or where it hasn't been created yet) fall back to a filtered scan.
+        """
+        if not key_dict:
+            return []
+        if index_name is None:
+            index_name = find_index(table_name, key_dict.keys())
+
+        table = self.dynamodb.Table(table_name)
+        condition = " AND ".join(f"#k{i} = :k{i}" for i in range(len(key_dict)))
+        expression = {
+            "ExpressionAttributeNames": {f"#k{i}": k for i, k in enumerate(key_dict.keys())},
+            "ExpressionAttributeValues": {f":k{i}": v for i, v in enumerate(key_dict.values())},
+        }
+        if index_name:
+            try:
+                return self._paginate(
+                    table.query, IndexName=index_name, KeyConditionExpression=condition, **expression
+                )
+            except Exception as e:
+                print(f"[WARNING] Could not query {index_name} on {table_name}, scanning instead: {e}")
+        try:
+            return self._paginate(table.scan, FilterExpression=condition, **expression)
+        except Exception as e:
+            print(f"[WARNING] Could not scan {table_name}: {e}")
+            return []
+
+    @staticmethod
+    def _paginate(operation, **kwargs) -> list:
+        """Run a query/scan operation until all pages have been read."""
+        response = operation(**kwargs)
+        items = response["Items"]
+        while "LastEvaluatedKey" in response:
+            response = operation(ExclusiveStartKey=response["LastEvaluatedKey"], **kwargs)
+            items.extend(response["Items"])
+        return items
+
+    def upsert_record(
+        self, table_name: str, record: dict, key_column: str = "id", overwrite: bool = True
+    ) -> bool:
+        """Write a record with a single PutItem.
+
+        PutItem replaces any existing item with the same key, so no existence check is
+        needed. With overwrite=False the put is conditional on the key not existing yet.
+        """
+        try:
+            if self._should_reorder_columns(table_name, list(record.keys())):
+                record = self._reorder_dict_keys(record)
+
+            table = self.dynamodb.Table(table_name)
+            if overwrite:
+                table.put_item(Item=record)
+            else:
+                table.put_item(
+                    Item=record,
+                    ConditionExpression="attribute_not_exists(#k)",
+                    ExpressionAttributeNames={"#k": key_column},
+                )
+            return True
+        except self.client.exceptions.ConditionalCheckFailedException:
+            # Record already exists and overwrite is disabled
+            return False
+        except Exception as e:
+            print(f"[ERROR] Could not upsert record into {table_name}: {e}")
+            return False
+
+    def write_batch(self, records: List[Tuple[str, dict]], key_column: str = "id") -> bool:
+        """Write all records with a single TransactWriteItems call (all or none).
+
+        Batches larger than a transaction allows are written per table with batch_writer
+        (BatchWriteItem), which saves round trips but is not atomic.
+        """
+        if not records:
+            return True
+        # A transaction can't touch the same item twice; the later record wins
+        items = {}
+        for table_name, record in records:
+            if self._should_reorder_columns(table_name, list(record.keys())):
+                record = self._reorder_dict_keys(record)
+            record = {k: self._to_number(v) for k, v in record.items()}
+            items[(table_name, str(record.get(key_column)))] = (table_name, record)
+
+        try:
+            if len(items) <= MAX_TRANSACTION_ITEMS:
+                serializer = TypeSerializer()
+                self.client.transact_write_items(
+                    TransactItems=[
+                        {"Put": {
+                            "TableName": table_name,
+                            "Item": {k: serializer.serialize(v) for k, v in record.items()},
+                        }}
+                        for table_name, record in items.values()
+                    ]
+                )
+            else:
+                by_table = {}
+                for table_name, record in items.values():
+                    by_table.setdefault(table_name, []).append(record)
+                for table_name, table_records in by_table.items():
+                    with self.dynamodb.Table(table_name).batch_writer() as batch:
+                        for record in table_records:
+                            batch.put_item(Item=record)
+            return True
+        except Exception as e:
+            print(f"[ERROR] Could not write batch: {e}")
+            return False
+
+    def update_aggregates(
+        self,
+        table_name: str,
+        key_dict: dict,
+        increments: Optional[dict] = None,
+        minimums: Optional[dict] = None,
+        maximums: Optional[dict] = None,
+        sets: Optional[dict] = None,
+    ) -> Optional[dict]:
+        """Apply counters with UpdateExpression ADD and min/max with conditional updates.
+
+        ADD is applied server-side, so concurrent calls never lose increments. Each
+        min/max field is a separate conditional SET that only succeeds when the new
+        value is more extreme than the stored one.
+        """
+        try:
+            table = self.dynamodb.Table(table_name)
+            names, values, add_parts, set_parts = {}, {}, [], []
+            for i, (field, value) in enumerate((increments or {}).items()):
+                names[f"#a{i}"] = field
+                values[f":a{i}"] = self._to_number(value)
+                add_parts.append(f"#a{i} :a{i}")
+            for i, (field, value) in enumerate((sets or {}).items()):
+                names[f"#s{i}"] = field
+                values[f":s{i}"] = self._to_number(value)
+                set_parts.append(f"#s{i} = :s{i}")
+
+            if add_parts or set_parts:
+                expression = " ".join(
+                    part for part in (
+                        ("ADD " + ", ".join(add_parts)) if add_parts else "",
+                        ("SET " + ", ".join(set_parts)) if set_parts else "",
+                    ) if part
+                )
+                response = table.update_item(
+                    Key=key_dict,
+                    UpdateExpression=expression,
+                    ExpressionAttributeNames=names,
+                    ExpressionAttributeValues=values,
+                    ReturnValues="ALL_NEW",
+                )
+                item = response.get("Attributes", {})
+            else:
+                item = self.get_record(table_name, key_dict) or dict(key_dict)
+
+            for fields, operator in ((minimums, ">"), (maximums, "<")):
+                for field, value in (fields or {}).items():
+                    value = self._to_number(value)
+                    try:
+                        table.update_item(
+                            Key=key_dict,
+                            UpdateExpression="SET #f = :v",
+                            ConditionExpression=f"attribute_not_exists(#f) OR #f {operator} :v",
+                            ExpressionAttributeNames={"#f": field},
+                            ExpressionAttributeValues={":v": value},
+                        )
+                        item[field] = value
+                    except self.client.exceptions.ConditionalCheckFailedException:
+                        # Stored value is already more extreme
+                        pass
+            return item
+        except Exception as e:
+            print(f"[ERROR] Could not update aggregates in {table_name}: {e}")
+            return None
+
+    @staticmethod
+    def _to_number(value):
+        """Convert floats to Decimal (DynamoDB does not accept float)."""
+        if isinstance(value, float):
+            return Decimal(str(value))
+        return value
+
     def _should_reorder_columns(self, table_name: str, columns: list) -> bool:
         """
         Check if columns should be reordered for this table.
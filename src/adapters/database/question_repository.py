@@ -1,29 +1,72 @@
 """Repository for loading questions as value objects."""
-from typing import List
+from typing import Dict, List, Optional, Sequence
 import pandas as pd
+from src.adapters.database.catalog_cache import get_catalog_cache
 from src.adapters.database.database_handler import DatabaseHandler
 from src.domain.value_objects import FilterQuestion, RedFlagQuestion, GTKQuestion
 from src.domain.mappers import map_filter_questions, map_redflag_questions, map_gtk_questions
 
 
 class QuestionRepository:
-    """Repository for loading questions from database."""
+    """Repository for loading questions from database.
+
+    Catalogs are mapped once per process and shared through the catalog cache; every
+    getter returns a new list, so callers can shuffle it without affecting other sessions.
+    Sessions keep only the order of question ids and pass it back as ``order`` to get
+    the shared value objects in their own order.
+    """
 
     def __init__(self, db_handler: DatabaseHandler):
         self.db_handler = db_handler
+        self.cache = get_catalog_cache()
+
+    def get_filter_questions(self, order: Optional[Sequence[int]] = None) -> List[FilterQuestion]:
+        """Load filter questions as value objects (in the given filter_id order, if any)."""
+        questions = self._get_cached("RedFlagFilters", map_filter_questions)
+        return self._in_order(questions, order, "filter_id")
+
+    def get_redflag_questions(self, order: Optional[Sequence[int]] = None) -> List[RedFlagQuestion]:
+        """Load redflag questions as value objects (in the given question_id order, if any)."""
+        questions = self._get_cached("RedFlagQuestions", map_redflag_questions)
+        return self._in_order(questions, order, "question_id")
+
+    def get_gtk_questions(self, order: Optional[Sequence[int]] = None) -> List[GTKQuestion]:
+        """Load GTK questions as value objects (in the given gtk_id order, if any)."""
+        questions = self._get_cached("GetToKnowQuestions", map_gtk_questions)
+        return self._in_order(questions, order, "gtk_id")
+
+    def get_category_names(self, language: str = "EN") -> Dict[int, str]:
+        """Load {Category_ID: category name} in the given language from RedFlagCategories."""
+        name_column = "Category_Name_TR" if language == "TR" else "Category_Name_EN"
+
+        def map_categories(df: pd.DataFrame) -> list:
+            if df.empty or "Category_ID" not in df.columns or name_column not in df.columns:
+                return []
+            names = []
+            for cat_id, cat_name in zip(df["Category_ID"], df[name_column]):
+                if pd.notna(cat_id) and pd.notna(cat_name) and str(cat_name):
+                    names.append((int(cat_id), str(cat_name)))
+            return names
 
-    def get_filter_questions(self) -> List[FilterQuestion]:
-        """Load filter questions as value objects."""
-        df = self.db_handler.load_table("RedFlagFilters")
-        return map_filter_questions(df)
+        return dict(self._get_cached("RedFlagCategories", map_categories, variant=name_column))
 
-    def get_redflag_questions(self) -> List[RedFlagQuestion]:
-        """Load redflag questions as value objects."""
-        df = self.db_handler.load_table("RedFlagQuestions")
-        return map_redflag_questions(df)
+    def invalidate_cache(self, table_name: str = None) -> None:
+        """Drop cached catalogs (all of them if table_name is None)."""
+        self.cache.invalidate(table_name)
 
-    def get_gtk_questions(self) -> List[GTKQuestion]:
-        """Load GTK questions as value objects."""
-        df = self.db_handler.load_table("GetToKnowQuestions")
-        return map_gtk_questions(df)
+    @staticmethod
+    def _in_order(questions: tuple, order: Optional[Sequence[int]], id_attr: str) -> list:
+        """Return questions as a list, arranged by an id order (ids no longer in the catalog are skipped)."""
+        if order is None:
+            return list(questions)
+        by_id = {getattr(q, id_attr): q for q in questions}
+        return [by_id[q_id] for q_id in order if q_id in by_id]
 
+    def _get_cached(self, table_name: str, mapper, variant: str = "") -> tuple:
+        backend = self.db_handler.backend
+        key = (type(backend).__name__, getattr(backend, "data_dir", ""), variant, table_name)
+        return self.cache.get(
+            key,
+            lambda: mapper(self.db_handler.load_table(table_name)),
+            version=self.db_handler.get_table_version(table_name),
+        )
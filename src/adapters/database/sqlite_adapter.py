@@ -0,0 +1,399 @@
+"""SQLite adapter implementation."""
+import json
+import math
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Iterator, List, Optional, Tuple
+import pandas as pd
+from src.adapters.database.csv_adapter import CSVAdapter, project_frame
+from src.adapters.database.table_schema import INDEXED_COLUMNS, SESSION_INDEX_COLUMNS, get_table_schema
+from src.ports.database_port import DatabasePort
+from src.utils.constants import CSV_SEPARATOR
+
+DEFAULT_DB_FILE = "runawayguys.db"
+
+
+def _quote(identifier: str) -> str:
+    """Quote a table or column name for use in SQL."""
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def _to_sql_value(value):
+    """Convert a Python/pandas/DynamoDB value into something sqlite3 can store."""
+    if value is None:
+        return None
+    if isinstance(value, Decimal):
+        value = float(value)
+    elif hasattr(value, "item") and not isinstance(value, (list, dict, str)):
+        # numpy scalars
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=str)
+    if isinstance(value, (int, float, str, bytes)):
+        return value
+    return str(value)
+
+
+class SQLiteAdapter(DatabasePort):
+    """SQLite implementation of DatabasePort.
+
+    Tables are created on first write with the primary key from
+    ``config/dynamodb_tables.yaml`` (INTEGER for N keys, TEXT for S keys). Other columns
+    are added on demand, as in DynamoDB, and ``user_id``/``boyfriend_name`` get an index.
+    The database runs in WAL mode so readers don't block the writer. Tables that don't
+    exist yet are seeded once from the matching CSV in data/, if there is one.
+    """
+
+    # Process-wide state shared by adapters on the same database file
+    _local = threading.local()
+    _columns = {}  # (db_path, table_name) -> set of column names
+    _seeded = set()  # (db_path, table_name) already checked for CSV seeding
+    _state_lock = threading.Lock()
+
+    def __init__(self, db_path: str = None):
+        """
+        Initialize SQLite adapter.
+
+        Args:
+            db_path: Path to the database file (env: SQLITE_DB_PATH, default data/runawayguys.db)
+        """
+        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        self.data_dir = os.path.join(base_dir, "data")
+        os.makedirs(self.data_dir, exist_ok=True)
+        if db_path is None:
+            db_path = os.getenv("SQLITE_DB_PATH", os.path.join(self.data_dir, DEFAULT_DB_FILE))
+        self.db_path = db_path
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Connection for the current thread (sqlite3 connections are not shared across threads)."""
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        conn = connections.get(self.db_path)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            connections[self.db_path] = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Run statements in one write transaction (BEGIN IMMEDIATE takes the write lock up front)."""
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            # Columns added in this transaction were rolled back with it
+            with self._state_lock:
+                for cache_key in [k for k in self._columns if k[0] == self.db_path]:
+                    del self._columns[cache_key]
+            raise
+
+    def load_table(
+        self, table_name: str, columns: Optional[List[str]] = None, dtypes: Optional[dict] = None
+    ) -> pd.DataFrame:
+        """Load all rows of a table (only the selected columns, if given)."""
+        if not self._table_exists(table_name):
+            raise FileNotFoundError(f"SQLite table not found: {table_name}")
+
+        if columns is not None:
+            existing = {r["name"] for r in self.conn.execute(f"PRAGMA table_info({_quote(table_name)})")}
+            selected = ", ".join(_quote(c) for c in columns if c in existing) or "NULL AS _empty"
+            df = pd.read_sql_query(f"SELECT {selected} FROM {_quote(table_name)}", self.conn)
+            return project_frame(df, columns, dtypes)
+
+        df = pd.read_sql_query(f"SELECT * FROM {_quote(table_name)}", self.conn)
+        if dtypes:
+            df = project_frame(df, dtypes=dtypes)
+        if CSVAdapter._should_reorder_columns(self, table_name, list(df.columns)):
+            df = df.reindex(columns=CSVAdapter._reorder_columns(self, list(df.columns)))
+        return df
+
+    def iter_table(self, table_name: str, chunk_size: int = 10000) -> Iterator[pd.DataFrame]:
+        """Stream rows from a cursor in chunks of chunk_size rows."""
+        if not self._table_exists(table_name):
+            raise FileNotFoundError(f"SQLite table not found: {table_name}")
+
+        for chunk in pd.read_sql_query(f"SELECT * FROM {_quote(table_name)}", self.conn, chunksize=chunk_size):
+            if CSVAdapter._should_reorder_columns(self, table_name, list(chunk.columns)):
+                chunk = chunk.reindex(columns=CSVAdapter._reorder_columns(self, list(chunk.columns)))
+            yield chunk
+
+    def add_record(self, table_name: str, newdata_dict: dict) -> bool:
+        """Insert a record (replacing any record with the same primary key)."""
+        try:
+            with self._transaction() as conn:
+                self._write_row(conn, table_name, newdata_dict, "INSERT OR REPLACE")
+            return True
+        except Exception as e:
+            print(f"[ERROR] Could not add record to {table_name}: {e}")
+            return False
+
+    def update_record(self, table_name: str, key_dict: dict, update_dict: dict) -> None:
+        """Update the columns of the records matching key_dict."""
+        if not self._table_exists(table_name):
+            raise FileNotFoundError(f"SQLite table not found: {table_name}")
+        if not update_dict:
+            return
+        with self._transaction() as conn:
+            self._ensure_table(conn, table_name, list(update_dict.keys()))
+            where, where_params = self._where(key_dict)
+            assignments = ", ".join(f"{_quote(k)} = ?" for k in update_dict)
+            conn.execute(
+                f"UPDATE {_quote(table_name)} SET {assignments} WHERE {where}",
+                [_to_sql_value(v) for v in update_dict.values()] + where_params,
+            )
+
+    def update_records(self, table_name: str, updates: List[Tuple[dict, dict]]) -> int:
+        """Apply all updates in one transaction."""
+        if not updates:
+            return 0
+        if not self._table_exists(table_name):
+            raise FileNotFoundError(f"SQLite table not found: {table_name}")
+        applied = 0
+        with self._transaction() as conn:
+            columns = list(dict.fromkeys(k for _, update_dict in updates for k in update_dict))
+            self._ensure_table(conn, table_name, columns)
+            for key_dict, update_dict in updates:
+                if not update_dict:
+                    continue
+                where, where_params = self._where(key_dict)
+                assignments = ", ".join(f"{_quote(k)} = ?" for k in update_dict)
+                cursor = conn.execute(
+                    f"UPDATE {_quote(table_name)} SET {assignments} WHERE {where}",
+                    [_to_sql_value(v) for v in update_dict.values()] + where_params,
+                )
+                applied += cursor.rowcount > 0
+        return applied
+
+    def delete_record(self, table_name: str, record_id: int, id_column: str = "id") -> bool:
+        """Delete a record by ID."""
+        if not self._table_exists(table_name):
+            return False
+        try:
+            with self._transaction() as conn:
+                cursor = conn.execute(
+                    f"DELETE FROM {_quote(table_name)} WHERE {_quote(id_column)} = ?",
+                    (_to_sql_value(record_id),),
+                )
+            return cursor.rowcount > 0
+        except sqlite3.OperationalError:
+            # Column not found
+            return False
+
+    def get_record(self, table_name: str, key_dict: dict) -> Optional[dict]:
+        """Fetch a single record by key using the primary key / indexes."""
+        if not key_dict or not self._table_exists(table_name):
+            return None
+        where, params = self._where(key_dict)
+        try:
+            row = self.conn.execute(
+                f"SELECT * FROM {_quote(table_name)} WHERE {where} LIMIT 1", params
+            ).fetchone()
+        except sqlite3.OperationalError as e:
+            print(f"[WARNING] Could not get record from {table_name}: {e}")
+            return None
+        return dict(row) if row is not None else None
+
+    def query_index(self, table_name: str, key_dict: dict, index_name: Optional[str] = None) -> List[dict]:
+        """Fetch matching records using the column indexes."""
+        if not key_dict or not self._table_exists(table_name):
+            return []
+        where, params = self._where(key_dict)
+        try:
+            rows = self.conn.execute(f"SELECT * FROM {_quote(table_name)} WHERE {where}", params).fetchall()
+        except sqlite3.OperationalError as e:
+            print(f"[WARNING] Could not query {table_name}: {e}")
+            return []
+        return [dict(row) for row in rows]
+
+    def exists(self, table_name: str, key_dict: dict) -> bool:
+        """Check whether a record exists without fetching its columns."""
+        if not key_dict or not self._table_exists(table_name):
+            return False
+        where, params = self._where(key_dict)
+        try:
+            row = self.conn.execute(
+                f"SELECT 1 FROM {_quote(table_name)} WHERE {where} LIMIT 1", params
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return False
+        return row is not None
+
+    def upsert_record(
+        self, table_name: str, record: dict, key_column: str = "id", overwrite: bool = True
+    ) -> bool:
+        """Write a record in one statement (INSERT OR REPLACE / INSERT OR IGNORE)."""
+        try:
+            with self._transaction() as conn:
+                cursor = self._write_row(
+                    conn, table_name, record, "INSERT OR REPLACE" if overwrite else "INSERT OR IGNORE"
+                )
+            return cursor.rowcount > 0
+        except Exception as e:
+            print(f"[ERROR] Could not upsert record into {table_name}: {e}")
+            return False
+
+    def write_batch(self, records: List[Tuple[str, dict]], key_column: str = "id") -> bool:
+        """Write all records with INSERT OR REPLACE in one transaction."""
+        if not records:
+            return True
+        try:
+            with self._transaction() as conn:
+                for table_name, record in records:
+                    self._write_row(conn, table_name, record, "INSERT OR REPLACE")
+            return True
+        except Exception as e:
+            print(f"[ERROR] Could not write batch: {e}")
+            return False
+
+    def update_aggregates(
+        self,
+        table_name: str,
+        key_dict: dict,
+        increments: Optional[dict] = None,
+        minimums: Optional[dict] = None,
+        maximums: Optional[dict] = None,
+        sets: Optional[dict] = None,
+    ) -> Optional[dict]:
+        """Apply counters and min/max with a single INSERT ... ON CONFLICT DO UPDATE."""
+        increments, minimums, maximums, sets = increments or {}, minimums or {}, maximums or {}, sets or {}
+        values = {**key_dict, **increments, **minimums, **maximums, **sets}
+        assignments = (
+            [f"{_quote(k)} = COALESCE({_quote(k)}, 0) + excluded.{_quote(k)}" for k in increments]
+            + [f"{_quote(k)} = MIN(COALESCE({_quote(k)}, excluded.{_quote(k)}), excluded.{_quote(k)})" for k in minimums]
+            + [f"{_quote(k)} = MAX(COALESCE({_quote(k)}, excluded.{_quote(k)}), excluded.{_quote(k)})" for k in maximums]
+            + [f"{_quote(k)} = excluded.{_quote(k)}" for k in sets]
+        )
+        try:
+            with self._transaction() as conn:
+                self._ensure_table(conn, table_name, list(values.keys()))
+                columns = ", ".join(_quote(k) for k in values)
+                placeholders = ", ".join("?" for _ in values)
+                conflict = ", ".join(_quote(k) for k in key_dict)
+                action = f"DO UPDATE SET {', '.join(assignments)}" if assignments else "DO NOTHING"
+                conn.execute(
+                    f"INSERT INTO {_quote(table_name)} ({columns}) VALUES ({placeholders}) "
+                    f"ON CONFLICT({conflict}) {action}",
+                    [_to_sql_value(v) for v in values.values()],
+                )
+                where, params = self._where(key_dict)
+                row = conn.execute(
+                    f"SELECT * FROM {_quote(table_name)} WHERE {where}", params
+                ).fetchone()
+            return dict(row) if row is not None else None
+        except Exception as e:
+            print(f"[ERROR] Could not update aggregates in {table_name}: {e}")
+            return None
+
+    def _write_row(self, conn, table_name: str, record: dict, verb: str):
+        """Insert one row with the given INSERT variant, creating missing columns first."""
+        if CSVAdapter._should_reorder_columns(self, table_name, list(record.keys())):
+            record = {k: record[k] for k in CSVAdapter._reorder_columns(self, list(record.keys())) if k in record}
+        self._ensure_table(conn, table_name, list(record.keys()))
+        columns = ", ".join(_quote(k) for k in record)
+        placeholders = ", ".join("?" for _ in record)
+        return conn.execute(
+            f"{verb} INTO {_quote(table_name)} ({columns}) VALUES ({placeholders})",
+            [_to_sql_value(v) for v in record.values()],
+        )
+
+    @staticmethod
+    def _where(key_dict: dict):
+        clause = " AND ".join(f"{_quote(k)} = ?" for k in key_dict)
+        return clause, [_to_sql_value(v) for v in key_dict.values()]
+
+    def _table_exists(self, table_name: str) -> bool:
+        """Check if a table exists, seeding it from data/<table>.csv the first time it is missing."""
+        if (self.db_path, table_name) in self._columns:
+            return True
+        row = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,)
+        ).fetchone()
+        if row is not None:
+            return True
+        return self._seed_from_csv(table_name)
+
+    def _seed_from_csv(self, table_name: str) -> bool:
+        """Create a missing table from the CSV file of the same name (e.g. question catalogs)."""
+        seed_key = (self.db_path, table_name)
+        with self._state_lock:
+            if seed_key in self._seeded:
+                return False
+            self._seeded.add(seed_key)
+
+        csv_path = os.path.join(self.data_dir, f"{table_name}.csv")
+        if not os.path.exists(csv_path):
+            return False
+        df = pd.read_csv(csv_path, sep=CSV_SEPARATOR)
+        if df.empty:
+            return False
+
+        with self._transaction() as conn:
+            self._ensure_table(conn, table_name, list(df.columns))
+            columns = ", ".join(_quote(c) for c in df.columns)
+            placeholders = ", ".join("?" for _ in df.columns)
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {_quote(table_name)} ({columns}) VALUES ({placeholders})",
+                ([_to_sql_value(v) for v in row] for row in df.itertuples(index=False, name=None)),
+            )
+        print(f"[OK] Seeded SQLite table {table_name} from {csv_path} ({len(df)} rows)")
+        return True
+
+    def _ensure_table(self, conn, table_name: str, columns: list) -> None:
+        """Create the table if needed and add any missing columns (inside a write transaction)."""
+        cache_key = (self.db_path, table_name)
+        known = self._columns.get(cache_key)
+        if known is not None and all(c in known for c in columns):
+            return
+
+        existing = [r["name"] for r in conn.execute(f"PRAGMA table_info({_quote(table_name)})")]
+        if not existing:
+            schema = get_table_schema(table_name)
+            key_column = schema["key_column"]
+            key_type = "INTEGER" if schema["key_type"] == "N" else "TEXT"
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {_quote(table_name)} "
+                f"({_quote(key_column)} {key_type} PRIMARY KEY)"
+            )
+            existing = [key_column]
+        self._add_columns(conn, table_name, existing, columns)
+
+    def _add_columns(self, conn, table_name: str, existing: list, columns: list) -> None:
+        known = set(existing)
+        for column in columns:
+            if column in known:
+                continue
+            conn.execute(f"ALTER TABLE {_quote(table_name)} ADD COLUMN {_quote(column)}")
+            known.add(column)
+        for column in INDEXED_COLUMNS:
+            if column in known:
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_quote(f'idx_{table_name}_{column}')} "
+                    f"ON {_quote(table_name)} ({_quote(column)})"
+                )
+        if all(column in known for column in SESSION_INDEX_COLUMNS):
+            # Composite index answering session lookups by user and boyfriend name
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {_quote(f'idx_{table_name}_session')} "
+                f"ON {_quote(table_name)} ({', '.join(_quote(c) for c in SESSION_INDEX_COLUMNS)})"
+            )
+        with self._state_lock:
+            self._columns[(self.db_path, table_name)] = known
+
+    def close(self) -> None:
+        """No-op: connections are kept per thread and reused by later adapters."""
+        pass
@@ -0,0 +1,90 @@
+"""Table schema definitions shared by the local database adapters.
+
+The schema is read from ``config/dynamodb_tables.yaml`` (the same file used to create the
+DynamoDB tables), so every backend agrees on the primary key of each table.
+"""
+import os
+from functools import lru_cache
+from typing import Optional
+import yaml
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+DEFAULT_SCHEMA_FILE = os.path.join(BASE_DIR, "config", "dynamodb_tables.yaml")
+
+# Key used for tables that are not declared in the schema file
+DEFAULT_KEY_COLUMN = "id"
+DEFAULT_KEY_TYPE = "N"
+
+# Non-key columns that get a secondary index wherever they appear
+INDEXED_COLUMNS = ("user_id", "boyfriend_name")
+
+# Global secondary index used to look sessions up by user and boyfriend name
+SESSION_INDEX_NAME = "user_id-boyfriend_name-index"
+SESSION_INDEX_COLUMNS = ("user_id", "boyfriend_name")
+
+
+@lru_cache(maxsize=None)
+def load_table_schemas(schema_file: str = DEFAULT_SCHEMA_FILE) -> dict:
+    """
+    Load table definitions from the DynamoDB tables YAML file.
+
+    Args:
+        schema_file: Path to the YAML file
+
+    Returns:
+        Dictionary {table_name: {"key_column": str, "key_type": "N" | "S",
+        "indexes": {index_name: (hash_column, range_column or None)}}}
+    """
+    if not os.path.exists(schema_file):
+        print(f"[WARNING] Table schema file not found: {schema_file}")
+        return {}
+
+    with open(schema_file, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+
+    schemas = {}
+    for table in config.get("tables", []):
+        hash_keys = [k["AttributeName"] for k in table.get("key_schema", []) if k.get("KeyType") == "HASH"]
+        if not hash_keys:
+            continue
+        key_column = hash_keys[0]
+        attribute_types = {
+            a["AttributeName"]: a.get("AttributeType", DEFAULT_KEY_TYPE)
+            for a in table.get("attribute_definitions", [])
+        }
+        indexes = {}
+        for index in table.get("global_secondary_indexes", []):
+            index_keys = {k["KeyType"]: k["AttributeName"] for k in index.get("KeySchema", [])}
+            if "HASH" in index_keys:
+                indexes[index["IndexName"]] = (index_keys["HASH"], index_keys.get("RANGE"))
+        schemas[table["name"]] = {
+            "key_column": key_column,
+            "key_type": attribute_types.get(key_column, DEFAULT_KEY_TYPE),
+            "indexes": indexes,
+        }
+    return schemas
+
+
+def get_table_schema(table_name: str) -> dict:
+    """Return the schema of a table, falling back to an ``id`` number key."""
+    return load_table_schemas().get(
+        table_name, {"key_column": DEFAULT_KEY_COLUMN, "key_type": DEFAULT_KEY_TYPE, "indexes": {}}
+    )
+
+
+def find_index(table_name: str, columns) -> Optional[str]:
+    """
+    Find a global secondary index whose key columns are exactly the given columns.
+
+    Args:
+        table_name: Name of the table
+        columns: Attribute names of the query (order doesn't matter)
+
+    Returns:
+        Index name, or None if the table has no such index
+    """
+    wanted = set(columns)
+    for index_name, (hash_column, range_column) in get_table_schema(table_name)["indexes"].items():
+        if {hash_column, range_column} - {None} == wanted:
+            return index_name
+    return None
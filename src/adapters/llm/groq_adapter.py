@@ -1,23 +1,51 @@
 """Groq API adapter for LLM."""
-from typing import Optional, List, Tuple
-from src.ports.llm_port import LLMPort
+from typing import Iterator, Optional, List, Tuple
+from src.infrastructure.llm_connection_manager import get_llm_client_pool
+from src.ports.llm_port import LLMPort, StreamInterrupted
 from src.services.insight_prompt_builder import InsightPromptBuilder
+from src.services.llm_rate_limiter import estimate_tokens, get_rate_limiter
 
 try:
     from groq import Groq
 except ImportError:
     Groq = None  # Groq package not installed
 
+try:
+    import httpx  # Installed with groq
+except ImportError:
+    httpx = None
+
 
 class GroqAdapter(LLMPort):
     """Groq API implementation of LLMPort."""
 
-    def __init__(self, api_key: str, model_name: str = "llama-3.1-8b-instant"):
+    def __init__(self, api_key: str, model_name: str = "llama-3.1-8b-instant", timeout: float = None):
         if Groq is None:
             raise ImportError("groq package is not installed. Install it with: pip install groq")
-        self.client = Groq(api_key=api_key)
         self.model_name = model_name
         self.provider = "groq"
+        # The client (and its open HTTP connections) is shared by all sessions
+        pool = get_llm_client_pool()
+        self._pool_key = pool.pool_key(self.provider, model_name, api_key, timeout)
+        self.client = pool.acquire(self._pool_key, lambda: self._build_client(api_key, timeout))
+
+    @staticmethod
+    def _build_client(api_key: str, timeout: float = None):
+        """Create a Groq client whose HTTP connections are kept alive between requests."""
+        kwargs = {"api_key": api_key}
+        if timeout:
+            # Bound each request (the SDK default waits up to 10 minutes); one retry on errors
+            kwargs.update(timeout=timeout, max_retries=1)
+        if httpx is not None:
+            pool = get_llm_client_pool()
+            kwargs["http_client"] = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=pool.max_connections,
+                    max_keepalive_connections=pool.max_connections,
+                    keepalive_expiry=pool.keepalive_expiry,
+                )
+            )
+        return Groq(**kwargs)
 
     def generate_insights(
         self,
@@ -32,40 +60,110 @@ class GroqAdapter(LLMPort):
     ) -> Optional[str]:
         """
         Generate insights using Groq API.
+
+        Raises:
+            RateLimitExceeded: If the provider's rate limit budget isn't available in time
+            StreamInterrupted: If the stream fails after some text was yielded
         """
+        completion_args = self._completion_args(
+            user_name, bf_name, toxic_score, avg_toxic_score, filter_violations,
+            violated_filter_questions, language, top_redflag_questions,
+        )
+        self._wait_for_budget(completion_args)
         try:
-            # Build prompt using InsightPromptBuilder
-            system_msg, user_prompt = InsightPromptBuilder.build_prompt(
-                user_name=user_name,
-                bf_name=bf_name,
-                toxic_score=toxic_score,
-                avg_toxic_score=avg_toxic_score,
-                filter_violations=filter_violations,
-                violated_filter_questions=violated_filter_questions,
-                top_redflag_questions=top_redflag_questions,
-                language=language,
-            )
-
-            chat_completion = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": system_msg
-                    },
-                    {
-                        "role": "user",
-                        "content": user_prompt
-                    }
-                ],
-                model=self.model_name,
-                temperature=1,  # Match Groq console setting
-                max_completion_tokens=150,  # ~100 words (1 token ≈ 0.75 words)
-                top_p=1,  # Match Groq console setting
-            )
+            chat_completion = self.client.chat.completions.create(**completion_args)
 
+            get_llm_client_pool().report_success(self._pool_key)
             return chat_completion.choices[0].message.content.strip()
 
         except Exception as e:
             print(f"[ERROR] Groq API error: {e}")
+            get_llm_client_pool().report_failure(self._pool_key)
             return None
 
+    def stream_insights(
+        self,
+        user_name: str,
+        bf_name: str,
+        toxic_score: float,
+        avg_toxic_score: float,
+        filter_violations: int,
+        violated_filter_questions: Optional[List[Tuple[str, int, str]]] = None,
+        language: str = "EN",
+        top_redflag_questions: Optional[List[Tuple[str, float, str]]] = None,
+    ) -> Iterator[str]:
+        """
+        Stream insights from the Groq API as they are generated.
+
+        Raises:
+            RateLimitExceeded: If the provider's rate limit budget isn't available in time
+        """
+        completion_args = self._completion_args(
+            user_name, bf_name, toxic_score, avg_toxic_score, filter_violations,
+            violated_filter_questions, language, top_redflag_questions,
+        )
+        self._wait_for_budget(completion_args)
+        try:
+            stream = self.client.chat.completions.create(**completion_args, stream=True)
+            started = False
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if not content:
+                    continue
+                if not started:
+                    # Match generate_insights, which strips the completion
+                    content = content.lstrip()
+                    started = bool(content)
+                if content:
+                    yield content
+            get_llm_client_pool().report_success(self._pool_key)
+
+        except Exception as e:
+            print(f"[ERROR] Groq API streaming error: {e}")
+            get_llm_client_pool().report_failure(self._pool_key)
+            if started:
+                raise StreamInterrupted(str(e)) from e
+
+    def _wait_for_budget(self, completion_args: dict) -> None:
+        """Queue for request/token budget with the process-wide rate limiter."""
+        prompt = "".join(message["content"] for message in completion_args["messages"])
+        get_rate_limiter().acquire(
+            self.provider, estimate_tokens(prompt, completion_args["max_completion_tokens"])
+        )
+
+    def _completion_args(
+        self,
+        user_name, bf_name, toxic_score, avg_toxic_score, filter_violations,
+        violated_filter_questions, language, top_redflag_questions,
+    ) -> dict:
+        """Arguments of chat.completions.create for an insights request."""
+        # Build prompt using InsightPromptBuilder
+        system_msg, user_prompt = InsightPromptBuilder.build_prompt(
+            user_name=user_name,
+            bf_name=bf_name,
+            toxic_score=toxic_score,
+            avg_toxic_score=avg_toxic_score,
+            filter_violations=filter_violations,
+            violated_filter_questions=violated_filter_questions,
+            top_redflag_questions=top_redflag_questions,
+            language=language,
+        )
+        return {
+            "messages": [
+                {
+                    "role": "system",
+                    "content": system_msg
+                },
+                {
+                    "role": "user",
+                    "content": user_prompt
+                }
+            ],
+            "model": self.model_name,
+            "temperature": 1,  # Match Groq console setting
+            # ~100 words of English (1 token ≈ 0.75 words), more for Turkish/both languages
+            "max_completion_tokens": InsightPromptBuilder.max_output_tokens(150, language),
+            "top_p": 1,  # Match Groq console setting
+        }
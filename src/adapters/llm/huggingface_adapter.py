@@ -1,39 +1,80 @@
 """Hugging Face Inference API adapter for LLM."""
-from typing import Optional, List, Tuple
-from src.ports.llm_port import LLMPort
+import threading
+from typing import Iterator, Optional, List, Tuple
+from src.infrastructure.llm_connection_manager import get_llm_client_pool
+from src.ports.llm_port import LLMPort, StreamInterrupted
 from src.services.insight_prompt_builder import InsightPromptBuilder
+from src.services.llm_rate_limiter import estimate_tokens, get_rate_limiter
 
 try:
     from huggingface_hub import InferenceClient
 except ImportError:
     InferenceClient = None  # huggingface_hub package not installed
 
+# Inference APIs an insights request can use, in the order they are tried by default
+TEXT_GENERATION = "text_generation"
+CHAT_COMPLETION = "chat_completion"
+API_MODES = (TEXT_GENERATION, CHAT_COMPLETION)
+
+# Most tokens an English response may generate (scaled for other response languages)
+MAX_NEW_TOKENS = 300
+
+# Process-wide cache of the API mode that last worked for each model, so chat-only models
+# don't pay a failed text_generation round trip on every call
+_api_modes = {}
+_api_modes_lock = threading.Lock()
+
+
+def get_api_modes(model_name: str) -> Tuple[str, ...]:
+    """API modes to try for a model, the one known to work first."""
+    with _api_modes_lock:
+        known = _api_modes.get(model_name)
+    if known is None:
+        return API_MODES
+    return (known,) + tuple(mode for mode in API_MODES if mode != known)
+
+
+def remember_api_mode(model_name: str, mode: str) -> None:
+    """Record the API mode that worked for a model."""
+    with _api_modes_lock:
+        _api_modes[model_name] = mode
+
 
 class HuggingFaceAdapter(LLMPort):
     """Hugging Face Inference API implementation of LLMPort."""
 
-    def __init__(self, api_key: str, model_name: str = "gpt2"):
+    def __init__(self, api_key: str, model_name: str = "gpt2", timeout: float = None):
         if InferenceClient is None:
             raise ImportError("huggingface_hub package is not installed. Install it with: pip install huggingface_hub")
-        
+
         self.api_key = api_key
         self.model_name = model_name
         self.provider = "huggingface"
+        # The client (and its open HTTP connections) is shared by all sessions
+        pool = get_llm_client_pool()
+        self._pool_key = pool.pool_key(self.provider, model_name, api_key, timeout)
+        self.client = pool.acquire(self._pool_key, lambda: self._build_client(api_key, model_name, timeout))
+
+    @staticmethod
+    def _build_client(api_key: str, model_name: str, timeout: float = None):
+        """Create an InferenceClient for the model."""
         # Use InferenceClient with 'hf-inference' provider (Hugging Face's own inference service)
         # This is the most reliable option for free tier
         try:
-            self.client = InferenceClient(
+            return InferenceClient(
                 model=model_name,
                 token=api_key,
-                provider="hf-inference"  # Use Hugging Face's own inference service
+                provider="hf-inference",  # Use Hugging Face's own inference service
+                timeout=timeout,  # Seconds per request (None waits indefinitely)
             )
         except Exception as e:
             # Fallback to auto if hf-inference fails
             print(f"[WARNING] hf-inference provider failed, trying auto: {e}")
-            self.client = InferenceClient(
+            return InferenceClient(
                 model=model_name,
                 token=api_key,
-                provider="auto"  # Auto-select from available providers
+                provider="auto",  # Auto-select from available providers
+                timeout=timeout,
             )
 
     def generate_insights(
@@ -49,66 +90,165 @@ class HuggingFaceAdapter(LLMPort):
     ) -> Optional[str]:
         """
         Generate insights using Hugging Face Inference API.
+
+        text_generation (for most models like flan-t5) and chat_completion (for
+        conversational models) are tried in turn, starting with the mode that last
+        worked for this model.
+
+        Raises:
+            RateLimitExceeded: If the provider's rate limit budget isn't available in time
         """
-        try:
-            # Build prompt using InsightPromptBuilder
-            system_msg, user_prompt = InsightPromptBuilder.build_prompt(
-                user_name=user_name,
-                bf_name=bf_name,
-                toxic_score=toxic_score,
-                avg_toxic_score=avg_toxic_score,
-                filter_violations=filter_violations,
-                violated_filter_questions=violated_filter_questions,
-                top_redflag_questions=top_redflag_questions,
-                language=language,
-            )
-            
-            # For text_generation, combine system and user prompt
-            full_prompt = f"{system_msg}\n\n{user_prompt}"
+        # Build prompt using InsightPromptBuilder
+        system_msg, user_prompt = InsightPromptBuilder.build_prompt(
+            user_name=user_name,
+            bf_name=bf_name,
+            toxic_score=toxic_score,
+            avg_toxic_score=avg_toxic_score,
+            filter_violations=filter_violations,
+            violated_filter_questions=violated_filter_questions,
+            top_redflag_questions=top_redflag_questions,
+            language=language,
+        )
 
-            # Try text_generation first (for most models like flan-t5)
-            # Then fallback to chat_completion for conversational models
+        max_tokens = InsightPromptBuilder.max_output_tokens(MAX_NEW_TOKENS, language)
+        self._wait_for_budget(system_msg, user_prompt, max_tokens)
+        first_error = None
+        for mode in get_api_modes(self.model_name):
             try:
-                result = self.client.text_generation(
-                    full_prompt,
-                    max_new_tokens=300,
-                    temperature=0.7,
-                    return_full_text=False,
-                )
-                if result:
-                    return result.strip()
-            except Exception as text_error:
-                # Fallback to chat_completion if text_generation fails (for conversational models)
-                print(f"[INFO] text_generation failed, trying chat_completion: {text_error}")
-                try:
-                    messages = [
-                        {"role": "system", "content": system_msg},
-                        {"role": "user", "content": user_prompt}
-                    ]
-                    response = self.client.chat_completion(
-                        messages=messages,
-                        max_tokens=300,
-                        temperature=0.7,
-                    )
-                    
-                    # Extract the response text from chat completion
-                    if response:
-                        if hasattr(response, 'choices') and len(response.choices) > 0:
-                            return response.choices[0].message.content.strip()
-                        elif isinstance(response, dict):
-                            if 'choices' in response and len(response['choices']) > 0:
-                                return response['choices'][0]['message']['content'].strip()
-                            elif 'generated_text' in response:
-                                return response['generated_text'].strip()
-                        elif isinstance(response, str):
-                            return response.strip()
-                except Exception as chat_error:
-                    print(f"[ERROR] Both text_generation and chat_completion failed: {chat_error}")
-                    raise text_error  # Raise the original error
-            
-            return None
+                if mode == TEXT_GENERATION:
+                    result = self._text_generation(system_msg, user_prompt, max_tokens)
+                else:
+                    result = self._chat_completion(system_msg, user_prompt, max_tokens)
+            except Exception as e:
+                print(f"[INFO] {mode} failed for {self.model_name}: {e}")
+                first_error = first_error or e
+                continue
+            if result:
+                remember_api_mode(self.model_name, mode)
+                get_llm_client_pool().report_success(self._pool_key)
+                return result.strip()
 
-        except Exception as e:
-            print(f"[ERROR] Hugging Face API error: {e}")
-            return None
+        if first_error is not None:
+            print(f"[ERROR] Hugging Face API error: {first_error}")
+            get_llm_client_pool().report_failure(self._pool_key)
+        return None
+
+    def stream_insights(
+        self,
+        user_name: str,
+        bf_name: str,
+        toxic_score: float,
+        avg_toxic_score: float,
+        filter_violations: int,
+        violated_filter_questions: Optional[List[Tuple[str, int, str]]] = None,
+        language: str = "EN",
+        top_redflag_questions: Optional[List[Tuple[str, float, str]]] = None,
+    ) -> Iterator[str]:
+        """
+        Stream insights from the Hugging Face Inference API as they are generated.
+
+        The API modes are tried as in generate_insights, but only while no text has been
+        streamed yet.
+
+        Raises:
+            RateLimitExceeded: If the provider's rate limit budget isn't available in time
+            StreamInterrupted: If the stream fails after some text was yielded
+        """
+        system_msg, user_prompt = InsightPromptBuilder.build_prompt(
+            user_name=user_name,
+            bf_name=bf_name,
+            toxic_score=toxic_score,
+            avg_toxic_score=avg_toxic_score,
+            filter_violations=filter_violations,
+            violated_filter_questions=violated_filter_questions,
+            top_redflag_questions=top_redflag_questions,
+            language=language,
+        )
+        max_tokens = InsightPromptBuilder.max_output_tokens(MAX_NEW_TOKENS, language)
+        self._wait_for_budget(system_msg, user_prompt, max_tokens)
+        started = False
+        for mode in get_api_modes(self.model_name):
+            try:
+                if mode == TEXT_GENERATION:
+                    chunks = self._stream_text_generation(system_msg, user_prompt, max_tokens)
+                else:
+                    chunks = self._stream_chat_completion(system_msg, user_prompt, max_tokens)
+                for content in chunks:
+                    if not started:
+                        content = content.lstrip()
+                    if content:
+                        started = True
+                        yield content
+            except Exception as e:
+                if started:
+                    print(f"[ERROR] Hugging Face API streaming error: {e}")
+                    get_llm_client_pool().report_failure(self._pool_key)
+                    raise StreamInterrupted(str(e)) from e
+                print(f"[INFO] {mode} streaming failed for {self.model_name}: {e}")
+                continue
+            if started:
+                remember_api_mode(self.model_name, mode)
+                get_llm_client_pool().report_success(self._pool_key)
+                return
+        get_llm_client_pool().report_failure(self._pool_key)
+
+    def _wait_for_budget(self, system_msg: str, user_prompt: str, max_tokens: int) -> None:
+        """Queue for request/token budget with the process-wide rate limiter."""
+        get_rate_limiter().acquire(self.provider, estimate_tokens(system_msg + user_prompt, max_tokens))
+
+    def _text_generation(self, system_msg: str, user_prompt: str, max_tokens: int) -> Optional[str]:
+        # For text_generation, combine system and user prompt
+        return self.client.text_generation(
+            f"{system_msg}\n\n{user_prompt}",
+            max_new_tokens=max_tokens,
+            temperature=0.7,
+            return_full_text=False,
+        )
+
+    def _chat_completion(self, system_msg: str, user_prompt: str, max_tokens: int) -> Optional[str]:
+        response = self.client.chat_completion(
+            messages=[
+                {"role": "system", "content": system_msg},
+                {"role": "user", "content": user_prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=0.7,
+        )
+
+        # Extract the response text from chat completion
+        if response:
+            if hasattr(response, 'choices') and len(response.choices) > 0:
+                return response.choices[0].message.content
+            elif isinstance(response, dict):
+                if 'choices' in response and len(response['choices']) > 0:
+                    return response['choices'][0]['message']['content']
+                elif 'generated_text' in response:
+                    return response['generated_text']
+            elif isinstance(response, str):
+                return response
+        return None
+
+    def _stream_text_generation(self, system_msg: str, user_prompt: str, max_tokens: int) -> Iterator[str]:
+        tokens = self.client.text_generation(
+            f"{system_msg}\n\n{user_prompt}",
+            max_new_tokens=max_tokens,
+            temperature=0.7,
+            return_full_text=False,
+            stream=True,
+        )
+        for token in tokens:
+            yield token if isinstance(token, str) else getattr(getattr(token, "token", None), "text", "") or ""
 
+    def _stream_chat_completion(self, system_msg: str, user_prompt: str, max_tokens: int) -> Iterator[str]:
+        chunks = self.client.chat_completion(
+            messages=[
+                {"role": "system", "content": system_msg},
+                {"role": "user", "content": user_prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=0.7,
+            stream=True,
+        )
+        for chunk in chunks:
+            if chunk.choices:
+                yield chunk.choices[0].delta.content or ""
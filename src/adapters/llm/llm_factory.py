@@ -1,9 +1,14 @@
 """Factory for creating LLM adapters."""
+import os
 from typing import Optional
 from src.ports.llm_port import LLMPort
-from src.infrastructure.llm_connection_manager import LLMConnectionManager
+from src.infrastructure.llm_connection_manager import get_llm_client_pool
 from src.adapters.llm.huggingface_adapter import HuggingFaceAdapter
 from src.adapters.llm.groq_adapter import GroqAdapter
+from src.adapters.llm.llm_router import LLMRouter
+
+# Seconds a single LLM request may take (env: LLM_REQUEST_TIMEOUT)
+DEFAULT_REQUEST_TIMEOUT = 20
 
 
 class LLMFactory:
@@ -13,33 +18,58 @@ class LLMFactory:
     def create() -> Optional[LLMPort]:
         """
         Create appropriate LLM adapter based on configuration.
+
+        With several configured providers, an LLMRouter over all of them is returned.
         
         Returns:
             LLM adapter instance or None if not configured
         """
-        conn_manager = LLMConnectionManager()
-        credentials = conn_manager.get_credentials()
+        # Credentials are loaded once per process (see LLMClientPool), not per session
+        all_credentials = get_llm_client_pool().credentials()
+
+        timeout = float(os.getenv("LLM_REQUEST_TIMEOUT", DEFAULT_REQUEST_TIMEOUT))
 
+        if not all_credentials:
+            print("[INFO] LLM not configured. Set HF_API_TOKEN or GROQ_API_KEY environment variables or configure config/llm_credentials.txt")
+            return None
+
+        adapters = [
+            adapter
+            for adapter in (LLMFactory._create_adapter(credentials, timeout) for credentials in all_credentials)
+            if adapter is not None
+        ]
+        if not adapters:
+            return None
+        if len(adapters) == 1:
+            return adapters[0]
+        print(f"[OK] Routing LLM requests over {len(adapters)} providers")
+        return LLMRouter(adapters)
+
+    @staticmethod
+    def _create_adapter(credentials: dict, timeout: float) -> Optional[LLMPort]:
+        """Create the adapter for one provider's credentials (None if unavailable)."""
         provider = credentials.get("provider")
         api_key = credentials.get("api_key")
         model_name = credentials.get("model_name")
 
         print(f"[DEBUG] LLM Factory - provider: {provider}, api_key present: {bool(api_key)}, model: {model_name}")
 
-        if not provider or not api_key:
-            print("[INFO] LLM not configured. Set HF_API_TOKEN or GROQ_API_KEY environment variables or configure config/llm_credentials.txt")
-            return None
-
         if provider == "huggingface":
-            return HuggingFaceAdapter(
-                api_key=api_key,
-                model_name=model_name or "gpt2"
-            )
+            try:
+                return HuggingFaceAdapter(
+                    api_key=api_key,
+                    model_name=model_name or "gpt2",
+                    timeout=timeout,
+                )
+            except ImportError:
+                print("[ERROR] huggingface_hub package not installed. Install it with: pip install huggingface_hub")
+                return None
         elif provider == "groq":
             try:
                 return GroqAdapter(
                     api_key=api_key,
-                    model_name=model_name or "llama-3.1-8b-instant"
+                    model_name=model_name or "llama-3.1-8b-instant",
+                    timeout=timeout,
                 )
             except ImportError:
                 print("[ERROR] groq package not installed. Install it with: pip install groq")
@@ -47,4 +77,3 @@ class LLMFactory:
         else:
             print(f"[WARNING] Unknown LLM provider: {provider}")
             return None
-
@@ -0,0 +1,326 @@
+"""LLM router that spreads insight requests over several configured providers.
+
+Provider health is shared by all sessions of the process: exponentially weighted latency
+and error rate, and a circuit breaker that stops sending requests to a provider after
+consecutive failures until a cooldown has passed (then one trial request decides whether
+it closes again). Requests go to the healthiest provider and fail over to the next one.
+When the chosen provider is slower than LLM_HEDGE_AFTER seconds, the request is also sent
+to the next provider and the first answer wins.
+"""
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.ports.llm_port import LLMPort, StreamInterrupted
+from src.services.llm_rate_limiter import RateLimitExceeded
+
+# Consecutive failures that open a provider's circuit (env: LLM_CIRCUIT_FAILURES)
+DEFAULT_CIRCUIT_FAILURES = 3
+# Seconds an open circuit rejects requests (env: LLM_CIRCUIT_COOLDOWN)
+DEFAULT_CIRCUIT_COOLDOWN = 60
+# Seconds before a slow request is hedged on a second provider, 0 disables (env: LLM_HEDGE_AFTER)
+DEFAULT_HEDGE_AFTER = 10
+# Threads running routed requests, shared by all routers (env: LLM_ROUTER_WORKERS)
+DEFAULT_ROUTER_WORKERS = 8
+
+# Weight of the newest observation in the latency/error averages
+EWMA_ALPHA = 0.2
+# Seconds a provider's ranking is penalized per unit of error rate (a failure costs a
+# wasted round trip and a failover, however fast it fails)
+ERROR_PENALTY_SECONDS = 10.0
+
+
+@dataclass(slots=True)
+class ProviderHealth:
+    """Observed health of one provider/model."""
+
+    latency: Optional[float] = None  # EWMA of request seconds (None until the first request)
+    error_rate: float = 0.0  # EWMA of failures (0-1)
+    consecutive_failures: int = 0
+    open_until: float = 0.0  # time.time() until which the circuit is open
+    trial_in_flight: bool = False  # a half-open trial request is running
+
+    def score(self) -> float:
+        """Ranking score; lower is better (untried providers rank first)."""
+        latency = self.latency if self.latency is not None else 0.0
+        return latency + ERROR_PENALTY_SECONDS * self.error_rate
+
+    def record(self, seconds: float, ok: bool, failure_threshold: int, cooldown: float) -> None:
+        """Update the averages and the circuit with the outcome of one request."""
+        self.latency = seconds if self.latency is None else (
+            EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * self.latency
+        )
+        self.error_rate = EWMA_ALPHA * (0.0 if ok else 1.0) + (1 - EWMA_ALPHA) * self.error_rate
+        self.trial_in_flight = False
+        if ok:
+            self.consecutive_failures = 0
+            self.open_until = 0.0
+            return
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= failure_threshold:
+            self.open_until = time.time() + cooldown
+
+
+_health: Dict[str, ProviderHealth] = {}
+_health_lock = threading.Lock()
+
+_router_executor: Optional[ThreadPoolExecutor] = None
+_router_executor_lock = threading.Lock()
+
+
+def _provider_key(adapter: LLMPort) -> str:
+    return f"{getattr(adapter, 'provider', type(adapter).__name__)}:{getattr(adapter, 'model_name', '')}"
+
+
+def get_provider_health() -> Dict[str, ProviderHealth]:
+    """Return a snapshot of the health of every provider seen by this process."""
+    with _health_lock:
+        return {
+            key: ProviderHealth(h.latency, h.error_rate, h.consecutive_failures, h.open_until, h.trial_in_flight)
+            for key, h in _health.items()
+        }
+
+
+def _get_router_executor() -> ThreadPoolExecutor:
+    # Separate from the insight executor: routed requests are started from its threads
+    global _router_executor
+    if _router_executor is None:
+        with _router_executor_lock:
+            if _router_executor is None:
+                workers = int(os.getenv("LLM_ROUTER_WORKERS", DEFAULT_ROUTER_WORKERS))
+                _router_executor = ThreadPoolExecutor(max_workers=max(2, workers), thread_name_prefix="llm-router")
+    return _router_executor
+
+
+class LLMRouter(LLMPort):
+    """LLMPort that routes each request to one of several adapters."""
+
+    def __init__(
+        self,
+        adapters: List[LLMPort],
+        hedge_after: float = None,
+        failure_threshold: int = None,
+        cooldown: float = None,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            adapters: Configured adapters, in order of preference for equal health
+            hedge_after: Seconds before hedging a slow request (env: LLM_HEDGE_AFTER, 0 disables)
+            failure_threshold: Consecutive failures opening a circuit (env: LLM_CIRCUIT_FAILURES)
+            cooldown: Seconds a circuit stays open (env: LLM_CIRCUIT_COOLDOWN)
+        """
+        if not adapters:
+            raise ValueError("LLMRouter needs at least one adapter")
+        if hedge_after is None:
+            hedge_after = float(os.getenv("LLM_HEDGE_AFTER", DEFAULT_HEDGE_AFTER))
+        if failure_threshold is None:
+            failure_threshold = int(os.getenv("LLM_CIRCUIT_FAILURES", DEFAULT_CIRCUIT_FAILURES))
+        if cooldown is None:
+            cooldown = float(os.getenv("LLM_CIRCUIT_COOLDOWN", DEFAULT_CIRCUIT_COOLDOWN))
+        self.adapters = list(adapters)
+        self.hedge_after = hedge_after
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self._local = threading.local()  # adapter that answered the last request of a thread
+        with _health_lock:
+            for adapter in self.adapters:
+                _health.setdefault(_provider_key(adapter), ProviderHealth())
+
+    @property
+    def provider(self) -> Optional[str]:
+        """Provider of the adapter that answered last on this thread (else the preferred one)."""
+        return getattr(self._current_adapter(), "provider", None)
+
+    @property
+    def model_name(self) -> Optional[str]:
+        """Model of the adapter that answered last on this thread (else the preferred one)."""
+        return getattr(self._current_adapter(), "model_name", None)
+
+    def _current_adapter(self) -> LLMPort:
+        return getattr(self._local, "adapter", None) or self._ranked()[0]
+
+    def _ranked(self) -> List[LLMPort]:
+        """All adapters, healthiest first (stable for equal scores)."""
+        with _health_lock:
+            scores = {id(a): _health[_provider_key(a)].score() for a in self.adapters}
+        return sorted(self.adapters, key=lambda a: scores[id(a)])
+
+    def _candidates(self) -> List[LLMPort]:
+        """Adapters a request may use, best first; reserves half-open trials."""
+        now = time.time()
+        closed, trials = [], []
+        with _health_lock:
+            for adapter in self.adapters:
+                health = _health[_provider_key(adapter)]
+                if health.open_until <= 0:
+                    closed.append((health.score(), adapter))
+                elif health.open_until <= now and not health.trial_in_flight:
+                    # Cooldown passed: let one request through to probe the provider
+                    health.trial_in_flight = True
+                    trials.append(adapter)
+        closed.sort(key=lambda item: item[0])
+        return [adapter for _, adapter in closed] + trials
+
+    def _release(self, adapters: List[LLMPort]) -> None:
+        """Give back half-open trials reserved for adapters that were not called."""
+        with _health_lock:
+            for adapter in adapters:
+                _health[_provider_key(adapter)].trial_in_flight = False
+
+    def _record(self, adapter: LLMPort, seconds: float, ok: bool) -> None:
+        with _health_lock:
+            health = _health[_provider_key(adapter)]
+            was_open = health.open_until > 0
+            health.record(seconds, ok, self.failure_threshold, self.cooldown)
+            opened = not was_open and health.open_until > 0
+        if opened:
+            print(f"[WARNING] LLM provider {_provider_key(adapter)} failing, circuit open for {self.cooldown:.0f}s")
+        elif was_open and ok:
+            print(f"[OK] LLM provider {_provider_key(adapter)} recovered, circuit closed")
+
+    def _call(self, adapter: LLMPort, kwargs: dict) -> Tuple[LLMPort, Optional[str]]:
+        start = time.perf_counter()
+        try:
+            result = adapter.generate_insights(**kwargs)
+        except RateLimitExceeded as e:
+            # Our own limiter said no: not a provider failure, just try the next one
+            print(f"[WARNING] {e}")
+            self._release([adapter])
+            return adapter, None
+        except Exception as e:
+            print(f"[ERROR] LLM provider {_provider_key(adapter)} error: {e}")
+            result = None
+        self._record(adapter, time.perf_counter() - start, bool(result))
+        return adapter, result
+
+    def generate_insights(
+        self,
+        user_name: str,
+        bf_name: str,
+        toxic_score: float,
+        avg_toxic_score: float,
+        filter_violations: int,
+        violated_filter_questions: Optional[List[Tuple[str, int, str]]] = None,
+        language: str = "EN",
+        top_redflag_questions: Optional[List[Tuple[str, float, str]]] = None,
+    ) -> Optional[str]:
+        """
+        Generate insights with the healthiest provider, failing over and hedging as needed.
+        """
+        kwargs = dict(
+            user_name=user_name,
+            bf_name=bf_name,
+            toxic_score=toxic_score,
+            avg_toxic_score=avg_toxic_score,
+            filter_violations=filter_violations,
+            violated_filter_questions=violated_filter_questions,
+            language=language,
+            top_redflag_questions=top_redflag_questions,
+        )
+        self._local.adapter = None
+        remaining = self._candidates()
+        if not remaining:
+            print("[WARNING] All LLM providers are failing (circuits open). Insights generation skipped.")
+            return None
+
+        try:
+            if self.hedge_after <= 0 or len(remaining) == 1:
+                while remaining:
+                    adapter, result = self._call(remaining.pop(0), kwargs)
+                    if result:
+                        self._local.adapter = adapter
+                        return result
+                return None
+
+            executor = _get_router_executor()
+            pending = {executor.submit(self._call, remaining.pop(0), kwargs)}
+            hedged = False
+            while pending:
+                timeout = self.hedge_after if not hedged and remaining else None
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    # The request is slow: send it to the next provider as well
+                    hedged = True
+                    pending.add(executor.submit(self._call, remaining.pop(0), kwargs))
+                    continue
+                for future in done:
+                    adapter, result = future.result()
+                    if result:
+                        # A slower request still running only updates its provider's health
+                        self._local.adapter = adapter
+                        return result
+                if not pending and remaining:
+                    # Failed: fail over to the next provider right away
+                    pending.add(executor.submit(self._call, remaining.pop(0), kwargs))
+            return None
+        finally:
+            self._release(remaining)
+
+    def stream_insights(
+        self,
+        user_name: str,
+        bf_name: str,
+        toxic_score: float,
+        avg_toxic_score: float,
+        filter_violations: int,
+        violated_filter_questions: Optional[List[Tuple[str, int, str]]] = None,
+        language: str = "EN",
+        top_redflag_questions: Optional[List[Tuple[str, float, str]]] = None,
+    ) -> Iterator[str]:
+        """
+        Stream insights from the healthiest provider, failing over while nothing was streamed.
+
+        Streams are not hedged, since chunks of two providers can't be merged.
+
+        Raises:
+            StreamInterrupted: If the provider fails after some text was streamed (counted
+                as a failure of that provider)
+        """
+        kwargs = dict(
+            user_name=user_name,
+            bf_name=bf_name,
+            toxic_score=toxic_score,
+            avg_toxic_score=avg_toxic_score,
+            filter_violations=filter_violations,
+            violated_filter_questions=violated_filter_questions,
+            language=language,
+            top_redflag_questions=top_redflag_questions,
+        )
+        self._local.adapter = None
+        remaining = self._candidates()
+        try:
+            while remaining:
+                adapter = remaining.pop(0)
+                start = time.perf_counter()
+                started = False
+                try:
+                    for chunk in adapter.stream_insights(**kwargs):
+                        started = True
+                        yield chunk
+                except RateLimitExceeded as e:
+                    print(f"[WARNING] {e}")
+                    self._release([adapter])
+                    continue
+                except Exception as e:
+                    print(f"[ERROR] LLM provider {_provider_key(adapter)} streaming error: {e}")
+                    self._record(adapter, time.perf_counter() - start, False)
+                    if started:
+                        # Another provider's chunks can't continue this text
+                        raise StreamInterrupted(str(e)) from e
+                    continue
+                self._record(adapter, time.perf_counter() - start, started)
+                if started:
+                    self._local.adapter = adapter
+                    return
+        finally:
+            self._release(remaining)
+
+    def close(self):
+        """Close every adapter that supports it."""
+        for adapter in self.adapters:
+            if hasattr(adapter, "close"):
+                adapter.close()
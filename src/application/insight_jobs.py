@@ -0,0 +1,220 @@
+"""Background generation of the AI insights shown on the results page.
+
+Generation starts as soon as the redflag step is completed, so the LLM request overlaps
+with the toxicity-opinion step. The Future is kept in session state and the results page
+waits for it only until the deadline (env: LLM_INSIGHTS_DEADLINE, seconds from start).
+Insights the LLM writes in the user's language are also streamed, so the results page
+can show them token by token.
+"""
+import os
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import streamlit as st
+from src.adapters.database.database_handler import DatabaseHandler
+from src.services.insight_cache import get_insight_cache
+from src.utils.summary_aggregates import load_summary
+
+# Configuration for AI insights
+TOP_REDFLAG_QUESTIONS_COUNT = 5  # Number of top-rated redflag questions to include in insights
+MIN_REDFLAG_RATING = 5.0  # Minimum rating (0-10) to include a question in insights
+
+# Seconds after the start of generation until the results page stops waiting
+DEFAULT_INSIGHTS_DEADLINE = 30
+
+
+def _load_avg_toxic_score(session, db_read_allowed: bool) -> float:
+    """
+    Average toxic score of all sessions for the prompt.
+
+    Generation starts before the results page loads the summary, so it is read here (and
+    kept in session state for the page); the state value or 0.5 is used if that fails.
+    """
+    try:
+        db_handler = DatabaseHandler(db_read_allowed=db_read_allowed)
+        try:
+            summary = load_summary(db_handler)
+        finally:
+            db_handler.close()
+        session.state.update(summary)
+    except Exception as e:
+        print(f"[WARNING] Could not load summary for insights: {e}")
+    avg_toxic_score = session.state.get("avg_toxic_score")
+    return float(avg_toxic_score) if avg_toxic_score is not None else 0.5
+
+
+def start_insight_generation(session) -> bool:
+    """
+    Start generating insights for the current survey in the background.
+
+    Args:
+        session: SessionManager of the current survey
+
+    Returns:
+        True if generation was started, False if LLM features are disabled or it failed
+    """
+    if not session.state.get("llm_enabled", False):
+        return False
+
+    from src.services.insight_service import InsightService, InsightStream
+    from src.utils.redflag_utils import get_top_redflag_questions, get_violated_filter_questions
+    from src.adapters.database.question_repository import QuestionRepository
+
+    language = session.user_details.get("language") or "EN"
+    user_id = session.user_details.get("user_id", "unknown")
+    db_read_allowed = session.state.get("db_read_allowed", False)
+
+    avg_toxic_score = _load_avg_toxic_score(session, db_read_allowed)
+
+    # Get top redflag questions for insights
+    # Always use English versions for LLM (better performance)
+    top_redflag_questions = None
+    redflag_responses = session.state.get("redflag_responses")
+    if redflag_responses:
+        db_handler = DatabaseHandler(db_read_allowed=db_read_allowed)
+        try:
+            questions = QuestionRepository(db_handler).get_redflag_questions(
+                order=session.state.get("redflag_question_order")
+            )
+        finally:
+            db_handler.close()
+        if questions:
+            top_redflag_questions = get_top_redflag_questions(
+                redflag_responses=redflag_responses,
+                questions=questions,
+                language=language,  # For logging/display
+                top_n=TOP_REDFLAG_QUESTIONS_COUNT,
+                min_rating=MIN_REDFLAG_RATING,
+                use_english_for_llm=True,
+            )
+
+    # Get violated filter questions (matched by filter_id, so the display order is not needed)
+    violated_filter_questions = None
+    filter_responses = session.state.get("filter_responses") or {}
+    if filter_responses:
+        filter_questions = None
+        try:
+            db_handler = DatabaseHandler(db_read_allowed=db_read_allowed)
+            try:
+                filter_questions = QuestionRepository(db_handler).get_filter_questions()
+            finally:
+                db_handler.close()
+        except Exception:
+            # Silently fail - violations won't be shown but app continues
+            pass
+        if filter_questions:
+            violated_filter_questions = get_violated_filter_questions(
+                filter_responses=filter_responses,
+                questions=filter_questions,
+                language=language,
+                use_english_for_llm=True,
+            )
+
+    # Prepare session data for logging (later steps are filled in by collect_insights)
+    session_data_for_log = {
+        "session_id": user_id,
+        "avg_toxic_score": str(avg_toxic_score),
+        "filter_responses": dict(filter_responses),
+        "redflag_responses": dict(redflag_responses or {}),
+        "toxicity_rating": session.state.get("toxicity_rating"),
+        "feedback_rating": session.state.get("feedback_rating"),
+        "session_start_time": session.state.get("session_start_time", ""),
+        "result_start_time": session.state.get("result_start_time", ""),
+    }
+
+    # The persistent tier of the insight cache lives in the session's storage
+    cache_db_handler = None
+    if get_insight_cache().persistent:
+        cache_db_handler = DatabaseHandler(
+            db_read_allowed=db_read_allowed, db_write_allowed=session.state.get("db_write_allowed", False)
+        )
+
+    insight_service = InsightService(enabled=True, db_handler=cache_db_handler)
+    stream = InsightStream() if insight_service.streams(language) else None
+    future = insight_service.submit_survey_insights(
+        user_name=session.user_details.get("name", "User"),
+        bf_name=session.user_details.get("bf_name", "Your boyfriend"),
+        toxic_score=session.state.get("toxic_score", 0),
+        avg_toxic_score=avg_toxic_score,
+        filter_violations=session.state.get("filter_violations", 0),
+        violated_filter_questions=violated_filter_questions,
+        language=language,
+        top_redflag_questions=top_redflag_questions,
+        user_id=user_id,
+        email=session.user_details.get("email"),
+        session_data=session_data_for_log,
+        stream=stream,
+    )
+
+    def close(_=None):
+        insight_service.close()
+        if cache_db_handler is not None:
+            cache_db_handler.close()
+
+    if future is None:
+        close()
+        return False
+    future.add_done_callback(close)
+
+    deadline = float(os.getenv("LLM_INSIGHTS_DEADLINE", DEFAULT_INSIGHTS_DEADLINE))
+    session.state["ai_insights_future"] = future
+    session.state["ai_insights_stream"] = stream
+    session.state["ai_insights_deadline"] = time.time() + deadline
+    return True
+
+
+def insight_chunks(session):
+    """
+    Chunks of insights that are still being generated, for st.write_stream.
+
+    Returns:
+        Iterator over the streamed text (ends when generation ends, or at the deadline if
+        nothing was streamed by then), or None if there is nothing to stream
+    """
+    stream = session.state.get("ai_insights_stream")
+    future = session.state.get("ai_insights_future")
+    if stream is None or future is None or future.done():
+        return None
+    return stream.iter_chunks(first_chunk_deadline=session.state.get("ai_insights_deadline"))
+
+
+def collect_insights(session, spinner_text: str = "Generating personalized insights..."):
+    """
+    Store the result of the background generation in session state.
+
+    Waits (under a spinner) at most until the deadline set by start_insight_generation.
+    Sets ai_insights (None on failure or timeout) and insight_metadata.
+
+    Args:
+        session: SessionManager of the current survey
+        spinner_text: Text shown while waiting
+    """
+    future = session.state.get("ai_insights_future")
+    if future is None:
+        session.state["ai_insights"] = None
+        return
+
+    remaining = max(0.0, session.state.get("ai_insights_deadline", 0) - time.time())
+    try:
+        if future.done():
+            insights, metadata = future.result()
+        else:
+            with st.spinner(spinner_text):
+                insights, metadata = future.result(timeout=remaining)
+    except FutureTimeoutError:
+        print("[WARNING] AI insights were not ready before the deadline")
+        future.cancel()
+        insights, metadata = None, None
+    except Exception as e:
+        print(f"[ERROR] Error generating insights: {e}")
+        insights, metadata = None, None
+
+    if metadata is not None:
+        # The toxicity-opinion step finished while the insights were generated
+        metadata["session_data"]["toxicity_rating"] = session.state.get("toxicity_rating")
+        metadata["session_data"]["result_start_time"] = session.state.get("result_start_time", "")
+        session.state["insight_metadata"] = metadata
+
+    session.state["ai_insights"] = insights
+    del session.state["ai_insights_future"]
+    session.state.pop("ai_insights_deadline", None)
+    session.state.pop("ai_insights_stream", None)
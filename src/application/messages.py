@@ -179,6 +179,7 @@ class Message:
             "result_header": {"TR": "Sonuç :dizzy:", "EN": "Result :dizzy:"},
             "start_new_survey": {"TR": "Yeni Anket Başlat", "EN": "Start New Survey"},
             "toxic_score_info": {"TR": "Erkek arkadaşının toksiklik skoru: %{toxic_score}", "EN": "Your boyfriend's toxicity score is: {toxic_score}%"},
+            "toxic_percentile_info": {"TR": "Şimdiye kadar değerlendirilen erkeklerin %{percentile}'inden daha toksik.", "EN": "More toxic than {percentile}% of the guys rated so far."},
             "filter_viol_info": {"TR": "Genelde {avg_filter_violations} filtreye takılıyor erkekler.", "EN": "Generally, guys fail in {avg_filter_violations} filters."},
             "see_results": {"TR": "Sonucu gör", "EN": "See the result"},
             "insights_header": {"TR": "AI İçgörüleri", "EN": "AI-Generated Insights"},
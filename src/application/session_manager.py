@@ -89,12 +89,12 @@ class SessionManager:
         self.state.user_details["bf_name"] = None
         
         # Reset cached questions
-        if "randomized_filters" in self.state:
-            del self.state.randomized_filters
-        if "randomized_questions" in self.state:
-            del self.state.randomized_questions
-        if "gtk_questions" in self.state:
-            del self.state.gtk_questions
+        if "filter_question_order" in self.state:
+            del self.state.filter_question_order
+        if "redflag_question_order" in self.state:
+            del self.state.redflag_question_order
+        if "gtk_question_order" in self.state:
+            del self.state.gtk_question_order
         
         # Reset value objects
         if "filter_response_obj" in self.state:
@@ -107,8 +107,13 @@ class SessionManager:
         # Reset AI insights
         if "ai_insights" in self.state:
             del self.state.ai_insights
-        if "ai_insights_generating" in self.state:
-            del self.state.ai_insights_generating
+        if "ai_insights_future" in self.state:
+            self.state.ai_insights_future.cancel()
+            del self.state.ai_insights_future
+        if "ai_insights_deadline" in self.state:
+            del self.state.ai_insights_deadline
+        if "ai_insights_stream" in self.state:
+            del self.state.ai_insights_stream
         if "ai_insights_shown" in self.state:
             del self.state.ai_insights_shown
         
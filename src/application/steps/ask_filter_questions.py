@@ -5,6 +5,7 @@ from src.application.base_step import BaseStep
 from src.adapters.database.database_handler import DatabaseHandler
 from src.adapters.database.question_repository import QuestionRepository
 from src.domain.value_objects import FilterQuestion, FilterResponse
+from src.services.scoring_engine import get_scoring_engine
 from src.utils.utils import natural_sort_key, select_discrete_score_options
 
 
@@ -13,13 +14,14 @@ class AskFilterQuestions(BaseStep):
 
     @staticmethod
     def get_questions(repository: QuestionRepository) -> list[FilterQuestion]:
-        """Load and randomize filter questions, cache in session."""
-        if "randomized_filters" not in st.session_state:
+        """Load and randomize filter questions, keeping the shuffled id order in session."""
+        if "filter_question_order" not in st.session_state:
             questions = repository.get_filter_questions()
-            # Randomize the list
+            # Randomize the list; the session only stores the filter ids
             questions = random.sample(questions, len(questions))
-            st.session_state.randomized_filters = questions
-        return st.session_state.randomized_filters
+            st.session_state.filter_question_order = tuple(q.filter_id for q in questions)
+            return questions
+        return repository.get_filter_questions(order=st.session_state.filter_question_order)
 
     def run(self):
         import streamlit as st
@@ -39,11 +41,9 @@ class AskFilterQuestions(BaseStep):
         st.subheader(msg.get("filter_header"), divider=True)
 
         answers = {}
-        violations = 0
 
         for index, question in enumerate(questions):
             question_text = question.get_question(language)
-            upper_limit = question.upper_limit
             scoring_type = question.scoring
 
             opts, yes_no_opts = select_discrete_score_options(language)
@@ -60,11 +60,11 @@ class AskFilterQuestions(BaseStep):
 
             # Store response
             answers[f"F{question.filter_id}"] = answer
-            if answer >= upper_limit:
-                violations += 1
 
             st.divider()
 
+        violations = get_scoring_engine(filter_questions=questions).filter_violations(answers)
+
         # Sort responses
         responses = dict(sorted(answers.items(), key=natural_sort_key))
 
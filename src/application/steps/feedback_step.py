@@ -1,10 +1,9 @@
 """Feedback step."""
 import streamlit as st
 from src.application.base_step import BaseStep
-from src.adapters.database.database_handler import DatabaseHandler
+from src.services.write_behind import submit_write
 from src.domain.value_objects import FeedbackRecord, UserDetails
 from src.utils.session_id_generator import generate_session_id
-import pandas as pd
 
 
 class FeedbackStep(BaseStep):
@@ -48,9 +47,7 @@ class FeedbackStep(BaseStep):
         return self.session.state.get("feedback_rating") is not None
     
     def _save_feedback(self):
-        """Save feedback rating using FeedbackRecord value object."""
-        db_handler = DatabaseHandler(db_write_allowed=self.db_write_allowed)
-        
+        """Queue the feedback rating (FeedbackRecord value object) for the background writer."""
         try:
             user_details = UserDetails(
                 user_id=self.session.user_details["user_id"],
@@ -74,25 +71,9 @@ class FeedbackStep(BaseStep):
                 rating=self.session.state.get("feedback_rating"),
             )
 
-            # Convert to dict and save (or update if record already exists)
+            # Convert to dict and queue it (replaces the record if it already exists)
             record_dict = feedback.to_dict()
-            try:
-                existing = db_handler.load_table("session_feedback")
-                if not existing.empty:
-                    existing["id"] = pd.to_numeric(existing["id"], errors='coerce')
-                    if session_id in existing["id"].values:
-                        db_handler.update_record("session_feedback", {"id": session_id}, record_dict)
-                        print(f"[OK] Updated existing feedback record (id: {session_id})")
-                    else:
-                        db_handler.add_record("session_feedback", record_dict)
-                        print(f"[OK] Created new feedback record (id: {session_id})")
-                else:
-                    db_handler.add_record("session_feedback", record_dict)
-                    print(f"[OK] Created new feedback record (id: {session_id})")
-            except Exception:
-                db_handler.add_record("session_feedback", record_dict)
-            
-            db_handler.close()
+            submit_write([("session_feedback", record_dict)], db_write_allowed=self.db_write_allowed)
         except Exception as e:
             print(f"[ERROR] Failed to save feedback: {e}")
             import traceback
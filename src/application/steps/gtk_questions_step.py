@@ -11,11 +11,12 @@ class GTKQuestionsStep(BaseStep):
 
     @staticmethod
     def get_questions(repository: QuestionRepository) -> list[GTKQuestion]:
-        """Load GTK questions, cache in session."""
-        if "gtk_questions" not in st.session_state:
+        """Load GTK questions, keeping their id order in session."""
+        if "gtk_question_order" not in st.session_state:
             questions = repository.get_gtk_questions()
-            st.session_state.gtk_questions = questions
-        return st.session_state.gtk_questions
+            st.session_state.gtk_question_order = tuple(q.gtk_id for q in questions)
+            return questions
+        return repository.get_gtk_questions(order=st.session_state.gtk_question_order)
 
     def run(self):
         import streamlit as st
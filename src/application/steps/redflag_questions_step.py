@@ -2,11 +2,12 @@
 import streamlit as st
 import numpy as np
 import random
-from decimal import Decimal
 from src.application.base_step import BaseStep
 from src.adapters.database.database_handler import DatabaseHandler
 from src.adapters.database.question_repository import QuestionRepository
+from src.application.insight_jobs import start_insight_generation
 from src.domain.value_objects import RedFlagQuestion, RedFlagResponse
+from src.services.scoring_engine import YES_NO_SCORE, get_scoring_engine
 from src.utils.utils import natural_sort_key
 
 
@@ -15,13 +16,14 @@ class RedFlagQuestionsStep(BaseStep):
 
     @staticmethod
     def get_questions(repository: QuestionRepository) -> list[RedFlagQuestion]:
-        """Load and randomize redflag questions, cache in session."""
-        if "randomized_questions" not in st.session_state:
+        """Load and randomize redflag questions, keeping the shuffled id order in session."""
+        if "redflag_question_order" not in st.session_state:
             questions = repository.get_redflag_questions()
-            # Randomize the list
+            # Randomize the list; the session only stores the question ids
             questions = random.sample(questions, len(questions))
-            st.session_state.randomized_questions = questions
-        return st.session_state.randomized_questions
+            st.session_state.redflag_question_order = tuple(q.question_id for q in questions)
+            return questions
+        return repository.get_redflag_questions(order=st.session_state.redflag_question_order)
 
     def run(self):
         import streamlit as st
@@ -41,10 +43,7 @@ class RedFlagQuestionsStep(BaseStep):
         st.subheader(msg.get("toxicity_header"), divider=True)
 
         answers = {}
-        tot_score = 0
-        abs_tot_score = 0
-        applicable_questions = 0
-        yes_no_default_score = 7
+        yes_no_default_score = YES_NO_SCORE
 
         not_applicable_msg = msg.get("not_applicable_msg")
         select_score_msg = msg.get("select_score_msg")
@@ -86,32 +85,26 @@ class RedFlagQuestionsStep(BaseStep):
                         answer = 0
 
                     answers[f"Q{question.question_id}"] = answer
-
-                    weight = question.weight
-                    tot_score += weight * answer
-                    abs_tot_score += weight * (yes_no_default_score if scoring_type == "YES/NO" else 10) * (1 if weight > 0 else -1)
-                    applicable_questions += 1
                 else:
                     answers[f"Q{question.question_id}"] = np.nan
 
             st.divider()
 
-        # Calculate the toxic score only for applicable questions
-        if applicable_questions > 0:
-            toxic_score = Decimal("1.0") * Decimal(str(tot_score)) / Decimal(str(abs_tot_score))
-        else:
-            toxic_score = Decimal("0")
+        # Calculate the toxic score only for applicable questions (N/A answers are NaN)
+        toxic_score = get_scoring_engine(questions).toxic_score(answers)
 
         answers = dict(sorted(answers.items(), key=natural_sort_key))
 
         if st.button(msg.get("continue_msg")):
             # Create RedFlagResponse value object
-            toxic_score_float = float(toxic_score)
+            toxic_score_float = toxic_score
             redflag_response = RedFlagResponse(responses=answers, toxic_score=toxic_score_float)
             # Store in session state
             self.session.state["redflag_responses"] = redflag_response.responses
             self.session.state["toxic_score"] = redflag_response.toxic_score
             self.session.state["redflag_response_obj"] = redflag_response  # Store value object too
+            # Generate AI insights in the background while the next steps are answered
+            start_insight_generation(self.session)
             st.rerun()
 
         return (
@@ -5,6 +5,7 @@ from src.application.base_step import BaseStep
 from src.adapters.email.email_adapter import send_survey_report
 from src.adapters.database.database_handler import DatabaseHandler
 from src.utils.redflag_utils import get_violated_filter_questions
+from src.utils.summary_aggregates import load_summary
 from datetime import datetime
 
 
@@ -31,14 +32,13 @@ class ReportStep(BaseStep):
                 try:
                     db_read_allowed = self.session.state.get("db_read_allowed", False)
                     db_handler = DatabaseHandler(db_read_allowed=db_read_allowed)
-                    summary = db_handler.load_table("Summary_Sessions")
+                    summary = load_summary(db_handler)
                     
-                    if not summary.empty:
-                        row = summary.iloc[0]
-                        avg_toxic_score_decimal = Decimal(str(row.get("avg_toxic_score", 0)))
+                    if summary["count_guys"]:
+                        avg_toxic_score_decimal = summary["avg_toxic_score"]
                     else:
                         # Calculate from session_responses as fallback
-                        session_responses = db_handler.load_table("session_responses")
+                        session_responses = db_handler.load_table("session_responses", columns=["toxic_score"])
                         if not session_responses.empty and "toxic_score" in session_responses.columns:
                             avg_toxic_score_decimal = Decimal(str(session_responses["toxic_score"].mean()))
                         else:
@@ -54,15 +54,15 @@ class ReportStep(BaseStep):
             filter_responses = self.session.state.get("filter_responses", {})
             if filter_responses:
                 try:
-                    # Load filter questions from database if not in session state
-                    filter_questions = self.session.state.get("randomized_filters")
-                    if not filter_questions:
-                        db_read_allowed = self.session.state.get("db_read_allowed", False)
-                        db_handler = DatabaseHandler(db_read_allowed=db_read_allowed)
-                        from src.adapters.database.question_repository import QuestionRepository
-                        repository = QuestionRepository(db_handler)
-                        filter_questions = repository.get_filter_questions()
-                        db_handler.close()
+                    # Load filter questions (shared catalog, in the session's display order)
+                    db_read_allowed = self.session.state.get("db_read_allowed", False)
+                    db_handler = DatabaseHandler(db_read_allowed=db_read_allowed)
+                    from src.adapters.database.question_repository import QuestionRepository
+                    repository = QuestionRepository(db_handler)
+                    filter_questions = repository.get_filter_questions(
+                        order=self.session.state.get("filter_question_order")
+                    )
+                    db_handler.close()
                     
                     if filter_questions:
                         violated_filter_questions = get_violated_filter_questions(
@@ -81,15 +81,15 @@ class ReportStep(BaseStep):
                 from src.utils.category_analysis import calculate_category_toxicity_scores
                 redflag_responses = self.session.state.get("redflag_responses", {})
                 if redflag_responses:
-                    # Load redflag questions from database if not in session state
-                    redflag_questions = self.session.state.get("randomized_questions")
-                    if not redflag_questions:
-                        db_read_allowed = self.session.state.get("db_read_allowed", False)
-                        db_handler = DatabaseHandler(db_read_allowed=db_read_allowed)
-                        from src.adapters.database.question_repository import QuestionRepository
-                        repository = QuestionRepository(db_handler)
-                        redflag_questions = repository.get_redflag_questions()
-                        db_handler.close()
+                    # Load redflag questions (shared catalog, in the session's display order)
+                    db_read_allowed = self.session.state.get("db_read_allowed", False)
+                    db_handler = DatabaseHandler(db_read_allowed=db_read_allowed)
+                    from src.adapters.database.question_repository import QuestionRepository
+                    repository = QuestionRepository(db_handler)
+                    redflag_questions = repository.get_redflag_questions(
+                        order=self.session.state.get("redflag_question_order")
+                    )
+                    db_handler.close()
                     
                     if redflag_questions:
                         # Get category names map for language-specific names
@@ -97,16 +97,8 @@ class ReportStep(BaseStep):
                         try:
                             db_read_allowed = self.session.state.get("db_read_allowed", False)
                             db_handler = DatabaseHandler(db_read_allowed=db_read_allowed)
-                            categories_df = db_handler.load_table("RedFlagCategories")
-                            if not categories_df.empty:
-                                for _, row in categories_df.iterrows():
-                                    cat_id = int(row["Category_ID"])
-                                    if language == "TR":
-                                        cat_name = str(row.get("Category_Name_TR", ""))
-                                    else:
-                                        cat_name = str(row.get("Category_Name_EN", ""))
-                                    if cat_name:
-                                        category_names_map[cat_id] = cat_name
+                            from src.adapters.database.question_repository import QuestionRepository
+                            category_names_map = QuestionRepository(db_handler).get_category_names(language)
                             db_handler.close()
                         except Exception as e:
                             # Could not load category names
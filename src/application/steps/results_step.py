@@ -13,10 +13,12 @@ from src.domain.value_objects import (
 from src.utils.utils import safe_decimal
 from datetime import datetime
 from src.utils.constants import DATE_FORMAT
-
-# Configuration for AI insights
-TOP_REDFLAG_QUESTIONS_COUNT = 5  # Number of top-rated redflag questions to include in insights
-MIN_REDFLAG_RATING = 5.0  # Minimum rating (0-10) to include a question in insights
+from src.application.insight_jobs import collect_insights, insight_chunks, start_insight_generation
+from src.services.write_behind import submit_write
+from src.utils.recent_scores import load_recent_scores
+from src.utils.score_histogram import load_score_histogram
+from src.utils.session_id_generator import generate_session_id
+from src.utils.summary_aggregates import load_summary
 
 
 class ResultsStep(BaseStep):
@@ -63,40 +65,11 @@ class ResultsStep(BaseStep):
         """Load summary statistics from database."""
         try:
             db_handler = DatabaseHandler(db_read_allowed=self.db_read_allowed, db_write_allowed=self.db_read_allowed)
-            summary = db_handler.load_table("Summary_Sessions")
-
-            if not summary.empty:
-                row = summary.iloc[0]
-                self.session.state["sum_toxic_score"] = Decimal(str(row.get("sum_toxic_score", 0)))
-                self.session.state["max_toxic_score"] = Decimal(str(row.get("max_toxic_score", 0)))
-                self.session.state["min_toxic_score"] = Decimal(str(row.get("min_toxic_score", 0)))
-                self.session.state["avg_toxic_score"] = Decimal(str(row.get("avg_toxic_score", 0)))
-                self.session.state["sum_filter_violations"] = row.get("sum_filter_violations", 0)
-                self.session.state["avg_filter_violations"] = row.get("avg_filter_violations", 0)
-                self.session.state["count_guys"] = row.get("count_guys", 0)
-            else:
+            if not db_handler.exists("Summary_Sessions", {"summary_id": 1}):
                 # Initialize Summary_Sessions with default values if table is empty
                 from src.utils.summary_initializer import initialize_summary_sessions
-                if initialize_summary_sessions(db_handler):
-                    # Reload to get the initialized values
-                    summary = db_handler.load_table("Summary_Sessions")
-                    if not summary.empty:
-                        row = summary.iloc[0]
-                        self.session.state["sum_toxic_score"] = Decimal(str(row.get("sum_toxic_score", 0)))
-                        self.session.state["max_toxic_score"] = Decimal(str(row.get("max_toxic_score", 0)))
-                        self.session.state["min_toxic_score"] = Decimal(str(row.get("min_toxic_score", 0)))
-                        self.session.state["avg_toxic_score"] = Decimal(str(row.get("avg_toxic_score", 0)))
-                        self.session.state["sum_filter_violations"] = row.get("sum_filter_violations", 0)
-                        self.session.state["avg_filter_violations"] = row.get("avg_filter_violations", 0)
-                        self.session.state["count_guys"] = row.get("count_guys", 0)
-                    else:
-                        # Fallback to defaults
-                        self.session.state["avg_toxic_score"] = Decimal("0.5")
-                        self.session.state["avg_filter_violations"] = 0
-                else:
-                    # Fallback to defaults if initialization failed
-                    self.session.state["avg_toxic_score"] = Decimal("0.5")
-                    self.session.state["avg_filter_violations"] = 0
+                initialize_summary_sessions(db_handler)
+            self.session.state.update(load_summary(db_handler))
         except Exception as e:
             st.warning(f"Could not load summary data: {e}")
             # Set defaults
@@ -116,6 +89,9 @@ class ResultsStep(BaseStep):
 
         if toxic_score:
             st.info(msg.get("toxic_score_info", toxic_score=round(100 * toxic_score, 1)), icon="⚡")
+            percentile = self._toxic_percentile(toxic_score)
+            if percentile is not None:
+                st.caption(msg.get("toxic_percentile_info", percentile=round(percentile)))
             if Decimal(str(toxic_score)) > avg_toxic_score:
                 st.error(msg.get("red_flag_fail_msg", bf_name=bf_name))
             else:
@@ -145,13 +121,22 @@ class ResultsStep(BaseStep):
         if llm_enabled:
             st.divider()
             # Generate insights only once if they don't exist
-            if "ai_insights" not in self.session.state and not self.session.state.get("ai_insights_generating", False):
+            if "ai_insights" not in self.session.state:
                 self._generate_ai_insights()
             # Show insights only once (use flag to prevent duplicate display)
             if "ai_insights_shown" not in self.session.state:
                 self._show_ai_insights()
                 self.session.state["ai_insights_shown"] = True
 
+    def _toxic_percentile(self, toxic_score):
+        """Percentage of stored sessions with a lower toxic score (None if unavailable)."""
+        try:
+            db_handler = DatabaseHandler(db_read_allowed=self.db_read_allowed, db_write_allowed=self.db_read_allowed)
+            return load_score_histogram(db_handler).percentile_rank(float(toxic_score))
+        except Exception as e:
+            print(f"[WARNING] Could not load score histogram: {e}")
+            return None
+
     def _show_toxic_graph(self):
         """Show toxicity comparison graph using plotnine."""
         try:
@@ -162,22 +147,21 @@ class ResultsStep(BaseStep):
             language = self.session.user_details.get("language") or "EN"
             msg = self.msg
 
-            db_handler = DatabaseHandler(db_read_allowed=self.db_read_allowed)
-            session_responses = db_handler.load_table("session_responses")
-
-            if session_responses.empty:
-                return
-
             toxic_score = self.session.state.get("toxic_score", 0)
             if not toxic_score:
                 return
 
-            # Prepare the data - get last 20 entries
-            temp = session_responses[["id", "toxic_score"]].tail(20).copy()
-
-            if temp.empty:
+            # Latest scores from the recent-scores ring (one key lookup), without this session
+            db_handler = DatabaseHandler(db_read_allowed=self.db_read_allowed)
+            current_id = generate_session_id(
+                self.session.user_details.get("user_id") or "", self.session.user_details.get("bf_name") or ""
+            )
+            recent = [(sid, score) for sid, score in load_recent_scores(db_handler) if sid != current_id]
+            if not recent:
                 return
 
+            temp = pd.DataFrame(recent, columns=["id", "toxic_score"])
+
             # Add current user's score with id=0 as marker
             temp.loc[-1] = [0, toxic_score]
             boyfriend_name = self.session.user_details.get("bf_name", "Your guy")
@@ -243,14 +227,13 @@ class ResultsStep(BaseStep):
             if not redflag_responses:
                 return
 
-            # Load questions from repository
-            questions = self.session.state.get("randomized_questions")
+            # Load questions from repository (in the order the user saw them)
             db_read_allowed = self.session.state.get("db_read_allowed", False)
             db_handler = DatabaseHandler(db_read_allowed=db_read_allowed)
-            
-            if not questions:
-                repository = QuestionRepository(db_handler)
-                questions = repository.get_redflag_questions()
+            repository = QuestionRepository(db_handler)
+            questions = repository.get_redflag_questions(
+                order=self.session.state.get("redflag_question_order")
+            )
 
             if not questions:
                 return
@@ -258,16 +241,7 @@ class ResultsStep(BaseStep):
             # Load category names from RedFlagCategories table based on language
             category_names_map = {}
             try:
-                categories_df = db_handler.load_table("RedFlagCategories")
-                if not categories_df.empty:
-                    for _, row in categories_df.iterrows():
-                        cat_id = int(row["Category_ID"])
-                        if language == "TR":
-                            cat_name = str(row.get("Category_Name_TR", ""))
-                        else:
-                            cat_name = str(row.get("Category_Name_EN", ""))
-                        if cat_name:
-                            category_names_map[cat_id] = cat_name
+                category_names_map = QuestionRepository(db_handler).get_category_names(language)
             except Exception as e:
                 category_names_map = {}
             
@@ -328,120 +302,34 @@ class ResultsStep(BaseStep):
             st.error(f"Could not show category radar chart: {e}")
 
     def _generate_ai_insights(self):
-        """Generate AI insights (only called once)."""
+        """Collect the AI insights started after the redflag step (only called once)."""
         # Check if LLM is enabled
         llm_enabled = self.session.state.get("llm_enabled", False)
         if not llm_enabled:
             return
 
-        # Set flag to prevent duplicate generation
-        self.session.state["ai_insights_generating"] = True
-        
-        language = self.session.user_details.get("language") or "EN"
+        # Normally started when the redflag step was completed; start now if it was not
+        if "ai_insights_future" not in self.session.state:
+            start_insight_generation(self.session)
+
         msg = self.msg
-        
-        # Generate insights
         spinner_text = msg.get("generating_insights_msg") if msg.texts.get("generating_insights_msg") else "Generating personalized insights..."
-        with st.spinner(spinner_text):
-            from src.services.insight_service import InsightService
-            from src.utils.redflag_utils import get_top_redflag_questions, get_violated_filter_questions
-            from src.adapters.database.question_repository import QuestionRepository
-            
-            insight_service = InsightService(enabled=True)
-            user_name = self.session.user_details.get("name", "User")
-            bf_name = self.session.user_details.get("bf_name", "Your boyfriend")
-            user_id = self.session.user_details.get("user_id", "unknown")
-            email = self.session.user_details.get("email")
-            toxic_score = self.session.state.get("toxic_score", 0)
-            filter_violations = self.session.state.get("filter_violations", 0)
-            
-            # Get avg_toxic_score (convert from Decimal to float)
-            avg_toxic_score_decimal = self.session.state.get("avg_toxic_score", Decimal("0.5"))
-            if isinstance(avg_toxic_score_decimal, Decimal):
-                avg_toxic_score = float(avg_toxic_score_decimal)
-            else:
-                avg_toxic_score = float(avg_toxic_score_decimal) if avg_toxic_score_decimal else 0.5
-            
-            # Get top redflag questions for insights
-            top_redflag_questions = None
-            redflag_responses = self.session.state.get("redflag_responses")
-            questions = self.session.state.get("randomized_questions")
-            
-            if redflag_responses and questions:
-                # Get top N questions with rating >= minimum threshold
-                # Always use English versions for LLM (better performance)
-                top_redflag_questions = get_top_redflag_questions(
-                    redflag_responses=redflag_responses,
-                    questions=questions,
-                    language=language,  # For logging/display
-                    top_n=TOP_REDFLAG_QUESTIONS_COUNT,
-                    min_rating=MIN_REDFLAG_RATING,
-                    use_english_for_llm=True,  # Always use English for LLM
-                )
-            
-            # Get violated filter questions
-            violated_filter_questions = None
-            filter_responses = self.session.state.get("filter_responses")
-            
-            # Handle None case - convert to empty dict
-            if filter_responses is None:
-                filter_responses = {}
-            
-            # Always load filter questions from database (randomized_filters is only for display order)
-            # We match by filter_id, so we don't need the randomized order
-            filter_questions = None
-            if filter_responses:
-                try:
-                    db_read_allowed = self.session.state.get("db_read_allowed", False)
-                    db_handler = DatabaseHandler(db_read_allowed=db_read_allowed)
-                    repository = QuestionRepository(db_handler)
-                    filter_questions = repository.get_filter_questions()
-                    db_handler.close()
-                except Exception as e:
-                    # Silently fail - violations won't be shown but app continues
-                    pass
-            
-            if filter_responses and filter_questions:
-                # Always use English versions for LLM (better performance)
-                violated_filter_questions = get_violated_filter_questions(
-                    filter_responses=filter_responses,
-                    questions=filter_questions,
-                    language=language,
-                    use_english_for_llm=True,  # Always use English for LLM
-                )
-            
-            # Prepare session data for logging
-            session_data_for_log = {
-                "session_id": user_id,
-                "avg_toxic_score": str(avg_toxic_score),
-                "filter_responses": filter_responses,
-                "redflag_responses": self.session.state.get("redflag_responses", {}),
-                "toxicity_rating": self.session.state.get("toxicity_rating"),
-                "feedback_rating": self.session.state.get("feedback_rating"),
-                "session_start_time": self.session.state.get("session_start_time", ""),
-                "result_start_time": self.session.state.get("result_start_time", ""),
-            }
-            
-            insights = insight_service.generate_survey_insights(
-                user_name=user_name,
-                bf_name=bf_name,
-                toxic_score=toxic_score,
-                avg_toxic_score=avg_toxic_score,
-                filter_violations=filter_violations,
-                violated_filter_questions=violated_filter_questions,
-                language=language,
-                top_redflag_questions=top_redflag_questions,
-                user_id=user_id,
-                email=email,
-                session_data=session_data_for_log,
-            )
-            
-            self.session.state["ai_insights"] = insights
-            insight_service.close()
-        
-        # Clear the generating flag after generation (success or failure)
-        if "ai_insights_generating" in self.session.state:
-            del self.session.state["ai_insights_generating"]
+
+        chunks = insight_chunks(self.session)
+        if chunks is None:
+            collect_insights(self.session, spinner_text)
+            return
+
+        # Show the insights token by token while they are generated, then replace the
+        # streamed text with the final insights box
+        self._show_insights_header()
+        placeholder = st.empty()
+        with placeholder.container():
+            st.write_stream(chunks)
+        collect_insights(self.session, spinner_text)
+        insights = self.session.state.get("ai_insights")
+        placeholder.info(insights if insights else self._insights_unavailable_text())
+        self.session.state["ai_insights_shown"] = True
     
     def _show_ai_insights(self):
         """Display AI insights (only shows, does not generate)."""
@@ -450,55 +338,68 @@ class ResultsStep(BaseStep):
         if not llm_enabled:
             return
 
-        language = self.session.user_details.get("language") or "EN"
-        msg = self.msg
-
         # Display insights
         insights = self.session.state.get("ai_insights")
         if insights:
-            header_text = msg.get("insights_header") if msg.texts.get("insights_header") else "AI-Generated Insights"
-            st.subheader(header_text)
-            
-            # Display disclaimer note with rainbow emoji
-            disclaimer_text = msg.get("insights_disclaimer") if msg.texts.get("insights_disclaimer") else "**Note:** This is a simple analysis and may be wrong. Please do not take it seriously, just take it into account simply."
-            st.markdown(f":rainbow[{disclaimer_text}]")
-            
+            self._show_insights_header()
             st.info(insights)
         else:
-            unavailable_text = msg.get("insights_unavailable_msg") if msg.texts.get("insights_unavailable_msg") else "AI insights are not available. LLM API is not configured."
-            st.info(unavailable_text)
+            st.info(self._insights_unavailable_text())
+
+    def _show_insights_header(self):
+        """Display the AI insights header and disclaimer."""
+        msg = self.msg
+        header_text = msg.get("insights_header") if msg.texts.get("insights_header") else "AI-Generated Insights"
+        st.subheader(header_text)
+        
+        # Display disclaimer note with rainbow emoji
+        disclaimer_text = msg.get("insights_disclaimer") if msg.texts.get("insights_disclaimer") else "**Note:** This is a simple analysis and may be wrong. Please do not take it seriously, just take it into account simply."
+        st.markdown(f":rainbow[{disclaimer_text}]")
+
+    def _insights_unavailable_text(self):
+        msg = self.msg
+        return msg.get("insights_unavailable_msg") if msg.texts.get("insights_unavailable_msg") else "AI insights are not available. LLM API is not configured."
     
     def _save_main_data(self):
-        """Save main session data to database (CSV or DynamoDB based on flag)."""
-        db_handler = DatabaseHandler(db_write_allowed=self.db_write_allowed)
-        
+        """Queue the session records for the background writer (CSV or DynamoDB based on flag).
+
+        The records are written together with write_batch, followed by the Summary_Sessions,
+        recent scores and score histogram updates, without making the user wait.
+        """
         try:
-            # Save session responses
-            if self.session.state.get("redflag_responses") and self.session.state.get("filter_responses"):
-                self._save_session_response(db_handler)
-            
-            # Save GTK responses
+            session_completed = bool(
+                self.session.state.get("redflag_responses") and self.session.state.get("filter_responses")
+            )
+
+            records = []
+            if session_completed:
+                records.append(("session_responses", self._session_response_record()))
             if self.session.state.get("extra_questions_responses"):
-                self._save_gtk_response(db_handler)
-            
-            # Save toxicity rating
+                records.append(("session_gtk_responses", self._gtk_response_record()))
             if self.session.state.get("toxicity_rating"):
-                self._save_toxicity_rating(db_handler)
-            
-            # Update Summary_Sessions table after saving all data
-            if self.session.state.get("redflag_responses") and self.session.state.get("filter_responses"):
-                self._update_summary_statistics(db_handler)
-            
-            # Save session insights if available
+                records.append(("session_toxicity_rating", self._toxicity_rating_record()))
             if self.session.state.get("insight_metadata"):
-                self._save_session_insights(db_handler)
-            
-            db_handler.close()
+                insight_record = self._session_insights_record()
+                if insight_record:
+                    records.append(("session_insights", insight_record))
+
+            session_scores = None
+            if session_completed:
+                session_scores = {
+                    "session_id": generate_session_id(
+                        self.session.user_details["user_id"], self.session.user_details["bf_name"]
+                    ),
+                    "toxic_score": float(self.session.state.get("toxic_score") or 0),
+                    "filter_violations": int(self.session.state.get("filter_violations", 0)),
+                }
+
+            if records:
+                submit_write(records, db_write_allowed=self.db_write_allowed, session_scores=session_scores)
         except Exception as e:
             st.error(self.msg.get("response_error_msg", e=str(e)))
-    
-    def _save_session_response(self, db_handler):
-        """Save main session response data using SessionResponse value object."""
+
+    def _session_response_record(self) -> dict:
+        """Build the session_responses record using SessionResponse value object."""
         from src.utils.session_id_generator import generate_session_id
         
         user_details = UserDetails(
@@ -529,26 +430,11 @@ class ResultsStep(BaseStep):
             filter_responses={k: safe_decimal(v) for k, v in self.session.state.get("filter_responses", {}).items()},
         )
         
-        # Convert to dict and save (or update if record already exists)
-        record_dict = session_response.to_dict()
-        try:
-            existing = db_handler.load_table("session_responses")
-            if not existing.empty:
-                existing["id"] = pd.to_numeric(existing["id"], errors='coerce')
-                if session_id in existing["id"].values:
-                    db_handler.update_record("session_responses", {"id": session_id}, record_dict)
-                    # Updated existing session_response record
-                else:
-                    db_handler.add_record("session_responses", record_dict)
-                    # Created new session_response record
-            else:
-                db_handler.add_record("session_responses", record_dict)
-                # Created new session_response record
-        except Exception:
-            db_handler.add_record("session_responses", record_dict)
+        # Convert to dict (written with write_batch, replacing any existing record)
+        return session_response.to_dict()
     
-    def _save_gtk_response(self, db_handler):
-        """Save GetToKnow questions responses using GTKResponseRecord value object."""
+    def _gtk_response_record(self) -> dict:
+        """Build the GetToKnow responses record using GTKResponseRecord value object."""
         from src.utils.session_id_generator import generate_session_id
         
         user_details = UserDetails(
@@ -573,26 +459,11 @@ class ResultsStep(BaseStep):
             gtk_responses=self.session.state.get("extra_questions_responses", {}),
         )
         
-        # Convert to dict and save (or update if record already exists)
-        record_dict = gtk_response.to_dict()
-        try:
-            existing = db_handler.load_table("session_gtk_responses")
-            if not existing.empty:
-                existing["id"] = pd.to_numeric(existing["id"], errors='coerce')
-                if session_id in existing["id"].values:
-                    db_handler.update_record("session_gtk_responses", {"id": session_id}, record_dict)
-                    # Updated existing gtk_response record
-                else:
-                    db_handler.add_record("session_gtk_responses", record_dict)
-                    # Created new gtk_response record
-            else:
-                db_handler.add_record("session_gtk_responses", record_dict)
-                # Created new gtk_response record
-        except Exception:
-            db_handler.add_record("session_gtk_responses", record_dict)
+        # Convert to dict (written with write_batch, replacing any existing record)
+        return gtk_response.to_dict()
     
-    def _save_toxicity_rating(self, db_handler):
-        """Save toxicity rating using ToxicityRatingRecord value object."""
+    def _toxicity_rating_record(self) -> dict:
+        """Build the toxicity rating record using ToxicityRatingRecord value object."""
         from src.utils.session_id_generator import generate_session_id
         
         user_details = UserDetails(
@@ -617,157 +488,15 @@ class ResultsStep(BaseStep):
             toxicity_rating=self.session.state.get("toxicity_rating"),
         )
         
-        # Convert to dict and save (or update if record already exists)
-        record_dict = toxicity_rating.to_dict()
-        try:
-            existing = db_handler.load_table("session_toxicity_rating")
-            if not existing.empty:
-                existing["id"] = pd.to_numeric(existing["id"], errors='coerce')
-                if session_id in existing["id"].values:
-                    db_handler.update_record("session_toxicity_rating", {"id": session_id}, record_dict)
-                    # Updated existing toxicity_rating record
-                else:
-                    db_handler.add_record("session_toxicity_rating", record_dict)
-                    # Created new toxicity_rating record
-            else:
-                db_handler.add_record("session_toxicity_rating", record_dict)
-                # Created new toxicity_rating record
-        except Exception:
-            db_handler.add_record("session_toxicity_rating", record_dict)
+        # Convert to dict (written with write_batch, replacing any existing record)
+        return toxicity_rating.to_dict()
     
-    def _update_summary_statistics(self, db_handler):
-        """Update Summary_Sessions table with new session data."""
-        try:
-            # Get current values from session state (loaded at app start)
-            cur_toxic_score = Decimal(str(self.session.state.get("toxic_score", 0)))
-            cur_filter_violations = int(self.session.state.get("filter_violations", 0))
-            
-            # Get existing summary values (with defaults if not set)
-            sum_toxic_score = Decimal(str(self.session.state.get("sum_toxic_score", 0)))
-            max_toxic_score = Decimal(str(self.session.state.get("max_toxic_score", 1)))
-            min_toxic_score = Decimal(str(self.session.state.get("min_toxic_score", 0)))
-            count_guys = int(self.session.state.get("count_guys", 0))
-            sum_filter_violations = int(self.session.state.get("sum_filter_violations", 0))
-            
-            # Update values
-            sum_toxic_score = sum_toxic_score + cur_toxic_score
-            count_guys = count_guys + 1
-            avg_toxic_score = Decimal("1.0") * sum_toxic_score / Decimal(str(count_guys))
-            
-            # Update max and min toxic scores
-            # For first record (count_guys == 0 before increment), set both to current score
-            if count_guys == 0:
-                max_toxic_score = cur_toxic_score
-                min_toxic_score = cur_toxic_score
-            else:
-                # For subsequent records, update min/max normally
-                if cur_toxic_score > max_toxic_score:
-                    max_toxic_score = cur_toxic_score
-                if cur_toxic_score < min_toxic_score:
-                    min_toxic_score = cur_toxic_score
-            
-            # Update filter violations
-            sum_filter_violations = sum_filter_violations + cur_filter_violations
-            avg_filter_violations = Decimal("1.0") * Decimal(str(sum_filter_violations)) / Decimal(str(count_guys))
-            
-            # Track max IDs for statistics purposes (not used for ID generation - IDs are now hash-based)
-            max_id_session_responses = int(self.session.state.get("max_id_session_responses", 0))
-            max_id_gtk_responses = int(self.session.state.get("max_id_gtk_responses", 0))
-            max_id_feedback = int(self.session.state.get("max_id_feedback", 0))
-            max_id_session_toxicity_rating = int(self.session.state.get("max_id_session_toxicity_rating", 0))
-            
-            # Update max IDs by checking actual records (for statistics)
-            try:
-                session_responses = db_handler.load_table("session_responses")
-                if not session_responses.empty and "id" in session_responses.columns:
-                    session_responses["id"] = pd.to_numeric(session_responses["id"], errors='coerce')
-                    max_id_session_responses = max(max_id_session_responses, int(session_responses["id"].max()))
-            except:
-                pass
-            
-            try:
-                gtk_responses = db_handler.load_table("session_gtk_responses")
-                if not gtk_responses.empty and "id" in gtk_responses.columns:
-                    gtk_responses["id"] = pd.to_numeric(gtk_responses["id"], errors='coerce')
-                    max_id_gtk_responses = max(max_id_gtk_responses, int(gtk_responses["id"].max()))
-            except:
-                pass
-            
-            try:
-                feedback = db_handler.load_table("session_feedback")
-                if not feedback.empty and "id" in feedback.columns:
-                    feedback["id"] = pd.to_numeric(feedback["id"], errors='coerce')
-                    max_id_feedback = max(max_id_feedback, int(feedback["id"].max()))
-            except:
-                pass
-            
-            try:
-                toxicity_rating = db_handler.load_table("session_toxicity_rating")
-                if not toxicity_rating.empty and "id" in toxicity_rating.columns:
-                    toxicity_rating["id"] = pd.to_numeric(toxicity_rating["id"], errors='coerce')
-                    max_id_session_toxicity_rating = max(max_id_session_toxicity_rating, int(toxicity_rating["id"].max()))
-            except:
-                pass
-            
-            last_date = datetime.now().strftime(DATE_FORMAT)
-            
-            # Prepare update dictionary - DynamoDB requires Decimal types
-            update_dict = {
-                "sum_toxic_score": sum_toxic_score,
-                "max_toxic_score": max_toxic_score,
-                "min_toxic_score": min_toxic_score,
-                "avg_toxic_score": avg_toxic_score,
-                "sum_filter_violations": sum_filter_violations,
-                "avg_filter_violations": avg_filter_violations,
-                "count_guys": count_guys,
-                "max_id_session_responses": max_id_session_responses,
-                "max_id_gtk_responses": max_id_gtk_responses,
-                "max_id_feedback": max_id_feedback,
-                "max_id_session_toxicity_rating": max_id_session_toxicity_rating,
-                "last_update_date": last_date,
-            }
-            
-            # Check if Summary_Sessions table exists and has a record
-            try:
-                summary = db_handler.load_table("Summary_Sessions")
-                if summary.empty:
-                    # Create initial record
-                    update_dict["summary_id"] = 1
-                    db_handler.add_record("Summary_Sessions", update_dict)
-                    # Created initial Summary_Sessions record
-                else:
-                    # Update existing record (summary_id = 1)
-                    db_handler.update_record("Summary_Sessions", {"summary_id": 1}, update_dict)
-                    # Updated Summary_Sessions successfully
-            except (FileNotFoundError, Exception) as e:
-                # Table doesn't exist or error loading, create it
-                update_dict["summary_id"] = 1
-                db_handler.add_record("Summary_Sessions", update_dict)
-                # Created Summary_Sessions table with initial record
-            
-            # Update session state with new values
-            self.session.state["sum_toxic_score"] = sum_toxic_score
-            self.session.state["max_toxic_score"] = max_toxic_score
-            self.session.state["min_toxic_score"] = min_toxic_score
-            self.session.state["avg_toxic_score"] = avg_toxic_score
-            self.session.state["sum_filter_violations"] = sum_filter_violations
-            self.session.state["avg_filter_violations"] = avg_filter_violations
-            self.session.state["count_guys"] = count_guys
-            self.session.state["max_id_session_responses"] = max_id_session_responses
-            self.session.state["max_id_gtk_responses"] = max_id_gtk_responses
-            self.session.state["max_id_feedback"] = max_id_feedback
-            self.session.state["max_id_session_toxicity_rating"] = max_id_session_toxicity_rating
-            
-        except Exception as e:
-            # Failed to update Summary_Sessions
-            pass
-    
-    def _save_session_insights(self, db_handler):
-        """Save session insights to database (CSV or DynamoDB)."""
+    def _session_insights_record(self):
+        """Build the session_insights record (None if there is nothing to save)."""
         try:
             insight_metadata = self.session.state.get("insight_metadata")
             if not insight_metadata:
-                return
+                return None
             
             from typing import List, Tuple, Optional
             from src.utils.session_id_generator import generate_session_id
@@ -833,25 +562,10 @@ class ResultsStep(BaseStep):
                 "result_start_time": session_data.get("result_start_time", ""),
             }
             
-            # Save to database (CSV or DynamoDB) - update if exists
-            try:
-                existing = db_handler.load_table("session_insights")
-                if not existing.empty:
-                    # Ensure id column is numeric for proper comparison
-                    existing["id"] = pd.to_numeric(existing["id"], errors='coerce')
-                    if session_id in existing["id"].values:
-                        db_handler.update_record("session_insights", {"id": session_id}, record_data)
-                        # Updated existing session_insights record
-                    else:
-                        db_handler.add_record("session_insights", record_data)
-                        # Created new session_insights record
-                else:
-                    db_handler.add_record("session_insights", record_data)
-                    # Created new session_insights record
-            except Exception as e:
-                db_handler.add_record("session_insights", record_data)
-            
+            return record_data
+
         except Exception as e:
-            # Failed to save session insights
-            pass
+            # Insights are optional; save the other records without them
+            print(f"[WARNING] Could not prepare session insights: {e}")
+            return None
 
@@ -1,26 +1,133 @@
-"""Mappers to convert between DataFrames and value objects."""
+"""Mappers to convert between DataFrames and value objects.
+
+The mappers work column-wise: each column is converted once into a plain Python list
+(with missing values as None, using a single notna mask per column) and the value
+objects are built by zipping the lists. This avoids the per-row Series construction of
+``df.iterrows()``.
+"""
 import pandas as pd
-from typing import List
-from src.domain.value_objects import FilterQuestion, RedFlagQuestion, GTKQuestion
+from typing import Callable, List
+from src.domain.value_objects import FilterQuestion, RedFlagQuestion, GTKQuestion, parse_levels
+
+
+def _column(
+    df: pd.DataFrame, name: str, cast: Callable = None, default=None, keep_missing: bool = False
+) -> list:
+    """
+    Return a column as a list, with missing values replaced by default.
+
+    Args:
+        df: Source DataFrame
+        name: Column name
+        cast: Optional conversion applied to present values (e.g. int, str)
+        default: Value used for missing entries (and for every row if the column is absent)
+        keep_missing: If True, cast is also applied to missing values (mirrors ``str(nan)``)
+
+    Returns:
+        List with one value per row
+    """
+    if name not in df.columns:
+        return [default] * len(df)
+    values = df[name].tolist()
+    if keep_missing:
+        return [cast(v) for v in values] if cast else values
+    mask = df[name].notna().tolist()
+    if cast is None:
+        return [v if present else default for v, present in zip(values, mask)]
+    return [cast(v) if present else default for v, present in zip(values, mask)]
+
+
+def _required(df: pd.DataFrame, name: str, cast: Callable) -> list:
+    """Return a required column cast to a type (raises KeyError if it is missing)."""
+    return [cast(v) for v in df[name].tolist()]
 
 
 def map_filter_questions(df: pd.DataFrame) -> List[FilterQuestion]:
     """Convert DataFrame to list of FilterQuestion value objects."""
     if df.empty:
         return []
-    return [FilterQuestion.from_dataframe_row(row) for _, row in df.iterrows()]
+    return [
+        FilterQuestion(
+            filter_id=filter_id,
+            filter_name=filter_name,
+            scoring=scoring,
+            upper_limit=upper_limit,
+            question_tr=question_tr,
+            question_en=question_en,
+        )
+        for filter_id, filter_name, scoring, upper_limit, question_tr, question_en in zip(
+            _required(df, "Filter_ID", int),
+            _column(df, "Filter_Name", str, default="", keep_missing=True),
+            _required(df, "Scoring", str),
+            _required(df, "Upper_Limit", int),
+            _required(df, "Filter_Question_TR", str),
+            _required(df, "Filter_Question_EN", str),
+        )
+    ]
 
 
 def map_redflag_questions(df: pd.DataFrame) -> List[RedFlagQuestion]:
     """Convert DataFrame to list of RedFlagQuestion value objects."""
     if df.empty:
         return []
-    return [RedFlagQuestion.from_dataframe_row(row) for _, row in df.iterrows()]
+    columns = zip(
+        _required(df, "ID", int),
+        _column(df, "Category_ID", int),
+        _column(df, "Category_Name", str),
+        _column(df, "RedFLag_ID", int),
+        _column(df, "RedFlag_Name", str),
+        _required(df, "Scoring", str),
+        _column(df, "Weight", float, default=1.0),
+        _column(df, "Worst_Situation", str),
+        _required(df, "Question_TR", str),
+        _required(df, "Question_EN", str),
+        _column(df, "Hint", str),
+    )
+    return [
+        RedFlagQuestion(
+            question_id=question_id,
+            category_id=category_id,
+            category_name=category_name,
+            redflag_id=redflag_id,
+            redflag_name=redflag_name,
+            scoring=scoring,
+            weight=weight,
+            worst_situation=worst_situation,
+            question_tr=question_tr,
+            question_en=question_en,
+            hint=hint,
+        )
+        for (
+            question_id, category_id, category_name, redflag_id, redflag_name, scoring,
+            weight, worst_situation, question_tr, question_en, hint,
+        ) in columns
+    ]
 
 
 def map_gtk_questions(df: pd.DataFrame) -> List[GTKQuestion]:
     """Convert DataFrame to list of GTKQuestion value objects."""
     if df.empty:
         return []
-    return [GTKQuestion.from_dataframe_row(row) for _, row in df.iterrows()]
-
+    columns = zip(
+        _required(df, "GTK_ID", int),
+        _column(df, "GTK_Name", str),
+        _required(df, "Scoring", str),
+        _column(df, "Levels_TR", parse_levels),
+        _column(df, "Levels_EN", parse_levels),
+        _required(df, "Question_TR", str),
+        _required(df, "Question_EN", str),
+        _column(df, "Hint", str),
+    )
+    return [
+        GTKQuestion(
+            gtk_id=gtk_id,
+            gtk_name=gtk_name,
+            scoring=scoring,
+            levels_tr=levels_tr,
+            levels_en=levels_en,
+            question_tr=question_tr,
+            question_en=question_en,
+            hint=hint,
+        )
+        for gtk_id, gtk_name, scoring, levels_tr, levels_en, question_tr, question_en, hint in columns
+    ]
@@ -1,12 +1,35 @@
 """Value objects for survey data structures."""
+import ast
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional, Dict, Any
 from decimal import Decimal
 from datetime import datetime
 import pandas as pd
 
 
-@dataclass
+@lru_cache(maxsize=1024)
+def _parse_levels_cached(text: str):
+    try:
+        value = ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return None
+    return tuple(value) if isinstance(value, list) else value
+
+
+def parse_levels(text) -> Optional[list]:
+    """Parse a stored levels literal such as "['Never', 'Sometimes']".
+
+    Parsed values are cached, since the same few level lists repeat across questions.
+    Returns None if the text is missing or not a valid literal.
+    """
+    if text is None or (not isinstance(text, (list, tuple)) and pd.isna(text)):
+        return None
+    value = _parse_levels_cached(str(text))
+    return list(value) if isinstance(value, tuple) else value
+
+
+@dataclass(slots=True)
 class UserDetails:
     """User information value object."""
     user_id: str
@@ -26,7 +49,9 @@ class UserDetails:
         }
 
 
-@dataclass
+# Question value objects are frozen and slotted: one instance per catalog row is shared by
+# all sessions through the catalog cache, so they must not be mutated and should stay small.
+@dataclass(frozen=True, slots=True)
 class FilterQuestion:
     """Filter question value object (read from RedFlagFilters table)."""
     filter_id: int
@@ -55,7 +80,7 @@ class FilterQuestion:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RedFlagQuestion:
     """RedFlag question value object (read from RedFlagQuestions table)."""
     question_id: int
@@ -94,7 +119,7 @@ class RedFlagQuestion:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GTKQuestion:
     """GetToKnow question value object (read from GetToKnowQuestions table)."""
     gtk_id: int
@@ -121,23 +146,8 @@ class GTKQuestion:
     @classmethod
     def from_dataframe_row(cls, row) -> "GTKQuestion":
         """Create from pandas DataFrame row."""
-        import ast
-        import pandas as pd
-
-        levels_tr = None
-        levels_en = None
-
-        if pd.notna(row.get("Levels_TR")):
-            try:
-                levels_tr = ast.literal_eval(str(row["Levels_TR"]))
-            except (ValueError, SyntaxError):
-                pass
-
-        if pd.notna(row.get("Levels_EN")):
-            try:
-                levels_en = ast.literal_eval(str(row["Levels_EN"]))
-            except (ValueError, SyntaxError):
-                pass
+        levels_tr = parse_levels(row.get("Levels_TR"))
+        levels_en = parse_levels(row.get("Levels_EN"))
 
         return cls(
             gtk_id=int(row["GTK_ID"]),
@@ -151,7 +161,7 @@ class GTKQuestion:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class FilterResponse:
     """Filter question responses value object."""
     responses: Dict[str, int]  # e.g., {"F1": 0, "F2": 1, ...}
@@ -165,7 +175,7 @@ class FilterResponse:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class RedFlagResponse:
     """RedFlag question responses value object."""
     responses: Dict[str, Any]  # e.g., {"Q1": 5, "Q2": 7, ...} (can include NaN)
@@ -179,7 +189,7 @@ class RedFlagResponse:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class GTKResponse:
     """GetToKnow question responses value object."""
     responses: Dict[str, int]  # e.g., {"GTK1": 1, "GTK2": 2, ...}
@@ -189,7 +199,7 @@ class GTKResponse:
         return self.responses
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionResponse:
     """Session response value object (for session_responses table)."""
     id: Optional[int] = None
@@ -248,7 +258,7 @@ class SessionResponse:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class GTKResponseRecord:
     """GTK response record value object (for session_gtk_responses table)."""
     id: Optional[int] = None
@@ -275,7 +285,7 @@ class GTKResponseRecord:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class ToxicityRatingRecord:
     """Toxicity rating record value object (for session_toxicity_rating table)."""
     id: Optional[int] = None
@@ -301,7 +311,7 @@ class ToxicityRatingRecord:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class FeedbackRecord:
     """Feedback record value object (for session_feedback table)."""
     id: Optional[int] = None
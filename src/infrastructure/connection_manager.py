@@ -1,19 +1,215 @@
 """AWS connection manager for DynamoDB."""
 import os
+import threading
 import boto3
+from botocore.config import Config
+
+# Pool defaults (overridable via environment variables)
+DEFAULT_MAX_POOL_CONNECTIONS = 50
+DEFAULT_MAX_RETRY_ATTEMPTS = 5
+DEFAULT_RETRY_MODE = "adaptive"
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 10
+
+
+class ConnectionPool:
+    """Process-wide registry of shared boto3 sessions, clients and DynamoDB resources.
+
+    Every Streamlit rerun builds new steps, handlers and adapters. Without a pool each of
+    them would read credentials and open a fresh boto3 session (with its own HTTP
+    connection pool and TLS handshakes). The pool keeps one entry per credentials source
+    and hands the same low-level client to every caller.
+
+    boto3 clients are thread-safe, resources are not. Each thread therefore gets its own
+    DynamoDB resource, rebound to the shared client so that all threads still use one
+    HTTP connection pool.
+    """
+
+    def __init__(
+        self,
+        max_pool_connections: int = None,
+        tcp_keepalive: bool = None,
+        max_retry_attempts: int = None,
+        retry_mode: str = None,
+        connect_timeout: int = None,
+        read_timeout: int = None,
+    ):
+        """
+        Initialize connection pool.
+
+        Args:
+            max_pool_connections: Max HTTP connections kept open per client
+                (env: DYNAMODB_MAX_POOL_CONNECTIONS)
+            tcp_keepalive: Enable TCP keep-alive on pooled sockets (env: DYNAMODB_TCP_KEEPALIVE)
+            max_retry_attempts: Max retry attempts for throttled/failed calls
+                (env: DYNAMODB_MAX_RETRY_ATTEMPTS)
+            retry_mode: botocore retry mode, "standard" or "adaptive" (env: DYNAMODB_RETRY_MODE)
+            connect_timeout: Socket connect timeout in seconds (env: DYNAMODB_CONNECT_TIMEOUT)
+            read_timeout: Socket read timeout in seconds (env: DYNAMODB_READ_TIMEOUT)
+        """
+        if max_pool_connections is None:
+            max_pool_connections = int(
+                os.getenv("DYNAMODB_MAX_POOL_CONNECTIONS", DEFAULT_MAX_POOL_CONNECTIONS)
+            )
+        if tcp_keepalive is None:
+            tcp_keepalive = os.getenv("DYNAMODB_TCP_KEEPALIVE", "true").lower() in ("true", "1", "yes")
+        if max_retry_attempts is None:
+            max_retry_attempts = int(
+                os.getenv("DYNAMODB_MAX_RETRY_ATTEMPTS", DEFAULT_MAX_RETRY_ATTEMPTS)
+            )
+        if retry_mode is None:
+            retry_mode = os.getenv("DYNAMODB_RETRY_MODE", DEFAULT_RETRY_MODE)
+        if connect_timeout is None:
+            connect_timeout = int(os.getenv("DYNAMODB_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT))
+        if read_timeout is None:
+            read_timeout = int(os.getenv("DYNAMODB_READ_TIMEOUT", DEFAULT_READ_TIMEOUT))
+
+        self.max_pool_connections = max_pool_connections
+        self.tcp_keepalive = tcp_keepalive
+        self.max_retry_attempts = max_retry_attempts
+        self.retry_mode = retry_mode
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._hits = 0
+        self._misses = 0
+
+    def build_config(self) -> Config:
+        """Build the botocore client configuration shared by pooled clients."""
+        return Config(
+            max_pool_connections=self.max_pool_connections,
+            tcp_keepalive=self.tcp_keepalive,
+            connect_timeout=self.connect_timeout,
+            read_timeout=self.read_timeout,
+            retries={"max_attempts": self.max_retry_attempts, "mode": self.retry_mode},
+        )
+
+    def acquire(self, conn_manager: "ConnectionManager") -> dict:
+        """
+        Get the pooled entry for a connection manager, creating it on first use.
+
+        Credentials are only loaded on a miss, so repeated acquisitions don't touch
+        the environment or the credentials file.
+
+        Args:
+            conn_manager: ConnectionManager describing the credentials source
+
+        Returns:
+            Dictionary with "session", "client" and the loaded credentials (use resource()
+            for the calling thread's DynamoDB resource)
+        """
+        key = conn_manager.pool_key()
+        entry = self._entries.get(key)
+        if entry is not None:
+            with self._lock:
+                self._hits += 1
+            return entry
+
+        with self._lock:
+            # Another thread may have created the entry while we were waiting
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._hits += 1
+                return entry
+
+            self._misses += 1
+            if not conn_manager.access_key:
+                conn_manager.load_credentials()
+
+            session = boto3.Session(
+                aws_access_key_id=conn_manager.access_key,
+                aws_secret_access_key=conn_manager.secret_key,
+                region_name=conn_manager.region_name,
+            )
+            config = self.build_config()
+            entry = {
+                "session": session,
+                "config": config,
+                "client": session.client("dynamodb", config=config),
+                "resources": threading.local(),
+                "access_key": conn_manager.access_key,
+                "secret_key": conn_manager.secret_key,
+                "region_name": conn_manager.region_name,
+            }
+            self._entries[key] = entry
+            print(
+                f"[OK] AWS DynamoDB connection pool created "
+                f"(max_connections={self.max_pool_connections}, retries={self.max_retry_attempts}/{self.retry_mode})"
+            )
+            return entry
+
+    def resource(self, entry: dict):
+        """
+        Get the calling thread's DynamoDB resource for a pooled entry.
+
+        The resource is created on the thread's first call and its client is replaced by
+        the entry's shared client, so Table calls from every thread share its connections.
+        """
+        resource = getattr(entry["resources"], "dynamodb", None)
+        if resource is None:
+            # boto3 sessions aren't thread-safe either, so resources are created under the lock
+            with self._lock:
+                resource = entry["session"].resource("dynamodb", config=entry["config"])
+            resource.meta.client = entry["client"]
+            entry["resources"].dynamodb = resource
+        return resource
+
+    def stats(self) -> dict:
+        """Return pool metrics (hits, misses, hit rate and number of pooled entries)."""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / total) if total else 0.0,
+                "entries": len(self._entries),
+                "max_pool_connections": self.max_pool_connections,
+            }
+
+    def clear(self) -> None:
+        """Drop all pooled sessions (e.g. after credential rotation)."""
+        with self._lock:
+            self._entries.clear()
+        print("[CLOSED] AWS DynamoDB connection pool cleared")
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> ConnectionPool:
+    """Return the process-wide DynamoDB connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
 
 
 class ConnectionManager:
     """Manages AWS DynamoDB connection credentials and session."""
 
-    def __init__(self, secret_file="config/aws_credentials.txt"):
+    def __init__(self, secret_file="config/aws_credentials.txt", use_pool: bool = True):
         base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         self.secret_file = os.path.join(base_dir, secret_file)
+        self.use_pool = use_pool
         self.access_key = None
         self.secret_key = None
         self.region_name = None
         self.session = None
         self.dynamodb = None
+        self.client = None
+
+    def pool_key(self):
+        """Key identifying this credentials source in the connection pool."""
+        return (
+            self.secret_file,
+            os.getenv("AWS_ACCESS_KEY_ID"),
+            os.getenv("AWS_DEFAULT_REGION"),
+        )
 
     def load_credentials(self):
         """Load AWS credentials from env vars or fallback file."""
@@ -42,7 +238,22 @@ class ConnectionManager:
         self.region_name = region_name
 
     def connect(self):
-        """Establish boto3 session and DynamoDB resource."""
+        """Establish boto3 session and DynamoDB resource.
+
+        With use_pool=True (default) the session and client are shared process-wide
+        through the connection pool, and the resource is shared by the calling thread.
+        """
+        if self.use_pool:
+            pool = get_connection_pool()
+            entry = pool.acquire(self)
+            self.access_key = entry["access_key"]
+            self.secret_key = entry["secret_key"]
+            self.region_name = entry["region_name"]
+            self.session = entry["session"]
+            self.client = entry["client"]
+            self.dynamodb = pool.resource(entry)
+            return self.dynamodb
+
         if not self.access_key:
             self.load_credentials()
 
@@ -52,12 +263,29 @@ class ConnectionManager:
             region_name=self.region_name
         )
         self.dynamodb = self.session.resource("dynamodb")
+        self.client = self.dynamodb.meta.client
         print("[OK] AWS DynamoDB connection established")
         return self.dynamodb
 
+    def thread_resource(self):
+        """DynamoDB resource for the calling thread (resources are not thread-safe).
+
+        Pooled managers give every thread its own resource on the shared client; an
+        unpooled manager only has the resource created by connect().
+        """
+        if not self.use_pool:
+            return self.dynamodb
+        pool = get_connection_pool()
+        return pool.resource(pool.acquire(self))
+
     def close(self):
-        """Close the session and release resources."""
+        """Close the session and release resources.
+
+        Pooled sessions stay open for other callers; only this manager's references
+        are dropped.
+        """
         self.session = None
         self.dynamodb = None
-        print("[CLOSED] AWS DynamoDB connection closed")
-
+        self.client = None
+        if not self.use_pool:
+            print("[CLOSED] AWS DynamoDB connection closed")
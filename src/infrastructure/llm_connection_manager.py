@@ -1,5 +1,9 @@
-"""LLM connection manager - handles loading LLM API credentials."""
+"""LLM connection manager - handles loading LLM API credentials and pooling LLM clients."""
+import hashlib
 import os
+import threading
+import time
+from typing import Callable
 
 # Try to load .env file if python-dotenv is available
 try:
@@ -77,6 +81,35 @@ class LLMConnectionManager:
             "model_name": self.model_name,
         }
 
+    def get_all_credentials(self):
+        """
+        Get credentials of every configured provider, in order of preference.
+
+        Every provider with an API key in the environment is included (Hugging Face,
+        then Groq); the credentials file is used only when neither is set.
+
+        Returns:
+            List of credential dicts (provider, api_key, model_name); empty if none
+        """
+        providers = []
+        if os.getenv("HF_API_TOKEN"):
+            providers.append({
+                "provider": "huggingface",
+                "api_key": os.getenv("HF_API_TOKEN"),
+                "model_name": os.getenv("HF_MODEL", "gpt2"),
+            })
+        if os.getenv("GROQ_API_KEY"):
+            providers.append({
+                "provider": "groq",
+                "api_key": os.getenv("GROQ_API_KEY"),
+                "model_name": os.getenv("GROQ_MODEL", "llama-3.1-8b-instant"),
+            })
+        if providers:
+            return providers
+
+        credentials = self.get_credentials()
+        return [credentials] if credentials.get("provider") and credentials.get("api_key") else []
+
     def close(self):
         """Close/reset connection."""
         self.provider = None
@@ -84,3 +117,167 @@ class LLMConnectionManager:
         self.model_name = None
         print("[CLOSED] LLM connection manager closed")
 
+
+# Pool defaults (overridable via environment variables)
+DEFAULT_CLIENT_MAX_AGE = 3600
+DEFAULT_CLIENT_MAX_FAILURES = 3
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 60
+
+
+class LLMClientPool:
+    """Process-wide registry of LLM API clients and the loaded credentials.
+
+    Without a pool every session would re-read the credentials and build a new Groq or
+    InferenceClient (with its own HTTP connection pool and TLS handshakes). The pool keeps
+    one client per (provider, model, API key) and hands it to every adapter; the SDK
+    clients are thread-safe and keep their HTTP connections alive between requests.
+
+    A client is rebuilt on the next acquire once it is older than ``max_age`` seconds or
+    after ``max_failures`` consecutive failed requests, so a broken connection pool
+    doesn't outlive a provider outage.
+    """
+
+    def __init__(
+        self,
+        max_age: float = None,
+        max_failures: int = None,
+        max_connections: int = None,
+        keepalive_expiry: float = None,
+    ):
+        """
+        Initialize the client pool.
+
+        Args:
+            max_age: Seconds before a client and the credentials are refreshed
+                (env: LLM_CLIENT_MAX_AGE)
+            max_failures: Consecutive failures before a client is rebuilt
+                (env: LLM_CLIENT_MAX_FAILURES)
+            max_connections: Max HTTP connections kept open per client (env: LLM_MAX_CONNECTIONS)
+            keepalive_expiry: Seconds an idle HTTP connection is kept open
+                (env: LLM_KEEPALIVE_EXPIRY)
+        """
+        if max_age is None:
+            max_age = float(os.getenv("LLM_CLIENT_MAX_AGE", DEFAULT_CLIENT_MAX_AGE))
+        if max_failures is None:
+            max_failures = int(os.getenv("LLM_CLIENT_MAX_FAILURES", DEFAULT_CLIENT_MAX_FAILURES))
+        if max_connections is None:
+            max_connections = int(os.getenv("LLM_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS))
+        if keepalive_expiry is None:
+            keepalive_expiry = float(os.getenv("LLM_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY))
+
+        self.max_age = max_age
+        self.max_failures = max(1, max_failures)
+        self.max_connections = max_connections
+        self.keepalive_expiry = keepalive_expiry
+
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> {"client", "created_at", "failures"}
+        self._credentials = None  # (loaded_at, list of credential dicts)
+        self._hits = 0
+        self._misses = 0
+        self._refreshes = 0
+
+    @staticmethod
+    def pool_key(provider: str, model_name: str, api_key: str, timeout: float = None) -> tuple:
+        """Key of a client in the pool (the API key is only kept as a fingerprint)."""
+        fingerprint = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+        return (provider, model_name, fingerprint, timeout)
+
+    def credentials(self) -> list:
+        """Credentials of every configured provider, loaded once per max_age."""
+        cached = self._credentials
+        if cached is not None and time.time() - cached[0] < self.max_age:
+            return cached[1]
+        with self._lock:
+            cached = self._credentials
+            if cached is not None and time.time() - cached[0] < self.max_age:
+                return cached[1]
+            credentials = LLMConnectionManager().get_all_credentials()
+            self._credentials = (time.time(), credentials)
+            return credentials
+
+    def acquire(self, key: tuple, builder: Callable[[], object]):
+        """
+        Get the pooled client for key, building it on first use or when it needs a refresh.
+
+        Args:
+            key: Key from pool_key
+            builder: Function creating a new client
+
+        Returns:
+            Shared client instance
+        """
+        entry = self._entries.get(key)
+        if entry is not None and self._is_fresh(entry):
+            with self._lock:
+                self._hits += 1
+            return entry["client"]
+
+        with self._lock:
+            # Another thread may have created the entry while we were waiting
+            entry = self._entries.get(key)
+            if entry is not None and self._is_fresh(entry):
+                self._hits += 1
+                return entry["client"]
+
+            if entry is None:
+                self._misses += 1
+            else:
+                # Stale clients are dropped, not closed: other threads may still use them
+                self._refreshes += 1
+                print(f"[INFO] Refreshing LLM client for {key[0]}:{key[1]}")
+            client = builder()
+            self._entries[key] = {"client": client, "created_at": time.time(), "failures": 0}
+            return client
+
+    def report_success(self, key: tuple) -> None:
+        """Reset the failure count of a client after a successful request."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry["failures"] = 0
+
+    def report_failure(self, key: tuple) -> None:
+        """Count a failed request of a client."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry["failures"] += 1
+
+    def _is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry["created_at"] < self.max_age and entry["failures"] < self.max_failures
+
+    def stats(self) -> dict:
+        """Return pool metrics (hits, misses, refreshes, hit rate and number of clients)."""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "refreshes": self._refreshes,
+                "hit_rate": (self._hits / total) if total else 0.0,
+                "entries": len(self._entries),
+                "max_connections": self.max_connections,
+            }
+
+    def clear(self) -> None:
+        """Drop all pooled clients and the loaded credentials (e.g. after key rotation)."""
+        with self._lock:
+            self._entries.clear()
+            self._credentials = None
+        print("[CLOSED] LLM client pool cleared")
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_llm_client_pool() -> LLMClientPool:
+    """Return the process-wide LLM client pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = LLMClientPool()
+    return _pool
@@ -1,11 +1,11 @@
 """Main entry point for the Streamlit survey application."""
 import streamlit as st
-from decimal import Decimal
 from src.application.messages import Message
 from src.application.session_manager import SessionManager
 from src.application.survey_controller import SurveyController
 from src.adapters.database.database_handler import DatabaseHandler
 from src.utils.debug_helper import setup_mock_data_for_testing, is_debug_mode
+from src.utils.summary_aggregates import DEFAULT_SUMMARY, load_summary
 
 # import steps
 from src.application.steps.ask_language import AskLanguage
@@ -70,64 +70,13 @@ def _load_summary_statistics(DB_READ, session):
     """Load summary statistics from Summary_Sessions table at app start."""
     try:
         db_handler = DatabaseHandler(db_read_allowed=DB_READ, db_write_allowed=DB_READ)
-        summary = db_handler.load_table("Summary_Sessions")
-        
-        if not summary.empty:
-            row = summary.iloc[0]
-            session.state["sum_toxic_score"] = Decimal(str(row.get("sum_toxic_score", 0)))
-            session.state["max_toxic_score"] = Decimal(str(row.get("max_toxic_score", 0)))
-            session.state["min_toxic_score"] = Decimal(str(row.get("min_toxic_score", 0)))
-            session.state["avg_toxic_score"] = Decimal(str(row.get("avg_toxic_score", 0)))
-            session.state["sum_filter_violations"] = row.get("sum_filter_violations", 0)
-            session.state["avg_filter_violations"] = row.get("avg_filter_violations", 0)
-            session.state["count_guys"] = row.get("count_guys", 0)
-            # max_id fields no longer loaded - IDs are now hash-based and order-agnostic
-            # Summary statistics loaded successfully
-        else:
+        if not db_handler.exists("Summary_Sessions", {"summary_id": 1}):
             # Initialize Summary_Sessions with default values if table is empty
             from src.utils.summary_initializer import initialize_summary_sessions
-            if initialize_summary_sessions(db_handler):
-                # Reload to get the initialized values
-                summary = db_handler.load_table("Summary_Sessions")
-                if not summary.empty:
-                    row = summary.iloc[0]
-                    session.state["sum_toxic_score"] = Decimal(str(row.get("sum_toxic_score", 0)))
-                    session.state["max_toxic_score"] = Decimal(str(row.get("max_toxic_score", 0)))
-                    session.state["min_toxic_score"] = Decimal(str(row.get("min_toxic_score", 0)))
-                    session.state["avg_toxic_score"] = Decimal(str(row.get("avg_toxic_score", 0)))
-                    session.state["sum_filter_violations"] = row.get("sum_filter_violations", 0)
-                    session.state["avg_filter_violations"] = row.get("avg_filter_violations", 0)
-                    session.state["count_guys"] = row.get("count_guys", 0)
-                    # Summary_Sessions initialized successfully
-                else:
-                    # Fallback to defaults if initialization failed
-                    session.state["sum_toxic_score"] = Decimal("0")
-                    session.state["max_toxic_score"] = Decimal("1")
-                    session.state["min_toxic_score"] = Decimal("0")
-                    session.state["avg_toxic_score"] = Decimal("0.5")
-                    session.state["sum_filter_violations"] = 0
-                    session.state["avg_filter_violations"] = 0
-                    session.state["count_guys"] = 0
-            else:
-                # Fallback to defaults if initialization failed
-                session.state["sum_toxic_score"] = Decimal("0")
-                session.state["max_toxic_score"] = Decimal("1")  # Start at 1 (max possible)
-                session.state["min_toxic_score"] = Decimal("0")  # Start at 0 (min possible)
-                session.state["avg_toxic_score"] = Decimal("0.5")
-                session.state["sum_filter_violations"] = 0
-                session.state["avg_filter_violations"] = 0
-                session.state["count_guys"] = 0
-                # Summary_Sessions initialization failed, using defaults
-        
+            initialize_summary_sessions(db_handler)
+        # Merges all counter shards; falls back to defaults when no session is recorded yet
+        session.state.update(load_summary(db_handler))
         db_handler.close()
     except (FileNotFoundError, Exception) as e:
         # Could not load summary statistics, using defaults
-        # Set defaults on error (table doesn't exist yet or other error)
-        session.state["sum_toxic_score"] = Decimal("0")
-        session.state["max_toxic_score"] = Decimal("1")  # Start at 1 (max possible)
-        session.state["min_toxic_score"] = Decimal("0")  # Start at 0 (min possible)
-        session.state["avg_toxic_score"] = Decimal("0.5")
-        session.state["sum_filter_violations"] = 0
-        session.state["avg_filter_violations"] = 0
-        session.state["count_guys"] = 0
-        # max_id fields no longer initialized - IDs are now hash-based
+        session.state.update(DEFAULT_SUMMARY)
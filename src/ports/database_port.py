@@ -1,5 +1,6 @@
 """Port (interface) for database operations."""
 from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional, Tuple
 import pandas as pd
 
 
@@ -7,10 +8,30 @@ class DatabasePort(ABC):
     """Abstract interface for database operations."""
 
     @abstractmethod
-    def load_table(self, table_name: str) -> pd.DataFrame:
-        """Load data from a table."""
+    def load_table(
+        self, table_name: str, columns: Optional[List[str]] = None, dtypes: Optional[dict] = None
+    ) -> pd.DataFrame:
+        """Load data from a table.
+
+        Args:
+            table_name: Name of the table
+            columns: Only load these columns, in this order (missing ones are all-NaN);
+                all columns if None
+            dtypes: Optional {column: dtype} applied to the loaded columns
+        """
         pass
 
+    def iter_table(self, table_name: str, chunk_size: int = 10000) -> Iterator[pd.DataFrame]:
+        """Yield the rows of a table in DataFrames of at most chunk_size rows.
+
+        Backends that can stream (CSV chunks, SQLite cursors, DynamoDB scan pages) override
+        this so large tables never have to fit in memory at once. The default slices
+        ``load_table``.
+        """
+        df = self.load_table(table_name)
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+
     @abstractmethod
     def add_record(self, table_name: str, newdata_dict: dict) -> bool:
         """Add a new record to a table."""
@@ -35,6 +56,138 @@ class DatabasePort(ABC):
         """
         pass
 
+    def update_records(self, table_name: str, updates: List[Tuple[dict, dict]]) -> int:
+        """Apply many updates to one table, batched where the backend allows it.
+
+        Args:
+            table_name: Name of the table
+            updates: List of (key_dict, update_dict) pairs, as for update_record
+
+        Returns:
+            Number of updates applied
+        """
+        for key_dict, update_dict in updates:
+            self.update_record(table_name, key_dict, update_dict)
+        return len(updates)
+
+    @abstractmethod
+    def get_record(self, table_name: str, key_dict: dict) -> Optional[dict]:
+        """Fetch a single record by its primary key.
+
+        Args:
+            table_name: Name of the table
+            key_dict: Primary key of the record (e.g. {"id": 123})
+
+        Returns:
+            Record as a dictionary, or None if no record matches the key
+        """
+        pass
+
+    def exists(self, table_name: str, key_dict: dict) -> bool:
+        """Check whether a record with the given primary key exists."""
+        return self.get_record(table_name, key_dict) is not None
+
+    def query_index(self, table_name: str, key_dict: dict, index_name: Optional[str] = None) -> List[dict]:
+        """Fetch all records whose (non-key) attributes equal key_dict.
+
+        Backends answer this from a secondary index (a DynamoDB GSI, SQLite indexes, an
+        in-memory index for CSV) instead of a table scan. The default filters
+        ``load_table``.
+
+        Args:
+            table_name: Name of the table
+            key_dict: Attribute values to match (e.g. {"user_id": ..., "boyfriend_name": ...})
+            index_name: Index to query; looked up from the table schema if None
+
+        Returns:
+            Matching records as dictionaries (possibly only the index's projected
+            attributes, which always include the primary key)
+        """
+        try:
+            df = self.load_table(table_name)
+        except FileNotFoundError:
+            return []
+        if df.empty or any(k not in df.columns for k in key_dict):
+            return []
+        mask = pd.Series(True, index=df.index)
+        for k, v in key_dict.items():
+            mask &= df[k] == v
+        return df[mask].to_dict("records")
+
+    @abstractmethod
+    def upsert_record(
+        self, table_name: str, record: dict, key_column: str = "id", overwrite: bool = True
+    ) -> bool:
+        """Insert a record, or replace the existing record with the same key.
+
+        Args:
+            table_name: Name of the table
+            record: Full record to store (must contain key_column)
+            key_column: Name of the primary key column (default: "id")
+            overwrite: If False, only insert when no record with this key exists
+
+        Returns:
+            True if the record was written, False otherwise
+        """
+        pass
+
+    def write_batch(self, records: List[Tuple[str, dict]], key_column: str = "id") -> bool:
+        """Write records to one or more tables as a single unit.
+
+        Each record replaces the stored record with the same key, as with upsert_record.
+        Backends write the batch in as few round trips as they can and either store every
+        record or none of them. The default upserts one record at a time, without that
+        guarantee.
+
+        Args:
+            records: List of (table_name, record) pairs
+            key_column: Name of the primary key column of every table (default: "id")
+
+        Returns:
+            True if every record was written, False otherwise
+        """
+        written = True
+        for table_name, record in records:
+            written = self.upsert_record(table_name, record, key_column) and written
+        return written
+
+    @abstractmethod
+    def update_aggregates(
+        self,
+        table_name: str,
+        key_dict: dict,
+        increments: Optional[dict] = None,
+        minimums: Optional[dict] = None,
+        maximums: Optional[dict] = None,
+        sets: Optional[dict] = None,
+    ) -> Optional[dict]:
+        """Atomically update counters and running min/max values of one record.
+
+        Unlike update_record, values are combined with what is stored at write time,
+        so concurrent writers never overwrite each other's contributions. The record
+        is created if it doesn't exist yet.
+
+        Args:
+            table_name: Name of the table
+            key_dict: Primary key of the record (e.g. {"summary_id": 1})
+            increments: Fields to add to (missing fields start at 0)
+            minimums: Fields replaced only if the new value is smaller (or field is missing)
+            maximums: Fields replaced only if the new value is larger (or field is missing)
+            sets: Fields overwritten unconditionally
+
+        Returns:
+            The record after the update, or None if the update failed
+        """
+        pass
+
+    def get_table_version(self, table_name: str) -> Optional[str]:
+        """Return a token that changes whenever the table changes, if cheaply available.
+
+        Used by caches to notice changes before their TTL expires. Backends without a
+        cheap change marker return None.
+        """
+        return None
+
     @abstractmethod
     def close(self) -> None:
         """Close the database connection."""
@@ -1,6 +1,11 @@
 """Port (interface) for LLM operations."""
 from abc import ABC, abstractmethod
-from typing import Optional, List, Tuple
+from concurrent.futures import Executor, Future
+from typing import Iterator, Optional, List, Tuple
+
+
+class StreamInterrupted(Exception):
+    """Raised by stream_insights when the stream fails after text was yielded."""
 
 
 class LLMPort(ABC):
@@ -28,7 +33,8 @@ class LLMPort(ABC):
             avg_toxic_score: Average toxicity score from all users (0-1)
             filter_violations: Number of filter violations
             violated_filter_questions: List of tuples (question_text, answer, filter_id) for violated filters
-            language: Language code (TR or EN)
+            language: Response language (EN, TR, or InsightPromptBuilder.BILINGUAL "EN+TR" for
+                both as one JSON object)
             top_redflag_questions: List of tuples (question_text, rating, question_id) for top-rated questions
             
         Returns:
@@ -36,3 +42,81 @@ class LLMPort(ABC):
         """
         pass
 
+    def generate_insights_async(
+        self,
+        executor: Executor,
+        user_name: str,
+        bf_name: str,
+        toxic_score: float,
+        avg_toxic_score: float,
+        filter_violations: int,
+        violated_filter_questions: Optional[List[Tuple[str, int, str]]] = None,
+        language: str = "EN",
+        top_redflag_questions: Optional[List[Tuple[str, float, str]]] = None,
+    ) -> "Future[Optional[str]]":
+        """
+        Start generate_insights on an executor and return its Future.
+
+        The default runs the blocking call on one of the executor's threads; adapters with
+        a native async client can override it. Callers wait on the Future with their own
+        deadline, so adapters should also bound each request with a client timeout.
+
+        Args:
+            executor: Executor running the request
+            (other arguments as for generate_insights)
+
+        Returns:
+            Future resolving to the generated insights text or None
+        """
+        return executor.submit(
+            self.generate_insights,
+            user_name=user_name,
+            bf_name=bf_name,
+            toxic_score=toxic_score,
+            avg_toxic_score=avg_toxic_score,
+            filter_violations=filter_violations,
+            violated_filter_questions=violated_filter_questions,
+            language=language,
+            top_redflag_questions=top_redflag_questions,
+        )
+
+    def stream_insights(
+        self,
+        user_name: str,
+        bf_name: str,
+        toxic_score: float,
+        avg_toxic_score: float,
+        filter_violations: int,
+        violated_filter_questions: Optional[List[Tuple[str, int, str]]] = None,
+        language: str = "EN",
+        top_redflag_questions: Optional[List[Tuple[str, float, str]]] = None,
+    ) -> Iterator[str]:
+        """
+        Generate insights as a stream of text chunks.
+
+        The default yields the whole result of generate_insights as one chunk; adapters
+        whose API can stream override it. An error before the first chunk ends the stream
+        without text (nothing is raised).
+
+        Args:
+            (as for generate_insights)
+
+        Yields:
+            Consecutive pieces of the insights text
+
+        Raises:
+            StreamInterrupted: If the stream fails after some text was yielded (the text
+                is incomplete)
+        """
+        insights = self.generate_insights(
+            user_name=user_name,
+            bf_name=bf_name,
+            toxic_score=toxic_score,
+            avg_toxic_score=avg_toxic_score,
+            filter_violations=filter_violations,
+            violated_filter_questions=violated_filter_questions,
+            language=language,
+            top_redflag_questions=top_redflag_questions,
+        )
+        if insights:
+            yield insights
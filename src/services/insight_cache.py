@@ -0,0 +1,231 @@
+"""Content-addressed cache of generated insights.
+
+An insight depends only on the model, the response language and the prompt, so it is
+cached under a hash of those. Before hashing, the names in the prompt are replaced with
+placeholders and the scores are rounded to ``INSIGHT_CACHE_SCORE_STEP`` (the LLM is asked
+with the rounded scores too, so a cached text fits every profile with the same key).
+Cached texts keep the placeholders and get the session's names back on a hit.
+
+Entries live in an in-memory LRU tier shared by all sessions and, with
+``INSIGHT_CACHE_PERSISTENT=true``, in the Insight_Cache table of the DatabasePort.
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+INSIGHT_CACHE_TABLE = "Insight_Cache"
+USER_PLACEHOLDER = "{{user_name}}"
+PARTNER_PLACEHOLDER = "{{bf_name}}"
+
+# Entries kept in memory (env: INSIGHT_CACHE_SIZE, 0 disables the memory tier)
+DEFAULT_CACHE_SIZE = 512
+# Seconds a cached insight is served (env: INSIGHT_CACHE_TTL)
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+# Scores (0-1) are rounded to multiples of this step (env: INSIGHT_CACHE_SCORE_STEP)
+DEFAULT_SCORE_STEP = 0.02
+
+
+def bucket_score(score: float, step: float = None) -> float:
+    """Round a score to the cache's score precision."""
+    if step is None:
+        step = float(os.getenv("INSIGHT_CACHE_SCORE_STEP", DEFAULT_SCORE_STEP))
+    if step <= 0:
+        return float(score)
+    return round(round(float(score) / step) * step, 6)
+
+
+def insight_cache_key(model_name: Optional[str], language: str, prompt_text: str) -> str:
+    """Hash of the model name, language and prompt (whitespace-normalized)."""
+    normalized = " ".join(prompt_text.split())
+    content = f"{model_name or ''}\n{language}\n{normalized}"
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+# Dotted/dotless i variants are folded together, so Turkish and English casing both match
+_I_VARIANTS = str.maketrans({"İ": "i", "I": "i", "ı": "i"})
+
+
+def _fold(text: str) -> str:
+    """Case-fold text for name comparisons (Turkish-aware)."""
+    return text.translate(_I_VARIANTS).casefold()
+
+
+def _name_pattern(name: str):
+    """Case-insensitive whole-word pattern for a name (None for names too short to replace safely)."""
+    if len(name) < 2:
+        return None
+    return re.compile(r"(?<!\w)" + re.escape(name) + r"(?!\w)", re.IGNORECASE)
+
+
+def to_template(text: str, user_name: Optional[str], bf_name: Optional[str]) -> Optional[str]:
+    """
+    Replace the session's names in an insight with placeholders.
+
+    Returns:
+        Template text, or None if a name cannot be replaced safely (too short, or a
+        variant of it such as a suffixed form is still in the text); such insights
+        must not be cached
+    """
+    names = [(name.strip(), placeholder) for name, placeholder in
+             [(user_name, USER_PLACEHOLDER), (bf_name, PARTNER_PLACEHOLDER)] if name and name.strip()]
+    # Longer name first, so a name containing the other one is replaced whole
+    names.sort(key=lambda item: len(item[0]), reverse=True)
+    for name, placeholder in names:
+        pattern = _name_pattern(name)
+        if pattern is None:
+            return None
+        text = pattern.sub(placeholder, text)
+    folded = _fold(text.replace(USER_PLACEHOLDER, " ").replace(PARTNER_PLACEHOLDER, " "))
+    if any(_fold(name) in folded for name, _ in names):
+        return None
+    return text
+
+
+def personalize(template: str, user_name: Optional[str], bf_name: Optional[str]) -> str:
+    """Put the session's names into a cached insight."""
+    return template.replace(USER_PLACEHOLDER, user_name or "").replace(PARTNER_PLACEHOLDER, bf_name or "")
+
+
+class InsightCache:
+    """Thread-safe LRU cache of insight templates with TTL and an optional persistent tier."""
+
+    def __init__(self, max_entries: int = None, ttl_seconds: float = None, persistent: bool = None):
+        if max_entries is None:
+            max_entries = int(os.getenv("INSIGHT_CACHE_SIZE", DEFAULT_CACHE_SIZE))
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("INSIGHT_CACHE_TTL", DEFAULT_TTL_SECONDS))
+        if persistent is None:
+            persistent = os.getenv("INSIGHT_CACHE_PERSISTENT", "false").lower() == "true"
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.persistent = persistent
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, template)
+        self._metrics = {
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+            "stores": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any tier can serve insights."""
+        return self.max_entries > 0 or self.persistent
+
+    def get(self, key: str, db_handler=None) -> Optional[str]:
+        """
+        Return the cached template for key, or None on a miss.
+
+        Args:
+            key: Key from insight_cache_key
+            db_handler: DatabaseHandler of the persistent tier (used if persistent)
+
+        Returns:
+            Insight template (see personalize) or None
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._metrics["memory_hits"] += 1
+                    return entry[1]
+                del self._entries[key]
+                self._metrics["expired"] += 1
+
+        template = self._get_persistent(key, now, db_handler)
+        with self._lock:
+            if template is None:
+                self._metrics["misses"] += 1
+                return None
+            self._metrics["persistent_hits"] += 1
+        self._put_memory(key, template, now + self.ttl_seconds)
+        return template
+
+    def put(self, key: str, template: str, model_name: str = None, db_handler=None) -> None:
+        """Store an insight template in every enabled tier."""
+        if not template:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        self._put_memory(key, template, expires_at)
+        if self.persistent and db_handler is not None:
+            try:
+                db_handler.upsert_record(
+                    INSIGHT_CACHE_TABLE,
+                    {
+                        "cache_key": key,
+                        "insight": template,
+                        "model_name": model_name or "",
+                        "expires_at": int(expires_at),
+                    },
+                    key_column="cache_key",
+                )
+            except Exception as e:
+                print(f"[WARNING] Could not store insight in {INSIGHT_CACHE_TABLE}: {e}")
+        with self._lock:
+            self._metrics["stores"] += 1
+
+    def _put_memory(self, key: str, template: str, expires_at: float) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (expires_at, template)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._metrics["evictions"] += 1
+
+    def _get_persistent(self, key: str, now: float, db_handler) -> Optional[str]:
+        if not self.persistent or db_handler is None:
+            return None
+        try:
+            record = db_handler.get_record(INSIGHT_CACHE_TABLE, {"cache_key": key})
+        except Exception as e:
+            print(f"[WARNING] Could not read {INSIGHT_CACHE_TABLE}: {e}")
+            return None
+        if not record or not record.get("insight"):
+            return None
+        if float(record.get("expires_at") or 0) <= now:
+            with self._lock:
+                self._metrics["expired"] += 1
+            return None
+        return str(record["insight"])
+
+    def invalidate(self) -> None:
+        """Drop every in-memory entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return cache metrics (hits per tier, misses, hit rate, evictions and entries)."""
+        with self._lock:
+            hits = self._metrics["memory_hits"] + self._metrics["persistent_hits"]
+            total = hits + self._metrics["misses"]
+            return {
+                **self._metrics,
+                "hits": hits,
+                "hit_rate": (hits / total) if total else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_insight_cache() -> InsightCache:
+    """Return the process-wide insight cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = InsightCache()
+    return _cache
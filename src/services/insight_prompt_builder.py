@@ -1,5 +1,6 @@
 """Prompt builder for LLM insights generation."""
-from typing import Optional, List, Tuple
+import json
+from typing import Dict, Optional, List, Tuple
 from src.utils.redflag_utils import format_redflag_questions_for_llm, format_violated_filter_questions_for_llm
 
 
@@ -9,6 +10,53 @@ class InsightPromptBuilder:
     # System message (used by Groq and other chat-based models)
     SYSTEM_MESSAGE_EN = "You are a supportive relationship counselor providing empathetic insights based on survey results."
     SYSTEM_MESSAGE_TR = "Anket sonuçlarına dayalı empatik içgörüler sağlayan destekleyici bir ilişki danışmanısınız."
+
+    # Response language asking for the same insights in English and Turkish as one JSON object
+    BILINGUAL = "EN+TR"
+
+    # Output token budget relative to an English response (Turkish needs more tokens per word)
+    OUTPUT_TOKEN_FACTORS = {"EN": 1.0, "TR": 1.5, BILINGUAL: 2.6}
+
+    # Instruction appended to the English prompt for each non-English response language
+    LANGUAGE_INSTRUCTIONS = {
+        "TR": "- Write the entire response in Turkish.",
+        BILINGUAL: (
+            "- Write the response in English and in Turkish. Reply with only a JSON object of the form "
+            '{"EN": "<response in English>", "TR": "<the same response in Turkish>"}; '
+            "the word limit applies to each language separately."
+        ),
+    }
+
+    @staticmethod
+    def max_output_tokens(base_tokens: int, language: str = "EN") -> int:
+        """Output token limit for a response language, given the limit for English."""
+        return int(base_tokens * InsightPromptBuilder.OUTPUT_TOKEN_FACTORS.get(language, 1.0))
+
+    @staticmethod
+    def parse_bilingual(response: Optional[str]) -> Optional[Dict[str, str]]:
+        """
+        Parse a BILINGUAL response into {"EN": ..., "TR": ...}.
+
+        Returns:
+            Dict with the non-empty texts found, or None if the response isn't a JSON object
+        """
+        if not response:
+            return None
+        start, end = response.find("{"), response.rfind("}")
+        if start < 0 or end <= start:
+            return None
+        try:
+            parsed = json.loads(response[start:end + 1])
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(parsed, dict):
+            return None
+        texts = {
+            key.upper(): value.strip()
+            for key, value in parsed.items()
+            if isinstance(key, str) and isinstance(value, str) and value.strip()
+        }
+        return texts or None
     
     @staticmethod
     def build_prompt(
@@ -24,7 +72,8 @@ class InsightPromptBuilder:
     ) -> Tuple[str, str]:
         """
         Build the full prompt for LLM insights generation.
-        Always uses English prompt for better LLM performance, regardless of user language.
+        Always uses English prompt for better LLM performance, regardless of user language;
+        a non-English response language is requested with an instruction in the prompt.
         Questions should already be in English when passed to this function.
         
         Args:
@@ -35,7 +84,7 @@ class InsightPromptBuilder:
             filter_violations: Number of filter violations
             violated_filter_questions: List of violated filter questions (should be in English)
             top_redflag_questions: List of top redflag questions with ratings (should be in English)
-            language: Language code (TR or EN) - used for logging only, not for prompt
+            language: Language of the response: EN, TR or BILINGUAL (both, as JSON)
             max_words: Maximum number of words for the response (default: 100)
             
         Returns:
@@ -47,6 +96,9 @@ class InsightPromptBuilder:
             user_name, bf_name, toxic_score, avg_toxic_score,
             filter_violations, violated_filter_questions, top_redflag_questions, max_words
         )
+        language_instruction = InsightPromptBuilder.LANGUAGE_INSTRUCTIONS.get(language)
+        if language_instruction:
+            user_prompt = f"{user_prompt}\n{language_instruction}"
         
         return system_msg, user_prompt
     
@@ -1,21 +1,170 @@
 """Service for generating insights from survey results using LLM."""
+import atexit
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 import streamlit as st
-from typing import Optional, List, Tuple, Dict, Any
+from typing import Iterator, Optional, List, Tuple, Dict, Any
 from src.ports.llm_port import LLMPort
 from src.adapters.llm.llm_factory import LLMFactory
+from src.services.insight_cache import (
+    PARTNER_PLACEHOLDER,
+    USER_PLACEHOLDER,
+    bucket_score,
+    get_insight_cache,
+    insight_cache_key,
+    personalize,
+    to_template,
+)
+
+# Threads shared by all sessions for LLM requests (env: LLM_INSIGHTS_WORKERS)
+DEFAULT_INSIGHTS_WORKERS = 4
+
+# How insights for non-English users are produced (env: INSIGHT_LANGUAGE_MODE):
+# "direct" asks the model to answer in the user's language, "bilingual" asks for English
+# and Turkish in one JSON response, "translate" asks in English and translates afterwards.
+# The translator remains the fallback when a direct/bilingual answer isn't usable.
+LANGUAGE_MODES = ("direct", "bilingual", "translate")
+DEFAULT_LANGUAGE_MODE = "direct"
+
+# Letters that occur in practically every Turkish text and never in English
+TURKISH_LETTERS = frozenset("çğışöüÇĞİŞÖÜ")
+
+_insight_executor: Optional[ThreadPoolExecutor] = None
+_insight_executor_lock = threading.Lock()
+
+_latency_stats: Dict[str, Dict[str, float]] = {}
+_latency_stats_lock = threading.Lock()
+
+
+def get_insight_executor() -> ThreadPoolExecutor:
+    """Return the process-wide executor that runs LLM insight requests."""
+    global _insight_executor
+    if _insight_executor is None:
+        with _insight_executor_lock:
+            if _insight_executor is None:
+                workers = int(os.getenv("LLM_INSIGHTS_WORKERS", DEFAULT_INSIGHTS_WORKERS))
+                _insight_executor = ThreadPoolExecutor(
+                    max_workers=max(1, workers), thread_name_prefix="llm-insights"
+                )
+                atexit.register(_insight_executor.shutdown, wait=False, cancel_futures=True)
+    return _insight_executor
+
+
+def record_insight_latency(mode: str, llm_seconds: float, translate_seconds: float = 0.0, fallback: bool = False) -> None:
+    """Add one generation to the latency statistics of a language mode."""
+    with _latency_stats_lock:
+        stats = _latency_stats.setdefault(
+            mode, {"count": 0, "llm_seconds": 0.0, "translate_seconds": 0.0, "translations": 0, "fallbacks": 0}
+        )
+        stats["count"] += 1
+        stats["llm_seconds"] += llm_seconds
+        stats["translate_seconds"] += translate_seconds
+        stats["translations"] += 1 if translate_seconds else 0
+        stats["fallbacks"] += 1 if fallback else 0
+
+
+def get_insight_latency_stats() -> Dict[str, Dict[str, float]]:
+    """Return generation counts and average LLM/translation/total seconds per language mode."""
+    with _latency_stats_lock:
+        result = {}
+        for mode, stats in _latency_stats.items():
+            count = stats["count"] or 1
+            result[mode] = {
+                **stats,
+                "avg_llm_seconds": stats["llm_seconds"] / count,
+                "avg_translate_seconds": stats["translate_seconds"] / count,
+                "avg_total_seconds": (stats["llm_seconds"] + stats["translate_seconds"]) / count,
+            }
+        return result
+
+
+class InsightStream:
+    """Thread-safe buffer of streamed insight chunks.
+
+    The generating thread appends chunks and finishes the stream; the Streamlit script
+    thread reads them with iter_chunks (e.g. through st.write_stream).
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._chunks: List[str] = []
+        self._finished = False
+
+    def append(self, chunk: str) -> None:
+        """Add a chunk of text and wake up readers."""
+        with self._condition:
+            self._chunks.append(chunk)
+            self._condition.notify_all()
+
+    def finish(self) -> None:
+        """Mark the stream complete (no more chunks will be appended)."""
+        with self._condition:
+            self._finished = True
+            self._condition.notify_all()
+
+    @property
+    def finished(self) -> bool:
+        with self._condition:
+            return self._finished
+
+    @property
+    def text(self) -> str:
+        """All text streamed so far."""
+        with self._condition:
+            return "".join(self._chunks)
+
+    def iter_chunks(self, first_chunk_deadline: float = None, idle_timeout: float = 30.0) -> Iterator[str]:
+        """
+        Yield chunks as they arrive, starting with those already buffered.
+
+        Args:
+            first_chunk_deadline: time.time() after which to stop if nothing was streamed
+            idle_timeout: Seconds without a new chunk after which to stop
+
+        Yields:
+            Chunks of the insights text
+        """
+        position = 0
+        while True:
+            with self._condition:
+                if position == len(self._chunks) and not self._finished:
+                    if position == 0 and first_chunk_deadline is not None:
+                        timeout = first_chunk_deadline - time.time()
+                    else:
+                        timeout = idle_timeout
+                    if timeout > 0:
+                        self._condition.wait(timeout)
+                chunks = self._chunks[position:]
+                finished = self._finished
+            if not chunks:
+                # Finished, or nothing arrived before the timeout
+                return
+            position += len(chunks)
+            yield "".join(chunks)
+            if finished and position == len(self._chunks):
+                return
 
 
 class InsightService:
     """Service for generating insights from survey results."""
 
-    def __init__(self, enabled: bool = True):
+    def __init__(self, enabled: bool = True, db_handler=None):
         """
         Initialize insight service with LLM adapter.
         
         Args:
             enabled: Whether LLM features are enabled. If False, no LLM will be created.
+            db_handler: DatabaseHandler for the persistent insight cache (optional)
         """
         self.enabled = enabled
+        self.language_mode = os.getenv("INSIGHT_LANGUAGE_MODE", DEFAULT_LANGUAGE_MODE).lower()
+        if self.language_mode not in LANGUAGE_MODES:
+            print(f"[WARNING] Unknown INSIGHT_LANGUAGE_MODE {self.language_mode}, using {DEFAULT_LANGUAGE_MODE}")
+            self.language_mode = DEFAULT_LANGUAGE_MODE
+        self.cache = get_insight_cache()
+        self.db_handler = db_handler
         if enabled:
             self.llm: Optional[LLMPort] = LLMFactory.create()
         else:
@@ -54,91 +203,336 @@ class InsightService:
         Returns:
             Generated insights text or None if generation fails
         """
-        if not self.enabled:
-            print("[INFO] LLM features are disabled.")
-            return None
-        
-        if not self.llm:
-            print("[WARNING] LLM not configured. Insights generation disabled.")
+        if not self._llm_available():
             return None
 
         try:
-            # Get model name and provider from LLM adapter
+            llm_language = self._llm_language(language)
+            prompt_toxic_score, prompt_avg_toxic_score = self._prompt_scores(toxic_score, avg_toxic_score)
+            prompt_text = self._build_prompt_text(
+                user_name, bf_name, prompt_toxic_score, prompt_avg_toxic_score, filter_violations,
+                violated_filter_questions, top_redflag_questions, llm_language,
+            )
+            cache_prompt, insights = self._cached_insights(
+                user_name, bf_name, prompt_toxic_score, prompt_avg_toxic_score, filter_violations,
+                violated_filter_questions, top_redflag_questions, language, llm_language,
+            )
+            cached = insights is not None
             model_name = None
-            provider = None
-            if hasattr(self.llm, 'model_name'):
-                model_name = self.llm.model_name
-            if hasattr(self.llm, 'provider'):
-                provider = self.llm.provider
-            
-            # Format model name as "provider: model_name"
-            formatted_model_name = None
-            if provider and model_name:
-                formatted_model_name = f"{provider}: {model_name}"
-            elif model_name:
-                formatted_model_name = model_name
+
+            if not cached:
+                # The prompt is always English (better performance); llm_language only
+                # selects the language(s) of the response
+                start = time.perf_counter()
+                insights = self.llm.generate_insights(
+                    user_name=user_name,
+                    bf_name=bf_name,
+                    toxic_score=prompt_toxic_score,
+                    avg_toxic_score=prompt_avg_toxic_score,
+                    filter_violations=filter_violations,
+                    violated_filter_questions=violated_filter_questions,
+                    language=llm_language,
+                    top_redflag_questions=top_redflag_questions,
+                )
+                # Read on this thread right after the call: a router reports the provider that answered
+                model_name = self._model_name()
+                insights = self._localize(insights, language, llm_language, time.perf_counter() - start)
+                self._store_insights(cache_prompt, language, model_name, insights, user_name, bf_name)
             
-            # Get the prompt text before calling LLM (for logging)
-            from src.services.insight_prompt_builder import InsightPromptBuilder
-            prompt_text = InsightPromptBuilder.build_full_prompt_text(
-                user_name=user_name,
-                bf_name=bf_name,
-                toxic_score=toxic_score,
-                avg_toxic_score=avg_toxic_score,
-                filter_violations=filter_violations,
-                violated_filter_questions=violated_filter_questions,
-                top_redflag_questions=top_redflag_questions,
-                language=language,
+            # Store insight metadata in session state for later saving in goodbye_step
+            # This will be saved to database (CSV or DynamoDB) when user completes the survey
+            st.session_state["insight_metadata"] = self._build_metadata(
+                insights, prompt_text, user_name, bf_name, toxic_score, avg_toxic_score,
+                filter_violations, violated_filter_questions, language, top_redflag_questions,
+                user_id, email, session_data, cached=cached, model_name=model_name,
             )
             
-            # Always use English for LLM (better performance)
-            # LLM will return English response
-            insights = self.llm.generate_insights(
+            return insights
+        except Exception as e:
+            print(f"[ERROR] Error generating insights: {e}")
+            return None
+
+    def submit_survey_insights(
+        self,
+        user_name: str,
+        bf_name: str,
+        toxic_score: float,
+        avg_toxic_score: float,
+        filter_violations: int,
+        violated_filter_questions: Optional[List[Tuple[str, int, str]]] = None,
+        language: str = "EN",
+        top_redflag_questions: Optional[List[Tuple[str, float, str]]] = None,
+        user_id: Optional[str] = None,
+        email: Optional[str] = None,
+        session_data: Optional[Dict[str, Any]] = None,
+        stream: Optional[InsightStream] = None,
+    ) -> Optional[Future]:
+        """
+        Start generating insights in the shared insight executor.
+
+        Takes the same arguments as generate_survey_insights. The work runs outside the
+        Streamlit script thread, so nothing is written to session state; the caller stores
+        the result (and the metadata) once the Future is done.
+
+        With a stream, insights are streamed from the LLM into it as they are generated,
+        when the model answers in the user's language (not in the translate and bilingual
+        modes, whose responses are post-processed as a whole).
+        The stream is finished after the Future's result is set, or right away when there
+        is nothing to stream.
+
+        Returns:
+            Future resolving to (insights, insight_metadata) or (None, None) on failure,
+            or None if LLM features are disabled. Cached insights give a completed Future.
+        """
+        if not self._llm_available():
+            if stream is not None:
+                stream.finish()
+            return None
+
+        result: Future = Future()
+        result.set_running_or_notify_cancel()
+        if stream is not None:
+            result.add_done_callback(lambda _: stream.finish())
+        try:
+            llm_language = self._llm_language(language)
+            prompt_toxic_score, prompt_avg_toxic_score = self._prompt_scores(toxic_score, avg_toxic_score)
+            prompt_text = self._build_prompt_text(
+                user_name, bf_name, prompt_toxic_score, prompt_avg_toxic_score, filter_violations,
+                violated_filter_questions, top_redflag_questions, llm_language,
+            )
+            cache_prompt, insights = self._cached_insights(
+                user_name, bf_name, prompt_toxic_score, prompt_avg_toxic_score, filter_violations,
+                violated_filter_questions, top_redflag_questions, language, llm_language,
+            )
+            if insights is not None:
+                metadata = self._build_metadata(
+                    insights, prompt_text, user_name, bf_name, toxic_score, avg_toxic_score,
+                    filter_violations, violated_filter_questions, language, top_redflag_questions,
+                    user_id, email, session_data, cached=True,
+                )
+                result.set_result((insights, metadata))
+                return result
+
+            llm_args = dict(
                 user_name=user_name,
                 bf_name=bf_name,
-                toxic_score=toxic_score,
-                avg_toxic_score=avg_toxic_score,
+                toxic_score=prompt_toxic_score,
+                avg_toxic_score=prompt_avg_toxic_score,
                 filter_violations=filter_violations,
                 violated_filter_questions=violated_filter_questions,
-                language="EN",  # Always use English for LLM
+                language=llm_language,
                 top_redflag_questions=top_redflag_questions,
             )
-            
-            # Translate English response to Turkish if needed
-            if language == "TR" and insights:
-                print(f"[DEBUG] Translating insights to Turkish. Original (first 100 chars): {insights[:100]}...")
-                translated_insights = self._translate_to_turkish(insights)
-                print(f"[DEBUG] Translated (first 100 chars): {translated_insights[:100]}...")
-                insights = translated_insights
-            
-            # Store insight metadata in session state for later saving in goodbye_step
-            # This will be saved to database (CSV or DynamoDB) when user completes the survey
-            if session_data is None:
-                session_data = {}
-            
-            insight_metadata = {
-                "user_id": user_id or "unknown",
-                "user_name": user_name,
-                "email": email,
-                "bf_name": bf_name,
-                "language": language,
-                "toxic_score": toxic_score,
-                "avg_toxic_score": avg_toxic_score,
-                "filter_violations": filter_violations,
-                "violated_filter_questions": violated_filter_questions,
-                "top_redflag_questions": top_redflag_questions,
-                "generated_insight": insights,
-                "prompt_text": prompt_text,
-                "model_name": formatted_model_name,
-                "session_data": session_data,
-            }
-            st.session_state["insight_metadata"] = insight_metadata
-            
-            return insights
+            start = time.perf_counter()
+            if stream is not None and llm_language == language:
+                llm_future = get_insight_executor().submit(self._stream_insights, stream, llm_args)
+            else:
+                llm_future = get_insight_executor().submit(self._generate_insights, llm_args)
         except Exception as e:
-            print(f"[ERROR] Error generating insights: {e}")
+            print(f"[ERROR] Error starting insights generation: {e}")
+            if stream is not None:
+                stream.finish()
             return None
 
+        def _finish(done: Future):
+            try:
+                response, model_name = done.result()
+                insights = self._localize(response, language, llm_language, time.perf_counter() - start)
+                self._store_insights(cache_prompt, language, model_name, insights, user_name, bf_name)
+                metadata = self._build_metadata(
+                    insights, prompt_text, user_name, bf_name, toxic_score, avg_toxic_score,
+                    filter_violations, violated_filter_questions, language, top_redflag_questions,
+                    user_id, email, session_data, model_name=model_name,
+                )
+                result.set_result((insights, metadata))
+            except Exception as e:
+                print(f"[ERROR] Error generating insights: {e}")
+                result.set_result((None, None))
+
+        # Post-processing (e.g. translation) runs on the thread that completed the LLM request
+        llm_future.add_done_callback(_finish)
+        return result
+
+    def _generate_insights(self, llm_args: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """Generate insights and return (text, model name of the adapter that answered)."""
+        insights = self.llm.generate_insights(**llm_args)
+        # A router reports the provider that answered on the thread that made the call
+        return insights, self._model_name()
+
+    def _stream_insights(self, stream: InsightStream, llm_args: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Stream insights from the LLM into stream and return (full text, model name).
+
+        Raises StreamInterrupted if the stream fails part-way; the partial text stays on
+        screen but the generation counts as failed, so it is neither cached nor saved.
+        """
+        for chunk in self.llm.stream_insights(**llm_args):
+            stream.append(chunk)
+        return stream.text.strip() or None, self._model_name()
+
+    def _llm_available(self) -> bool:
+        """Whether an LLM is enabled and configured (logs why not)."""
+        if not self.enabled:
+            print("[INFO] LLM features are disabled.")
+            return False
+        if not self.llm:
+            print("[WARNING] LLM not configured. Insights generation disabled.")
+            return False
+        return True
+
+    def _prompt_scores(self, toxic_score: float, avg_toxic_score: float) -> Tuple[float, float]:
+        """Scores sent to the LLM (rounded to the cache's precision when caching)."""
+        if not self.cache.enabled:
+            return toxic_score, avg_toxic_score
+        return bucket_score(toxic_score), bucket_score(avg_toxic_score)
+
+    def _cached_insights(
+        self, user_name, bf_name, toxic_score, avg_toxic_score, filter_violations,
+        violated_filter_questions, top_redflag_questions, language, llm_language,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Look up insights for a prompt in the insight cache.
+
+        The key is built with the model that is expected to answer (a router's preferred
+        provider); generated insights are stored under the model that actually answered.
+
+        Returns:
+            Tuple of (normalized prompt for _store_insights, personalized insights or None);
+            the prompt is None if caching is disabled
+        """
+        if not self.cache.enabled:
+            return None, None
+        # Names are left out of the key, so similar profiles share an entry
+        normalized_prompt = self._build_prompt_text(
+            USER_PLACEHOLDER, PARTNER_PLACEHOLDER, toxic_score, avg_toxic_score, filter_violations,
+            violated_filter_questions, top_redflag_questions, llm_language,
+        )
+        cache_key = insight_cache_key(self._model_name(), language, normalized_prompt)
+        template = self.cache.get(cache_key, self.db_handler)
+        if template is None:
+            return normalized_prompt, None
+        print("[INFO] Serving insights from the insight cache")
+        return normalized_prompt, personalize(template, user_name, bf_name)
+
+    def _store_insights(
+        self, cache_prompt: Optional[str], language: str, model_name: Optional[str],
+        insights: Optional[str], user_name, bf_name,
+    ) -> None:
+        """Store generated insights in the insight cache under the model that answered (names replaced by placeholders)."""
+        if not cache_prompt or not insights:
+            return
+        template = to_template(insights, user_name, bf_name)
+        if template is None:
+            print("[INFO] Insights not cached: the names could not be replaced with placeholders")
+            return
+        cache_key = insight_cache_key(model_name, language, cache_prompt)
+        self.cache.put(cache_key, template, model_name, self.db_handler)
+
+    def _model_name(self) -> Optional[str]:
+        """Model name of the LLM adapter formatted as "provider: model_name"."""
+        model_name = getattr(self.llm, "model_name", None)
+        provider = getattr(self.llm, "provider", None)
+        if provider and model_name:
+            return f"{provider}: {model_name}"
+        return model_name
+
+    @staticmethod
+    def _build_prompt_text(
+        user_name, bf_name, toxic_score, avg_toxic_score, filter_violations,
+        violated_filter_questions, top_redflag_questions, language,
+    ) -> str:
+        """Prompt text sent to the LLM (kept for logging)."""
+        from src.services.insight_prompt_builder import InsightPromptBuilder
+        return InsightPromptBuilder.build_full_prompt_text(
+            user_name=user_name,
+            bf_name=bf_name,
+            toxic_score=toxic_score,
+            avg_toxic_score=avg_toxic_score,
+            filter_violations=filter_violations,
+            violated_filter_questions=violated_filter_questions,
+            top_redflag_questions=top_redflag_questions,
+            language=language,
+        )
+
+    def _llm_language(self, language: str) -> str:
+        """Response language to request from the LLM for a user language."""
+        from src.services.insight_prompt_builder import InsightPromptBuilder
+        if language != "TR" or self.language_mode == "translate":
+            return "EN"
+        if self.language_mode == "bilingual":
+            return InsightPromptBuilder.BILINGUAL
+        return language
+
+    def streams(self, language: str) -> bool:
+        """Whether insights for a language can be streamed (the LLM answers in it directly)."""
+        return self._llm_language(language) == language
+
+    def _localize(
+        self, response: Optional[str], language: str, llm_language: str, llm_seconds: float = 0.0
+    ) -> Optional[str]:
+        """
+        Turn the LLM response into insights in the user's language.
+
+        Translation is only used in the translate mode, or as the fallback when a direct
+        answer isn't in Turkish or a bilingual answer has no Turkish text.
+        """
+        from src.services.insight_prompt_builder import InsightPromptBuilder
+        mode = "EN" if language == "EN" else f"{language}:{self.language_mode}"
+        insights = response
+        fallback = False
+        if response and llm_language == InsightPromptBuilder.BILINGUAL:
+            texts = InsightPromptBuilder.parse_bilingual(response) or {}
+            insights = texts.get(language)
+            if not insights:
+                fallback = True
+                insights = texts.get("EN", response)
+        elif response and language == "TR" and llm_language == "TR":
+            if not TURKISH_LETTERS.intersection(response):
+                print("[WARNING] LLM did not answer in Turkish, translating the response")
+                fallback = True
+
+        translate_seconds = 0.0
+        if insights and language == "TR" and (llm_language == "EN" or fallback):
+            start = time.perf_counter()
+            print(f"[DEBUG] Translating insights to Turkish. Original (first 100 chars): {insights[:100]}...")
+            insights = self._translate_to_turkish(insights)
+            print(f"[DEBUG] Translated (first 100 chars): {insights[:100]}...")
+            translate_seconds = time.perf_counter() - start
+
+        if response:
+            record_insight_latency(mode, llm_seconds, translate_seconds, fallback)
+            print(
+                f"[INFO] Insights generated in {llm_seconds + translate_seconds:.2f}s "
+                f"(mode={mode}, llm={llm_seconds:.2f}s, translation={translate_seconds:.2f}s)"
+            )
+        return insights
+
+    def _build_metadata(
+        self, insights, prompt_text, user_name, bf_name, toxic_score, avg_toxic_score,
+        filter_violations, violated_filter_questions, language, top_redflag_questions,
+        user_id, email, session_data, cached: bool = False, model_name: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Insight metadata saved with the session (see insight_metadata in session state)."""
+        model_name = model_name or self._model_name()
+        if cached and model_name:
+            model_name = f"{model_name} (cached)"
+        return {
+            "user_id": user_id or "unknown",
+            "user_name": user_name,
+            "email": email,
+            "bf_name": bf_name,
+            "language": language,
+            "toxic_score": toxic_score,
+            "avg_toxic_score": avg_toxic_score,
+            "filter_violations": filter_violations,
+            "violated_filter_questions": violated_filter_questions,
+            "top_redflag_questions": top_redflag_questions,
+            "generated_insight": insights,
+            "prompt_text": prompt_text,
+            "model_name": model_name,
+            "session_data": session_data if session_data is not None else {},
+        }
+
     def _translate_to_turkish(self, english_text: str) -> str:
         """
         Translate English text to Turkish.
@@ -0,0 +1,244 @@
+"""Token-bucket rate limiter for LLM API calls.
+
+Groq and Hugging Face limit requests and tokens per minute. Every provider gets two token
+buckets (requests and tokens) refilled continuously from ``LLM_RPM_<PROVIDER>`` and
+``LLM_TPM_<PROVIDER>`` (0 means unlimited). Callers queue in arrival order and wait at
+most ``LLM_RATE_MAX_WAIT`` seconds for budget; callers that can't be served in time, or
+that find ``LLM_RATE_MAX_QUEUE`` callers already waiting, get RateLimitExceeded right away
+instead of hitting the provider and failing together.
+
+With ``LLM_RATE_LIMIT_FILE`` set, the bucket levels live in that JSON file under a file
+lock, so all app processes on the host share one budget.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Optional
+from src.utils.file_lock import FileLock
+
+# (requests per minute, tokens per minute) when no environment override is set
+DEFAULT_LIMITS = {
+    "groq": (30, 6000),
+    "huggingface": (60, 0),
+}
+# Seconds a caller may wait for budget (env: LLM_RATE_MAX_WAIT)
+DEFAULT_MAX_WAIT = 10
+# Callers allowed to wait per provider (env: LLM_RATE_MAX_QUEUE)
+DEFAULT_MAX_QUEUE = 32
+
+# Rough characters per token, for estimating the size of a request
+CHARS_PER_TOKEN = 4
+
+
+class RateLimitExceeded(Exception):
+    """Raised when an LLM call can't get request/token budget within the allowed wait."""
+
+
+@dataclass(slots=True)
+class ProviderLimits:
+    """Per-minute budgets of one provider (0 means unlimited)."""
+
+    requests_per_minute: float
+    tokens_per_minute: float
+
+    @classmethod
+    def from_env(cls, provider: str) -> "ProviderLimits":
+        requests, tokens = DEFAULT_LIMITS.get(provider, (0, 0))
+        name = provider.upper()
+        return cls(
+            float(os.getenv(f"LLM_RPM_{name}", requests)),
+            float(os.getenv(f"LLM_TPM_{name}", tokens)),
+        )
+
+
+def estimate_tokens(prompt: str, max_output_tokens: int) -> int:
+    """Tokens a request may use: its prompt plus the most it can generate."""
+    return len(prompt) // CHARS_PER_TOKEN + max_output_tokens
+
+
+def _take(buckets: dict, limits: ProviderLimits, tokens: int, now: float) -> float:
+    """
+    Take one request and tokens from the buckets if both have enough budget.
+
+    Args:
+        buckets: {"requests": {"level", "updated"}, "tokens": {...}}, updated in place
+        limits: Budgets of the provider
+        tokens: Tokens the request needs
+        now: Current time.time()
+
+    Returns:
+        0 if the budget was taken, else seconds until it is expected to be available
+    """
+    wait = 0.0
+    needs = {"requests": (1, limits.requests_per_minute), "tokens": (tokens, limits.tokens_per_minute)}
+    for name, (amount, per_minute) in needs.items():
+        if per_minute <= 0 or amount <= 0:
+            continue
+        bucket = buckets.setdefault(name, {"level": per_minute, "updated": now})
+        bucket["level"] = min(per_minute, bucket["level"] + (now - bucket["updated"]) * per_minute / 60.0)
+        bucket["updated"] = now
+        # A request larger than a whole minute's budget waits for a full bucket
+        deficit = min(amount, per_minute) - bucket["level"]
+        if deficit > 0:
+            wait = max(wait, deficit * 60.0 / per_minute)
+    if wait > 0:
+        return wait
+    for name, (amount, per_minute) in needs.items():
+        if per_minute > 0 and amount > 0:
+            bucket = buckets[name]
+            bucket["level"] -= min(amount, per_minute)
+    return 0.0
+
+
+class RateLimiter:
+    """Process-wide limiter queueing LLM calls per provider."""
+
+    def __init__(self, max_wait: float = None, max_queue: int = None, state_file: str = None):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            max_wait: Seconds a caller may wait for budget (env: LLM_RATE_MAX_WAIT)
+            max_queue: Callers allowed to wait per provider (env: LLM_RATE_MAX_QUEUE)
+            state_file: JSON file shared by processes (env: LLM_RATE_LIMIT_FILE, default
+                in-process buckets)
+        """
+        if max_wait is None:
+            max_wait = float(os.getenv("LLM_RATE_MAX_WAIT", DEFAULT_MAX_WAIT))
+        if max_queue is None:
+            max_queue = int(os.getenv("LLM_RATE_MAX_QUEUE", DEFAULT_MAX_QUEUE))
+        if state_file is None:
+            state_file = os.getenv("LLM_RATE_LIMIT_FILE") or None
+        self.max_wait = max_wait
+        self.max_queue = max(1, max_queue)
+        self.state_file = state_file
+
+        self._condition = threading.Condition()
+        self._limits: Dict[str, ProviderLimits] = {}
+        self._buckets: Dict[str, dict] = {}
+        self._queues: Dict[str, deque] = {}
+        self._metrics: Dict[str, dict] = {}
+
+    def limits(self, provider: str) -> ProviderLimits:
+        """Budgets of a provider (read from the environment on first use)."""
+        if provider not in self._limits:
+            self._limits[provider] = ProviderLimits.from_env(provider)
+        return self._limits[provider]
+
+    def acquire(self, provider: str, tokens: int = 0, max_wait: float = None) -> float:
+        """
+        Wait for budget for one request of a provider.
+
+        Args:
+            provider: Provider name (e.g. "groq")
+            tokens: Estimated tokens of the request (see estimate_tokens)
+            max_wait: Seconds to wait at most (default: the limiter's max_wait)
+
+        Returns:
+            Seconds the caller waited
+
+        Raises:
+            RateLimitExceeded: If the queue is full or the budget isn't available in time
+        """
+        if max_wait is None:
+            max_wait = self.max_wait
+        limits = self.limits(provider)
+        if limits.requests_per_minute <= 0 and limits.tokens_per_minute <= 0:
+            return 0.0
+
+        start = time.monotonic()
+        deadline = start + max_wait
+        with self._condition:
+            queue = self._queues.setdefault(provider, deque())
+            metrics = self._provider_metrics(provider)
+            if len(queue) >= self.max_queue:
+                metrics["rejected"] += 1
+                raise RateLimitExceeded(f"{provider}: {len(queue)} LLM calls already waiting")
+
+            ticket = object()
+            queue.append(ticket)
+            metrics["max_queue_depth"] = max(metrics["max_queue_depth"], len(queue))
+            try:
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if queue[0] is ticket:
+                        wait = self._take(provider, limits, tokens)
+                        if wait == 0:
+                            waited = time.monotonic() - start
+                            metrics["granted"] += 1
+                            metrics["total_wait"] += waited
+                            metrics["max_wait"] = max(metrics["max_wait"], waited)
+                            if waited > 0.01:
+                                metrics["waited"] += 1
+                            return waited
+                        if wait > remaining:
+                            metrics["rejected"] += 1
+                            raise RateLimitExceeded(
+                                f"{provider}: rate limit budget not available within {max_wait:.0f}s"
+                            )
+                        self._condition.wait(wait)
+                    else:
+                        if remaining <= 0:
+                            metrics["rejected"] += 1
+                            raise RateLimitExceeded(f"{provider}: timed out waiting in the LLM call queue")
+                        self._condition.wait(remaining)
+            finally:
+                queue.remove(ticket)
+                self._condition.notify_all()
+
+    def _take(self, provider: str, limits: ProviderLimits, tokens: int) -> float:
+        if self.state_file is None:
+            return _take(self._buckets.setdefault(provider, {}), limits, tokens, time.time())
+
+        with FileLock(self.state_file):
+            try:
+                with open(self.state_file, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                state = {}
+            wait = _take(state.setdefault(provider, {}), limits, tokens, time.time())
+            if wait == 0:
+                tmp_path = f"{self.state_file}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(state, f)
+                os.replace(tmp_path, self.state_file)
+            return wait
+
+    def _provider_metrics(self, provider: str) -> dict:
+        return self._metrics.setdefault(provider, {
+            "granted": 0,
+            "rejected": 0,
+            "waited": 0,
+            "total_wait": 0.0,
+            "max_wait": 0.0,
+            "max_queue_depth": 0,
+        })
+
+    def stats(self, provider: Optional[str] = None) -> dict:
+        """Return limiter metrics per provider (queue depth, waits and rejections)."""
+        with self._condition:
+            providers = [provider] if provider else list(self._metrics)
+            result = {}
+            for name in providers:
+                metrics = dict(self._provider_metrics(name))
+                metrics["queue_depth"] = len(self._queues.get(name, ()))
+                metrics["avg_wait"] = (metrics["total_wait"] / metrics["granted"]) if metrics["granted"] else 0.0
+                result[name] = metrics
+            return result
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide LLM rate limiter, creating it on first use."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter()
+    return _limiter
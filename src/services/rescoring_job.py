@@ -0,0 +1,254 @@
+"""Batch job that re-scores stored sessions against the current question catalog.
+
+When question weights change (e.g. ``notebooks/cold_start/09_invert_redflag_questions.ipynb``)
+the toxic scores stored in session_responses and the Summary_Sessions counters become
+stale. This job streams session_responses in chunks, recomputes toxic score and filter
+violations with the ScoringEngine (the same rules as the redflag and filter steps),
+writes back only the rows whose values changed, and rebuilds Summary_Sessions from the
+new scores (together with the Score_Histogram counts and bin extremes). Re-scored sessions shown on the
+results graph get their new score in Recent_Scores. Category scores can be exported to a
+CSV file.
+
+Usage:
+    python -m src.services.rescoring_job --backend sqlite
+    python -m src.services.rescoring_job --backend dynamodb --dry-run
+    python -m src.services.rescoring_job --category-scores reports/category_scores.csv
+"""
+import argparse
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+import pandas as pd
+from src.adapters.database.database_handler import DatabaseHandler, LOCAL_BACKENDS
+from src.adapters.database.question_repository import QuestionRepository
+from src.services.scoring_engine import ScoringEngine, get_scoring_engine
+from src.utils.constants import CSV_SEPARATOR
+from src.utils.recent_scores import load_recent_session_ids, update_recent_scores
+from src.utils.score_histogram import add_counts, histogram_counts, histogram_extremes, rebuild_score_histogram
+from src.utils.summary_aggregates import rebuild_summary
+from src.utils.utils import safe_decimal
+
+SESSION_TABLE = "session_responses"
+DEFAULT_CHUNK_SIZE = 50000
+# Stored scores closer than this to the recomputed score are left untouched
+SCORE_TOLERANCE = 1e-9
+
+
+@dataclass(slots=True)
+class RescoringStats:
+    """Counters reported by the re-scoring job."""
+    rows: int = 0
+    changed: int = 0
+    written: int = 0
+    sum_toxic_score: float = 0.0
+    sum_filter_violations: int = 0
+    min_toxic_score: Optional[float] = None
+    max_toxic_score: Optional[float] = None
+    toxic_counts: Optional[np.ndarray] = None
+    filter_counts: Optional[np.ndarray] = None
+    bin_lows: Optional[np.ndarray] = None
+    bin_highs: Optional[np.ndarray] = None
+    seconds: float = 0.0
+
+    def add_scores(self, toxic_scores: np.ndarray, violations: np.ndarray) -> None:
+        """Fold the recomputed scores of one chunk into the totals."""
+        if len(toxic_scores) == 0:
+            return
+        self.sum_toxic_score += float(toxic_scores.sum())
+        self.sum_filter_violations += int(violations.sum())
+        chunk_min, chunk_max = float(toxic_scores.min()), float(toxic_scores.max())
+        if self.min_toxic_score is None:
+            self.min_toxic_score, self.max_toxic_score = chunk_min, chunk_max
+        else:
+            self.min_toxic_score = min(self.min_toxic_score, chunk_min)
+            self.max_toxic_score = max(self.max_toxic_score, chunk_max)
+
+        toxic_counts, filter_counts = histogram_counts(toxic_scores, violations)
+        if self.toxic_counts is None:
+            self.toxic_counts, self.filter_counts = toxic_counts, filter_counts
+        else:
+            self.toxic_counts = add_counts(self.toxic_counts, toxic_counts)
+            self.filter_counts = add_counts(self.filter_counts, filter_counts)
+
+        lows, highs = histogram_extremes(toxic_scores)
+        if self.bin_lows is None:
+            self.bin_lows, self.bin_highs = lows, highs
+        else:
+            self.bin_lows = np.minimum(self.bin_lows, lows)
+            self.bin_highs = np.maximum(self.bin_highs, highs)
+
+
+def _stored_numbers(chunk: pd.DataFrame, column: str) -> np.ndarray:
+    """Column as a float array (NaN where missing or not numeric)."""
+    if column not in chunk.columns:
+        return np.full(len(chunk), np.nan)
+    return pd.to_numeric(chunk[column], errors="coerce").to_numpy(dtype=np.float64)
+
+
+def rescore_chunk(engine: ScoringEngine, chunk: pd.DataFrame):
+    """
+    Recompute the scores of one chunk of session_responses.
+
+    Returns:
+        (toxic_scores, filter_violations, changed) arrays; changed marks rows whose stored
+        toxic_score or filter_violations differ from the recomputed values
+    """
+    toxic_scores = engine.toxic_scores(engine.answers_matrix(chunk))
+    violations = engine.filter_violations_batch(engine.filter_matrix(chunk))
+
+    stored_toxic = _stored_numbers(chunk, "toxic_score")
+    stored_violations = _stored_numbers(chunk, "filter_violations")
+    changed = (
+        np.isnan(stored_toxic)
+        | (np.abs(stored_toxic - toxic_scores) > SCORE_TOLERANCE)
+        | np.isnan(stored_violations)
+        | (stored_violations != violations)
+    )
+    return toxic_scores, violations, changed
+
+
+def _write_category_scores(
+    engine: ScoringEngine, chunk: pd.DataFrame, names_map: dict, path: str, first: bool
+) -> None:
+    """Write (first chunk) or append the per-session category scores of a chunk to a CSV file."""
+    answers = engine.answers_matrix(chunk)
+    labels, averages, _ = engine.category_scores_batch(answers, names_map or None)
+    frame = pd.DataFrame(averages, columns=labels)
+    frame.insert(0, "id", chunk["id"].to_numpy())
+    frame.to_csv(path, sep=CSV_SEPARATOR, index=False, mode="w" if first else "a", header=first)
+
+
+def rescore_sessions(
+    db_handler: DatabaseHandler,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dry_run: bool = False,
+    category_scores_path: Optional[str] = None,
+    language: str = "EN",
+) -> RescoringStats:
+    """
+    Re-score all stored sessions and rebuild Summary_Sessions and Score_Histogram.
+
+    Args:
+        db_handler: DatabaseHandler instance
+        chunk_size: Number of sessions processed (and written back) per batch
+        dry_run: If True, only count the sessions that would change
+        category_scores_path: Optional CSV file receiving per-session category scores
+        language: Language of the category names in the category scores file
+
+    Returns:
+        RescoringStats with row counts and the recomputed totals
+    """
+    started = time.perf_counter()
+    repository = QuestionRepository(db_handler)
+    engine = get_scoring_engine(repository.get_redflag_questions(), repository.get_filter_questions())
+    names_map = repository.get_category_names(language) if category_scores_path else {}
+
+    stats = RescoringStats()
+    recent_ids = load_recent_session_ids(db_handler)
+    recent_scores = {}
+    for chunk in db_handler.iter_table(SESSION_TABLE, chunk_size):
+        if chunk.empty:
+            continue
+        toxic_scores, violations, changed = rescore_chunk(engine, chunk)
+        stats.rows += len(chunk)
+        stats.changed += int(changed.sum())
+        stats.add_scores(toxic_scores, violations)
+
+        if category_scores_path:
+            first = stats.rows == len(chunk)
+            _write_category_scores(engine, chunk, names_map, category_scores_path, first)
+
+        if dry_run or not changed.any():
+            continue
+        ids = chunk["id"].to_numpy()[changed]
+        updates = [
+            ({"id": int(session_id)}, {
+                "toxic_score": safe_decimal(float(score)),
+                "filter_violations": safe_decimal(int(violation)),
+            })
+            for session_id, score, violation in zip(ids, toxic_scores[changed], violations[changed])
+        ]
+        stats.written += db_handler.update_records(SESSION_TABLE, updates)
+        recent_scores.update(
+            (int(session_id), float(score))
+            for session_id, score in zip(ids, toxic_scores[changed])
+            if int(session_id) in recent_ids
+        )
+        print(f"[INFO] Re-scored {stats.rows} sessions ({stats.written} updated)")
+
+    if not dry_run:
+        update_recent_scores(db_handler, recent_scores)
+        rebuild_summary(
+            db_handler,
+            stats.sum_toxic_score,
+            stats.rows,
+            stats.sum_filter_violations,
+            stats.min_toxic_score,
+            stats.max_toxic_score,
+        )
+        empty_toxic, empty_filter = histogram_counts([], [])
+        empty_lows, empty_highs = histogram_extremes([])
+        rebuild_score_histogram(
+            db_handler,
+            stats.toxic_counts if stats.toxic_counts is not None else empty_toxic,
+            stats.filter_counts if stats.filter_counts is not None else empty_filter,
+            stats.bin_lows if stats.bin_lows is not None else empty_lows,
+            stats.bin_highs if stats.bin_highs is not None else empty_highs,
+        )
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def main(argv=None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Re-score session_responses and rebuild Summary_Sessions."
+    )
+    parser.add_argument(
+        "--backend",
+        choices=sorted(LOCAL_BACKENDS) + ["dynamodb"],
+        default=os.getenv("LOCAL_DB_BACKEND", "csv"),
+        help="Storage backend (default: LOCAL_DB_BACKEND or csv)",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Sessions per batch"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only report how many sessions would change"
+    )
+    parser.add_argument(
+        "--category-scores", metavar="PATH", help="Write per-session category scores to a CSV file"
+    )
+    parser.add_argument(
+        "--language", choices=["EN", "TR"], default="EN", help="Language of category names"
+    )
+    args = parser.parse_args(argv)
+
+    if args.backend == "dynamodb":
+        db_handler = DatabaseHandler(db_read_allowed=True, db_write_allowed=True)
+    else:
+        db_handler = DatabaseHandler(local_backend=args.backend)
+
+    try:
+        stats = rescore_sessions(
+            db_handler,
+            chunk_size=args.chunk_size,
+            dry_run=args.dry_run,
+            category_scores_path=args.category_scores,
+            language=args.language,
+        )
+    finally:
+        db_handler.close()
+
+    action = "would change" if args.dry_run else "updated"
+    print(
+        f"[OK] Re-scored {stats.rows} sessions in {stats.seconds:.1f}s: "
+        f"{stats.changed} {action}, summary count_guys={stats.rows}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,241 @@
+"""Vectorized scoring of redflag and filter responses."""
+import threading
+from decimal import Decimal
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+import numpy as np
+from src.domain.value_objects import FilterQuestion, RedFlagQuestion
+
+# Score given to a "Yes" answer of a YES/NO redflag question (a "No" scores 0)
+YES_NO_SCORE = 7
+# Maximum score of a Range(0-10) redflag question
+RANGE_MAX_SCORE = 10
+
+
+def _to_float(value) -> float:
+    """Convert a stored answer to float, using NaN for missing/not applicable answers."""
+    if value is None:
+        return np.nan
+    if isinstance(value, Decimal):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class ScoringEngine:
+    """Scores sessions against a fixed question catalog with NumPy.
+
+    Weights, maximum scores, category membership and filter limits are turned into arrays
+    once per catalog. A session's answers become a vector in catalog order (NaN = not
+    applicable); many sessions become a matrix with one row per session, so the same
+    operations score a single session or a whole table.
+
+    Scoring rules (same as the redflag step):
+        toxic_score = sum(w * answer) / sum(|w| * max_score) over applicable questions,
+                      0 if no question is applicable
+        category score = weighted average of applicable answers with weight ``w or 1``
+                         (plain average if the weights sum to <= 0)
+        filter violation = answer >= upper_limit
+    """
+
+    def __init__(
+        self,
+        redflag_questions: Sequence[RedFlagQuestion] = (),
+        filter_questions: Sequence[FilterQuestion] = (),
+    ):
+        self.redflag_questions = list(redflag_questions)
+        self.question_keys = [f"Q{q.question_id}" for q in self.redflag_questions]
+        self.question_index = {key: i for i, key in enumerate(self.question_keys)}
+
+        weights = np.array([float(q.weight) for q in self.redflag_questions], dtype=np.float64)
+        max_scores = np.array(
+            [YES_NO_SCORE if q.scoring == "YES/NO" else RANGE_MAX_SCORE for q in self.redflag_questions],
+            dtype=np.float64,
+        )
+        self.weights = weights
+        # w * max * (1 if w > 0 else -1)
+        self.abs_max_weights = weights * max_scores * np.where(weights > 0, 1.0, -1.0)
+        self.category_weights = np.where(weights != 0, weights, 1.0)
+
+        self.filter_questions = list(filter_questions)
+        self.filter_keys = [f"F{q.filter_id}" for q in self.filter_questions]
+        self.filter_index = {key: i for i, key in enumerate(self.filter_keys)}
+        self.upper_limits = np.array([q.upper_limit for q in self.filter_questions], dtype=np.float64)
+
+        self._category_cache = {}
+
+    # ------------------------------------------------------------------ inputs
+
+    def answers_vector(self, responses: Mapping[str, object]) -> np.ndarray:
+        """Redflag answers {"Q1": 5, ...} as a vector in catalog order (NaN if missing)."""
+        vector = np.full(len(self.question_keys), np.nan)
+        for key, value in responses.items():
+            i = self.question_index.get(key)
+            if i is not None:
+                vector[i] = _to_float(value)
+        return vector
+
+    def answers_matrix(self, sessions) -> np.ndarray:
+        """
+        Redflag answers of many sessions as a (sessions x questions) matrix.
+
+        Args:
+            sessions: DataFrame with Q<id> columns, or an iterable of response dicts
+        """
+        return self._matrix(sessions, self.question_keys, self.answers_vector)
+
+    def filter_vector(self, responses: Mapping[str, object]) -> np.ndarray:
+        """Filter answers {"F1": 1, ...} as a vector in catalog order (NaN if missing)."""
+        vector = np.full(len(self.filter_keys), np.nan)
+        for key, value in responses.items():
+            i = self.filter_index.get(key)
+            if i is not None:
+                vector[i] = _to_float(value)
+        return vector
+
+    def filter_matrix(self, sessions) -> np.ndarray:
+        """Filter answers of many sessions as a (sessions x filters) matrix."""
+        return self._matrix(sessions, self.filter_keys, self.filter_vector)
+
+    @staticmethod
+    def _matrix(sessions, keys: List[str], to_vector) -> np.ndarray:
+        columns = getattr(sessions, "columns", None)
+        if columns is not None:
+            # DataFrame: take the known columns directly (missing columns become NaN)
+            frame = sessions.reindex(columns=keys)
+            try:
+                return frame.to_numpy(dtype=np.float64, na_value=np.nan)
+            except (TypeError, ValueError):
+                # Mixed object columns (e.g. strings from CSV); convert cell by cell
+                return frame.apply(lambda col: col.map(_to_float)).to_numpy(dtype=np.float64)
+        rows = [to_vector(responses) for responses in sessions]
+        if not rows:
+            return np.empty((0, len(keys)))
+        return np.vstack(rows)
+
+    # ------------------------------------------------------------------ toxic score
+
+    def toxic_score(self, responses) -> float:
+        """Toxic score of one session (responses dict or answers vector)."""
+        vector = responses if isinstance(responses, np.ndarray) else self.answers_vector(responses)
+        return float(self.toxic_scores(vector[np.newaxis, :])[0])
+
+    def toxic_scores(self, answers: np.ndarray) -> np.ndarray:
+        """Toxic scores of a (sessions x questions) answers matrix."""
+        applicable = ~np.isnan(answers)
+        total = np.where(applicable, answers, 0.0) @ self.weights
+        abs_total = applicable.astype(np.float64) @ self.abs_max_weights
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(abs_total != 0, total / abs_total, 0.0)
+        return scores
+
+    # ------------------------------------------------------------------ categories
+
+    def category_scores(
+        self, responses, category_names_map: Optional[Dict[int, str]] = None
+    ) -> Dict[str, Tuple[float, int]]:
+        """
+        Weighted average answer per category for one session.
+
+        Returns:
+            Dictionary mapping category_name to (average_score, question_count);
+            categories without applicable answers are excluded.
+        """
+        vector = responses if isinstance(responses, np.ndarray) else self.answers_vector(responses)
+        labels, averages, counts = self.category_scores_batch(vector[np.newaxis, :], category_names_map)
+        return {
+            label: (float(averages[0, j]), int(counts[0, j]))
+            for j, label in enumerate(labels)
+            if counts[0, j] > 0
+        }
+
+    def category_scores_batch(
+        self, answers: np.ndarray, category_names_map: Optional[Dict[int, str]] = None
+    ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        Weighted average answer per category for a (sessions x questions) matrix.
+
+        Returns:
+            (category labels, averages matrix, counts matrix); averages are NaN where a
+            session has no applicable answer in a category.
+        """
+        labels, membership = self._categories(category_names_map)
+        applicable = ~np.isnan(answers)
+        values = np.where(applicable, answers, 0.0)
+        applicable_f = applicable.astype(np.float64)
+
+        weighted_sum = (values * self.category_weights) @ membership
+        weight_sum = (applicable_f * self.category_weights) @ membership
+        plain_sum = values @ membership
+        counts = applicable_f @ membership
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            averages = np.where(weight_sum > 0, weighted_sum / weight_sum, plain_sum / counts)
+        averages = np.where(counts > 0, averages, np.nan)
+        return labels, averages, counts.astype(np.int64)
+
+    def _categories(self, category_names_map: Optional[Dict[int, str]]) -> Tuple[List[str], np.ndarray]:
+        """Category labels and the (questions x categories) membership matrix for a names map."""
+        cache_key = tuple(sorted(category_names_map.items())) if category_names_map else None
+        cached = self._category_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        labels: List[str] = []
+        label_index: Dict[str, int] = {}
+        question_labels = []
+        for q in self.redflag_questions:
+            if category_names_map and q.category_id:
+                label = category_names_map.get(q.category_id)
+            elif q.category_name:
+                label = q.category_name
+            else:
+                label = None
+            if label and label not in label_index:
+                label_index[label] = len(labels)
+                labels.append(label)
+            question_labels.append(label)
+
+        membership = np.zeros((len(self.redflag_questions), len(labels)))
+        for i, label in enumerate(question_labels):
+            if label:
+                membership[i, label_index[label]] = 1.0
+
+        self._category_cache[cache_key] = (labels, membership)
+        return labels, membership
+
+    # ------------------------------------------------------------------ filters
+
+    def filter_violations(self, responses) -> int:
+        """Number of violated filters of one session (responses dict or answers vector)."""
+        vector = responses if isinstance(responses, np.ndarray) else self.filter_vector(responses)
+        return int(self.filter_violations_batch(vector[np.newaxis, :])[0])
+
+    def filter_violations_batch(self, answers: np.ndarray) -> np.ndarray:
+        """Number of violated filters per row of a (sessions x filters) matrix."""
+        with np.errstate(invalid="ignore"):
+            return (answers >= self.upper_limits).sum(axis=1)
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_scoring_engine(
+    redflag_questions: Iterable[RedFlagQuestion] = (),
+    filter_questions: Iterable[FilterQuestion] = (),
+) -> ScoringEngine:
+    """Return a scoring engine for the given catalog, reusing one built for the same questions."""
+    redflag_questions = tuple(sorted(redflag_questions, key=lambda q: q.question_id))
+    filter_questions = tuple(sorted(filter_questions, key=lambda q: q.filter_id))
+    key = (redflag_questions, filter_questions)
+    engine = _engines.get(key)
+    if engine is None:
+        engine = ScoringEngine(redflag_questions, filter_questions)
+        with _engines_lock:
+            if len(_engines) >= 16:
+                # Catalogs rarely change; drop stale engines instead of growing forever
+                _engines.clear()
+            _engines[key] = engine
+    return engine
@@ -0,0 +1,396 @@
+"""Write-behind queue that persists survey records off the Streamlit request path.
+
+Steps build their records and ``submit`` them; a background thread writes them with
+``DatabaseHandler.write_batch`` and then applies the session's aggregate updates
+(Summary_Sessions, recent scores, score histogram). The page doesn't wait on storage.
+
+Durability: every job is appended to a per-process journal (``<spill_dir>/<pid>.jsonl``,
+flushed and fsynced) before it is queued and marked done once written. Journals left by
+processes that are no longer running are claimed and replayed on startup, so a crash
+loses no submitted record. Failed jobs are retried with exponential backoff; jobs that
+still fail stay in the journal for the next start. The write and every aggregate step
+are journaled as they complete, so neither a retry nor a replay after a crash repeats
+them; only a step interrupted between its update and its journal entry can be applied
+twice.
+
+The queue is bounded: when it is full, ``submit`` writes the job in the caller's thread.
+At interpreter exit the queue is drained for up to WRITE_BEHIND_DRAIN_TIMEOUT seconds.
+
+Environment:
+    WRITE_BEHIND_ENABLED        false writes synchronously in submit (default true)
+    WRITE_BEHIND_QUEUE_SIZE     max queued jobs (default 1000)
+    WRITE_BEHIND_MAX_ATTEMPTS   attempts per job before it is left to the next start (default 5)
+    WRITE_BEHIND_DRAIN_TIMEOUT  seconds to wait for the queue at exit (default 10)
+    WRITE_BEHIND_SPILL_DIR      journal directory (default data/write_behind)
+"""
+import atexit
+import json
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from decimal import Decimal
+from typing import Callable, List, Optional, Tuple
+from src.adapters.database.database_handler import DatabaseHandler
+from src.utils.file_lock import FileLock
+from src.utils.recent_scores import record_recent_score
+from src.utils.score_histogram import record_score_histogram
+from src.utils.summary_aggregates import record_session_aggregate
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_SPILL_DIR = os.path.join(BASE_DIR, "data", "write_behind")
+DEFAULT_QUEUE_SIZE = 1000
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_DRAIN_TIMEOUT = 10
+# Backoff between attempts: BASE * 2^(attempt - 1), capped, with jitter
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30
+
+# Progress entry of a job whose records have been written
+RECORDS_STEP = "records"
+
+# Aggregate updates applied after a session's records are written, in this order
+AGGREGATE_STEPS = {
+    "summary": lambda db, s: record_session_aggregate(db, s["toxic_score"], s["filter_violations"]),
+    "recent_scores": lambda db, s: record_recent_score(db, s["session_id"], s["toxic_score"]),
+    "score_histogram": lambda db, s: record_score_histogram(db, s["toxic_score"], s["filter_violations"]),
+}
+
+
+@dataclass(slots=True)
+class WriteJob:
+    """Records to write as one batch, plus the aggregate updates of a completed session."""
+    records: List[Tuple[str, dict]]
+    db_write_allowed: bool = False
+    session_scores: Optional[dict] = None  # {"session_id", "toxic_score", "filter_violations"}
+    pending_steps: List[str] = field(default_factory=list)
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    attempts: int = 0
+
+    def __post_init__(self):
+        if self.session_scores is not None and not self.pending_steps:
+            self.pending_steps = list(AGGREGATE_STEPS)
+
+
+def _encode(value):
+    if isinstance(value, Decimal):
+        # Keep Decimals exact (DynamoDB needs them back as Decimal)
+        return {"__decimal__": str(value)}
+    if hasattr(value, "item"):
+        # numpy scalars
+        return value.item()
+    return str(value)
+
+
+def _decode(obj: dict):
+    if set(obj) == {"__decimal__"}:
+        return Decimal(obj["__decimal__"])
+    return obj
+
+
+def _job_from_dict(data: dict) -> WriteJob:
+    data["records"] = [(table_name, record) for table_name, record in data.get("records", [])]
+    return WriteJob(**data)
+
+
+def complete_step(job: WriteJob, step: str) -> None:
+    """Remove a completed part (RECORDS_STEP or an aggregate step) from a job."""
+    if step == RECORDS_STEP:
+        job.records = []
+    elif step in job.pending_steps:
+        job.pending_steps.remove(step)
+
+
+def run_job(job: WriteJob, on_progress: Optional[Callable[[WriteJob, str], None]] = None) -> None:
+    """
+    Write a job's records, then apply its remaining aggregate steps.
+
+    Completed parts are removed from the job, so calling it again after a failure only
+    retries what is left. Raises on failure.
+
+    Args:
+        job: Job to run
+        on_progress: Called with the job and RECORDS_STEP or the aggregate step after
+            each part completes (used to journal the progress)
+    """
+    db_handler = DatabaseHandler(db_write_allowed=job.db_write_allowed)
+    try:
+        if job.records:
+            if not db_handler.write_batch(job.records):
+                raise RuntimeError(f"could not write {len(job.records)} record(s)")
+            complete_step(job, RECORDS_STEP)
+            if on_progress is not None:
+                on_progress(job, RECORDS_STEP)
+        while job.pending_steps:
+            step = job.pending_steps[0]
+            if not AGGREGATE_STEPS[step](db_handler, job.session_scores):
+                raise RuntimeError(f"aggregate step {step} failed")
+            complete_step(job, step)
+            if on_progress is not None:
+                on_progress(job, step)
+    finally:
+        db_handler.close()
+
+
+class WriteBehindQueue:
+    """Bounded queue drained by one background writer thread."""
+
+    def __init__(
+        self,
+        spill_dir: str = None,
+        max_size: int = None,
+        max_attempts: int = None,
+        drain_timeout: float = None,
+    ):
+        """
+        Initialize the queue (the writer thread starts on the first submit).
+
+        Args:
+            spill_dir: Directory of the job journals (env: WRITE_BEHIND_SPILL_DIR)
+            max_size: Max queued jobs (env: WRITE_BEHIND_QUEUE_SIZE)
+            max_attempts: Attempts per job (env: WRITE_BEHIND_MAX_ATTEMPTS)
+            drain_timeout: Seconds to wait for queued jobs at exit (env: WRITE_BEHIND_DRAIN_TIMEOUT)
+        """
+        if spill_dir is None:
+            spill_dir = os.getenv("WRITE_BEHIND_SPILL_DIR", DEFAULT_SPILL_DIR)
+        if max_size is None:
+            max_size = int(os.getenv("WRITE_BEHIND_QUEUE_SIZE", DEFAULT_QUEUE_SIZE))
+        if max_attempts is None:
+            max_attempts = int(os.getenv("WRITE_BEHIND_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS))
+        if drain_timeout is None:
+            drain_timeout = float(os.getenv("WRITE_BEHIND_DRAIN_TIMEOUT", DEFAULT_DRAIN_TIMEOUT))
+
+        self.spill_dir = spill_dir
+        self.journal_path = os.path.join(spill_dir, f"{os.getpid()}.jsonl")
+        self.max_attempts = max(1, max_attempts)
+        self.drain_timeout = drain_timeout
+
+        self._queue = queue.Queue(maxsize=max(1, max_size))
+        self._journal_lock = threading.Lock()
+        self._open_jobs = {}  # job_id -> WriteJob not yet written (incl. abandoned ones)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        os.makedirs(spill_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------ public API
+
+    def submit(self, job: WriteJob) -> None:
+        """Journal a job and queue it for the writer thread (written inline if the queue is full)."""
+        if self._closed:
+            run_job(job)
+            return
+        self._start()
+        self._journal(job)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            print("[WARNING] Write-behind queue is full, writing in the caller's thread")
+            self._process(job)
+
+    def drain(self, timeout: float = None) -> bool:
+        """Wait until every queued job has been processed; returns False on timeout."""
+        deadline = time.monotonic() + (self.drain_timeout if timeout is None else timeout)
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def close(self, timeout: float = None) -> None:
+        """Stop accepting jobs, drain the queue and stop the writer thread."""
+        if self._closed:
+            return
+        drained = self.drain(timeout)
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=1)
+        if not drained:
+            print(
+                f"[WARNING] Write-behind queue not drained; {len(self._open_jobs)} job(s) "
+                f"kept in {self.journal_path} for the next start"
+            )
+
+    @property
+    def pending(self) -> int:
+        """Number of submitted jobs that have not been written yet."""
+        return len(self._open_jobs)
+
+    # ------------------------------------------------------------------ writer thread
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            recovered = self._recover()
+            self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+            self._thread.start()
+            for job in recovered:
+                self._queue.put(job)
+            if recovered:
+                print(f"[INFO] Replaying {len(recovered)} unwritten job(s) from earlier runs")
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._process(job)
+            finally:
+                self._queue.task_done()
+                if self._queue.unfinished_tasks == 0:
+                    self._compact()
+
+    def _process(self, job: WriteJob) -> None:
+        """Run a job with retries and backoff, marking it done in the journal on success."""
+        while True:
+            job.attempts += 1
+            try:
+                run_job(job, on_progress=self._mark_step)
+                self._mark_done(job)
+                return
+            except Exception as e:
+                if job.attempts >= self.max_attempts:
+                    print(
+                        f"[ERROR] Write-behind job {job.job_id} failed {job.attempts} times, "
+                        f"kept for the next start: {e}"
+                    )
+                    return
+                delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (job.attempts - 1))
+                print(f"[WARNING] Write-behind job {job.job_id} failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay * random.uniform(0.5, 1.0))
+
+    # ------------------------------------------------------------------ journal
+
+    def _append(self, lines: List[dict]) -> None:
+        text = "".join(json.dumps(line, default=_encode) + "\n" for line in lines)
+        with FileLock(self.journal_path):
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _journal(self, job: WriteJob) -> None:
+        with self._journal_lock:
+            self._open_jobs[job.job_id] = job
+            self._append([{"op": "put", "job": asdict(job)}])
+
+    def _mark_step(self, job: WriteJob, step: str) -> None:
+        with self._journal_lock:
+            self._append([{"op": "step", "job_id": job.job_id, "step": step}])
+
+    def _mark_done(self, job: WriteJob) -> None:
+        with self._journal_lock:
+            self._open_jobs.pop(job.job_id, None)
+            self._append([{"op": "done", "job_id": job.job_id}])
+
+    def _compact(self) -> None:
+        """Rewrite the journal with only the jobs that are still open (abandoned ones)."""
+        with self._journal_lock:
+            lines = [{"op": "put", "job": asdict(job)} for job in self._open_jobs.values()]
+            with FileLock(self.journal_path):
+                if os.path.exists(self.journal_path):
+                    os.remove(self.journal_path)
+                if lines:
+                    self._append(lines)
+
+    @staticmethod
+    def _read_journal(path: str) -> List[WriteJob]:
+        """Jobs of a journal that were never marked done (in submission order), without their completed steps."""
+        jobs = {}
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line, object_hook=_decode)
+                except json.JSONDecodeError:
+                    # Torn last line from a crash mid-write
+                    continue
+                if entry.get("op") == "put":
+                    job = _job_from_dict(entry["job"])
+                    jobs[job.job_id] = job
+                elif entry.get("op") == "step":
+                    job = jobs.get(entry.get("job_id"))
+                    if job is not None:
+                        complete_step(job, entry.get("step"))
+                elif entry.get("op") == "done":
+                    jobs.pop(entry.get("job_id"), None)
+        return list(jobs.values())
+
+    def _recover(self) -> List[WriteJob]:
+        """Claim the journals of processes that are no longer running and return their open jobs."""
+        recovered = []
+        for name in sorted(os.listdir(self.spill_dir)):
+            stem, ext = os.path.splitext(name)
+            if ext != ".jsonl" or not stem.isdigit():
+                continue
+            pid = int(stem)
+            path = os.path.join(self.spill_dir, name)
+            if pid != os.getpid() and _pid_alive(pid):
+                continue
+            # Renaming is atomic: only one process can claim a journal
+            claimed = f"{path}.{os.getpid()}.claimed"
+            try:
+                os.rename(path, claimed)
+            except OSError:
+                continue
+            jobs = self._read_journal(claimed)
+            for job in jobs:
+                job.attempts = 0
+                self._journal(job)
+            os.remove(claimed)
+            recovered.extend(jobs)
+        return recovered
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Exists but belongs to another user
+        return True
+    return True
+
+
+_write_queue = None
+_write_queue_lock = threading.Lock()
+
+
+def get_write_behind_queue() -> WriteBehindQueue:
+    """Return the process-wide write-behind queue (drained automatically at exit)."""
+    global _write_queue
+    if _write_queue is None:
+        with _write_queue_lock:
+            if _write_queue is None:
+                _write_queue = WriteBehindQueue()
+                atexit.register(_write_queue.close)
+    return _write_queue
+
+
+def submit_write(
+    records: List[Tuple[str, dict]],
+    db_write_allowed: bool = False,
+    session_scores: Optional[dict] = None,
+) -> None:
+    """
+    Persist records (and a completed session's aggregates) without waiting for storage.
+
+    Args:
+        records: (table_name, record) pairs written together with write_batch
+        db_write_allowed: If True, write to DynamoDB; otherwise to the local backend
+        session_scores: {"session_id", "toxic_score", "filter_violations"} of a completed
+            session whose aggregates should be updated after the records are written
+    """
+    job = WriteJob(records=list(records), db_write_allowed=db_write_allowed, session_scores=session_scores)
+    if os.getenv("WRITE_BEHIND_ENABLED", "true").lower() not in ("true", "1", "yes"):
+        run_job(job)
+        return
+    get_write_behind_queue().submit(job)
@@ -1,8 +1,7 @@
 """Utility functions for category-based toxicity analysis."""
 from typing import Dict, List, Tuple, Optional
-from decimal import Decimal
-import numpy as np
 from src.domain.value_objects import RedFlagQuestion
+from src.services.scoring_engine import get_scoring_engine
 
 
 def calculate_category_toxicity_scores(
@@ -24,57 +23,7 @@ def calculate_category_toxicity_scores(
         Dictionary mapping category_name to (average_score, question_count)
         Categories with no responses are excluded.
     """
-    # Create mapping from question_id to question object
-    question_map = {f"Q{q.question_id}": q for q in questions}
-    
-    # Group responses by category with weights
-    category_weighted_scores: Dict[str, List[Tuple[float, float]]] = {}  # (rating, weight)
-    category_counts: Dict[str, int] = {}
-    
-    for q_id, rating in redflag_responses.items():
-        # Skip NaN or None values
-        if rating is None or (isinstance(rating, float) and (rating != rating)):  # NaN check
-            continue
-        
-        # Convert to float if Decimal
-        if isinstance(rating, Decimal):
-            rating = float(rating)
-        
-        # Get question object
-        question = question_map.get(q_id)
-        if question:
-            # Use category_names_map if provided (for language-specific names)
-            # Otherwise fall back to question.category_name
-            if category_names_map and question.category_id:
-                category = category_names_map.get(question.category_id)
-            elif question.category_name:
-                category = question.category_name
-            else:
-                category = None
-            
-            if category:
-                if category not in category_weighted_scores:
-                    category_weighted_scores[category] = []
-                    category_counts[category] = 0
-                # Store rating and weight together
-                weight = float(question.weight) if question.weight else 1.0
-                category_weighted_scores[category].append((rating, weight))
-                category_counts[category] += 1
-    
-    # Calculate weighted averages
-    result = {}
-    for category, weighted_scores in category_weighted_scores.items():
-        if weighted_scores:  # Only include categories with at least one response
-            # Calculate weighted average: sum(rating * weight) / sum(weight)
-            total_weighted_score = sum(rating * weight for rating, weight in weighted_scores)
-            total_weight = sum(weight for _, weight in weighted_scores)
-            if total_weight > 0:
-                avg_score = total_weighted_score / total_weight
-            else:
-                avg_score = sum(rating for rating, _ in weighted_scores) / len(weighted_scores)  # Fallback to simple average
-            result[category] = (avg_score, category_counts[category])
-    
-    return result
+    return get_scoring_engine(questions).category_scores(redflag_responses, category_names_map)
 
 
 def normalize_category_scores(
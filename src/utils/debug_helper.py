@@ -58,7 +58,7 @@ def setup_mock_data_for_testing():
         if actual_questions:
             # Randomize the questions (same as real flow)
             questions = random.sample(actual_questions, len(actual_questions))
-            st.session_state.randomized_questions = questions
+            st.session_state.redflag_question_order = tuple(q.question_id for q in questions)
             
             # Update redflag_responses to match actual question IDs
             # Create realistic responses: mix of high, medium, and low ratings
@@ -125,19 +125,9 @@ def setup_mock_data_for_testing():
             st.session_state.toxic_score = toxic_score_float
             # Loaded actual redflag questions and calculated toxic score
         else:
-            # No redflag questions found, using mock questions
-            # Fallback to mock if database is empty
-            from src.domain.value_objects import RedFlagQuestion
-            mock_questions = [
-                RedFlagQuestion(
-                    question_id=1,
-                    question_en="Does he control who you see?",
-                    question_tr="Senin kiminle görüştüğünü kontrol ediyor mu?",
-                    scoring="Range(0-10)",
-                    weight=1.0,
-                ),
-            ]
-            st.session_state.randomized_questions = mock_questions
+            # No redflag questions found; the results page loads questions from the
+            # catalog, so only the order is set
+            st.session_state.redflag_question_order = (1,)
         
         # Load filter questions and create responses that actually violate some filters
         filter_questions = repository.get_filter_questions()
@@ -145,7 +135,7 @@ def setup_mock_data_for_testing():
         if filter_questions:
             # Randomize filter questions (same as real flow)
             randomized_filters = random.sample(filter_questions, len(filter_questions))
-            st.session_state.randomized_filters = randomized_filters
+            st.session_state.filter_question_order = tuple(q.filter_id for q in randomized_filters)
             
             # Create realistic filter responses that match actual question IDs
             # Make sure 2 filters are violated (answer >= upper_limit) for realism
@@ -190,17 +180,7 @@ def setup_mock_data_for_testing():
     except Exception as e:
         # Failed to load questions, using mock data as fallback
         # Fallback to minimal mock if database fails
-        from src.domain.value_objects import RedFlagQuestion
-        mock_questions = [
-            RedFlagQuestion(
-                question_id=1,
-                question_en="Mock question (database unavailable)",
-                question_tr="Mock soru (veritabanı mevcut değil)",
-                scoring="Range(0-10)",
-                weight=1.0,
-            ),
-        ]
-        st.session_state.randomized_questions = mock_questions
+        st.session_state.redflag_question_order = (1,)
         st.session_state.filter_responses = {
             "F1": 1,
             "F2": 1,
@@ -0,0 +1,85 @@
+"""Cross-process file lock used to serialize writes to local data files."""
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """Exclusive lock on ``<path>.lock``, safe across threads and processes.
+
+    Usage:
+        with FileLock(file_path):
+            ... read-modify-write file_path ...
+    """
+
+    # Per lock file state shared by all FileLock instances in this process. OS locks
+    # don't serialize threads of the same process, so an RLock guards each file and
+    # the OS lock is only taken by the outermost holder (nested use is allowed).
+    _states = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, path: str, timeout: float = 30.0, poll_interval: float = 0.01):
+        self.lock_path = f"{path}.lock"
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        with self._registry_lock:
+            self._state = self._states.setdefault(
+                self.lock_path, {"lock": threading.RLock(), "depth": 0, "fd": None}
+            )
+
+    def acquire(self):
+        """Acquire the lock, raising TimeoutError after `timeout` seconds."""
+        state = self._state
+        if not state["lock"].acquire(timeout=self.timeout):
+            raise TimeoutError(f"Timed out waiting for lock: {self.lock_path}")
+        if state["depth"] > 0:
+            state["depth"] += 1
+            return
+
+        deadline = time.monotonic() + self.timeout
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    state["lock"].release()
+                    raise TimeoutError(f"Timed out waiting for lock: {self.lock_path}")
+                time.sleep(self.poll_interval)
+        state["fd"] = fd
+        state["depth"] = 1
+
+    def release(self):
+        """Release the lock."""
+        state = self._state
+        state["depth"] -= 1
+        if state["depth"] == 0:
+            fd = state["fd"]
+            state["fd"] = None
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                else:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            finally:
+                os.close(fd)
+        state["lock"].release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
@@ -0,0 +1,216 @@
+"""Capped ring of the most recent toxic scores, used by the results comparison graph.
+
+The graph only needs the last N scores, so instead of reading session_responses (whose
+row order DynamoDB scans don't guarantee) every saved session is written into one small
+record of the Recent_Scores table:
+
+    recent_id = 1, cursor = <sessions recorded so far>,
+    slot_<i>_id / slot_<i>_score / slot_<i>_seq for i in 0..N-1
+
+Writers claim a position with an atomic ``cursor`` increment and overwrite slot
+``(position - 1) % N``, so concurrent saves land in different slots. Readers fetch the
+record with a single key lookup and order the slots by their sequence number. Reads are
+cached in-process for a few seconds (env: RECENT_SCORES_TTL).
+
+Deleted sessions are cleared from their slots and re-scored sessions get their new score
+(``remove_from_recent_scores`` / ``update_recent_scores``), so the graph never shows a
+session that no longer exists or a stale score.
+"""
+import os
+import threading
+import time
+from decimal import Decimal
+from typing import Iterable, List, Mapping, Optional, Tuple
+from src.utils.utils import safe_decimal
+
+RECENT_SCORES_TABLE = "Recent_Scores"
+RECENT_SCORES_KEY = {"recent_id": 1}
+DEFAULT_RECENT_SCORES_SIZE = 20
+DEFAULT_TTL_SECONDS = 5
+
+_cache = {}  # backend key -> (expires_at, scores)
+_cache_lock = threading.Lock()
+
+
+def get_recent_scores_size() -> int:
+    """Number of scores kept in the ring (env: RECENT_SCORES_SIZE, default 20)."""
+    try:
+        return max(1, int(os.getenv("RECENT_SCORES_SIZE", DEFAULT_RECENT_SCORES_SIZE)))
+    except ValueError:
+        return DEFAULT_RECENT_SCORES_SIZE
+
+
+def _ttl_seconds() -> float:
+    try:
+        return float(os.getenv("RECENT_SCORES_TTL", DEFAULT_TTL_SECONDS))
+    except ValueError:
+        return DEFAULT_TTL_SECONDS
+
+
+def _cache_key(db_handler) -> tuple:
+    backend = db_handler.backend
+    return (type(backend).__name__, getattr(backend, "data_dir", ""), getattr(backend, "db_path", ""))
+
+
+def _slot_fields(slot: int, session_id, toxic_score, position: int) -> dict:
+    return {
+        f"slot_{slot}_id": int(session_id),
+        f"slot_{slot}_score": safe_decimal(float(toxic_score)),
+        f"slot_{slot}_seq": int(position),
+    }
+
+
+def record_recent_score(db_handler, session_id, toxic_score) -> bool:
+    """
+    Add a saved session's toxic score to the ring, replacing the oldest one.
+
+    Args:
+        db_handler: DatabaseHandler instance
+        session_id: Session id of the saved session
+        toxic_score: Toxic score of the session
+
+    Returns:
+        True if the score was recorded, False otherwise
+    """
+    item = db_handler.update_aggregates(RECENT_SCORES_TABLE, RECENT_SCORES_KEY, increments={"cursor": 1})
+    if item is None:
+        return False
+    position = int(Decimal(str(item.get("cursor") or 1)))
+    slot = (position - 1) % get_recent_scores_size()
+    db_handler.update_aggregates(
+        RECENT_SCORES_TABLE,
+        RECENT_SCORES_KEY,
+        sets=_slot_fields(slot, session_id, toxic_score, position),
+    )
+    with _cache_lock:
+        _cache.pop(_cache_key(db_handler), None)
+    return True
+
+
+def _replace_slots(db_handler, scores: Mapping[int, Optional[float]]) -> int:
+    """Set the score of the slots holding the given sessions (None clears the slot)."""
+    if not scores:
+        return 0
+    record = db_handler.get_record(RECENT_SCORES_TABLE, RECENT_SCORES_KEY)
+    if not record:
+        return 0
+    fields = {}
+    for slot in range(get_recent_scores_size()):
+        session_id = record.get(f"slot_{slot}_id")
+        if session_id is None or record.get(f"slot_{slot}_score") is None:
+            continue
+        session_id = int(float(session_id))
+        if session_id not in scores:
+            continue
+        score = scores[session_id]
+        if score is None:
+            fields.update({f"slot_{slot}_id": None, f"slot_{slot}_score": None, f"slot_{slot}_seq": None})
+        else:
+            fields[f"slot_{slot}_score"] = safe_decimal(float(score))
+    if fields:
+        db_handler.update_aggregates(RECENT_SCORES_TABLE, RECENT_SCORES_KEY, sets=fields)
+        with _cache_lock:
+            _cache.pop(_cache_key(db_handler), None)
+    return sum(1 for field in fields if field.endswith("_score"))
+
+
+def remove_from_recent_scores(db_handler, session_ids: Iterable) -> int:
+    """
+    Clear deleted sessions from the ring (their slots are reused by later sessions).
+
+    Args:
+        db_handler: DatabaseHandler instance
+        session_ids: Ids of the deleted sessions
+
+    Returns:
+        Number of slots cleared
+    """
+    return _replace_slots(db_handler, {int(session_id): None for session_id in session_ids})
+
+
+def update_recent_scores(db_handler, scores: Mapping[int, float]) -> int:
+    """
+    Replace the scores of re-scored sessions that are in the ring.
+
+    Args:
+        db_handler: DatabaseHandler instance
+        scores: New toxic score per session id
+
+    Returns:
+        Number of slots updated
+    """
+    return _replace_slots(db_handler, {int(session_id): score for session_id, score in scores.items()})
+
+
+def load_recent_session_ids(db_handler) -> set:
+    """Ids of the sessions currently in the ring (without seeding it)."""
+    record = db_handler.get_record(RECENT_SCORES_TABLE, RECENT_SCORES_KEY)
+    return {session_id for session_id, _ in _scores_from_record(record)} if record else set()
+
+
+def _scores_from_record(record: dict) -> List[Tuple[int, float]]:
+    """Slots of the ring record as [(session_id, toxic_score)], oldest first."""
+    slots = []
+    for slot in range(get_recent_scores_size()):
+        seq = record.get(f"slot_{slot}_seq")
+        score = record.get(f"slot_{slot}_score")
+        if seq is None or score is None:
+            continue
+        slots.append((int(float(seq)), int(float(record.get(f"slot_{slot}_id") or 0)), float(score)))
+    slots.sort()
+    return [(session_id, score) for _, session_id, score in slots]
+
+
+def seed_recent_scores(db_handler) -> List[Tuple[int, float]]:
+    """
+    Build the ring from the latest sessions in session_responses (one-time migration).
+
+    Only the id, toxic_score and session_end_time columns are read.
+
+    Returns:
+        The seeded scores as [(session_id, toxic_score)], oldest first
+    """
+    try:
+        df = db_handler.load_table(
+            "session_responses", columns=["id", "toxic_score", "session_end_time"]
+        )
+    except FileNotFoundError:
+        return []
+    df = df.dropna(subset=["id", "toxic_score"])
+    if df.empty:
+        return []
+
+    latest = df.sort_values("session_end_time", na_position="first").tail(get_recent_scores_size())
+    fields = {}
+    scores = []
+    for slot, (session_id, score) in enumerate(zip(latest["id"].tolist(), latest["toxic_score"].tolist())):
+        fields.update(_slot_fields(slot, session_id, score, slot + 1))
+        scores.append((int(session_id), float(score)))
+    db_handler.update_aggregates(
+        RECENT_SCORES_TABLE, RECENT_SCORES_KEY, increments={"cursor": len(scores)}, sets=fields
+    )
+    return scores
+
+
+def load_recent_scores(db_handler) -> List[Tuple[int, float]]:
+    """
+    Return the most recent toxic scores as [(session_id, toxic_score)], oldest first.
+
+    Reads the ring record with one key lookup (seeding it from session_responses the
+    first time) and caches the result in-process for a few seconds.
+
+    Args:
+        db_handler: DatabaseHandler instance
+    """
+    key = _cache_key(db_handler)
+    now = time.monotonic()
+    cached = _cache.get(key)
+    if cached is not None and cached[0] > now:
+        return list(cached[1])
+
+    record = db_handler.get_record(RECENT_SCORES_TABLE, RECENT_SCORES_KEY)
+    scores = _scores_from_record(record) if record else seed_recent_scores(db_handler)
+
+    with _cache_lock:
+        _cache[key] = (now + _ttl_seconds(), tuple(scores))
+    return scores
@@ -0,0 +1,483 @@
+"""Mergeable fixed-bin histograms of toxic scores and filter violations.
+
+Summary_Sessions only holds sums, min and max, so comparing a guy against everyone else
+used to mean reading session_responses. The Score_Histogram table keeps counts instead:
+
+    histogram_id = <shard>, count = <sessions>,
+    t_<bin> = sessions whose toxic score falls in bin <bin>   (BIN_WIDTH wide over [-1, 1])
+    f_<n>   = sessions with n filter violations
+
+Counters are only ever added to (``ADD`` on DynamoDB), so saves and deletes (negative
+counts) from concurrent sessions never overwrite each other, and shards merge by adding
+their counts. Attributes exist only for bins that have been used. Once loaded, the
+percentile rank of a score is one lookup in a precomputed cumulative array.
+
+Score_Bin_Extremes keeps the exact lowest and highest score of each bin (one record per
+bin, updated with min/max), so the summary min/max can move to the next real score when
+the session holding them is deleted. A bin whose extreme was deleted while other sessions
+remain in it is flagged ``stale`` and recomputed from session_responses when needed.
+"""
+import math
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from src.utils.summary_aggregates import (
+    EMPTY_MAX_TOXIC_SCORE,
+    EMPTY_MIN_TOXIC_SCORE,
+    _to_decimal,
+    get_shard_ids,
+)
+
+HISTOGRAM_TABLE = "Score_Histogram"
+EXTREMES_TABLE = "Score_Bin_Extremes"
+MIN_SCORE = -1.0
+MAX_SCORE = 1.0
+# Width of a toxic score bin; 0.002 keeps every bin in one record (1001 bins, fits SQLite's column limit)
+BIN_WIDTH = 0.002
+BIN_COUNT = int(round((MAX_SCORE - MIN_SCORE) / BIN_WIDTH)) + 1
+DEFAULT_TTL_SECONDS = 5
+# Counters changed per update; keeps DynamoDB update expressions well below their size limit
+MAX_FIELDS_PER_UPDATE = 100
+# Stored and deleted scores closer than this are treated as the same score
+SCORE_TOLERANCE = 1e-9
+
+_cache = {}  # backend key -> (expires_at, ScoreHistogram)
+_cache_lock = threading.Lock()
+
+
+def score_bin(score: float) -> int:
+    """Bin index of a toxic score (scores outside [-1, 1] go to the first/last bin)."""
+    index = int(math.floor((float(score) - MIN_SCORE) / BIN_WIDTH + 1e-9))
+    return min(max(index, 0), BIN_COUNT - 1)
+
+
+def _score_bins(scores: np.ndarray) -> np.ndarray:
+    """Bin index of every score in an array (see score_bin)."""
+    return np.clip(np.floor((scores - MIN_SCORE) / BIN_WIDTH + 1e-9), 0, BIN_COUNT - 1).astype(np.int64)
+
+
+def histogram_counts(toxic_scores, filter_violations):
+    """
+    Count many sessions into histogram bins.
+
+    Args:
+        toxic_scores: Array of toxic scores
+        filter_violations: Array of filter violation counts (same length)
+
+    Returns:
+        (toxic_counts, filter_counts) arrays; add them up to merge several batches
+    """
+    scores = np.nan_to_num(np.asarray(toxic_scores, dtype=np.float64))
+    bins = _score_bins(scores)
+    violations = np.clip(np.nan_to_num(np.asarray(filter_violations, dtype=np.float64)), 0, None).astype(np.int64)
+    toxic_counts = np.bincount(bins, minlength=BIN_COUNT)
+    filter_counts = np.bincount(violations, minlength=1)
+    return toxic_counts, filter_counts
+
+
+def histogram_extremes(toxic_scores):
+    """
+    Lowest and highest toxic score in each bin.
+
+    Returns:
+        (lows, highs) arrays of length BIN_COUNT (inf/-inf for empty bins); merge batches
+        with np.minimum/np.maximum
+    """
+    scores = np.nan_to_num(np.asarray(toxic_scores, dtype=np.float64))
+    bins = _score_bins(scores)
+    lows = np.full(BIN_COUNT, np.inf)
+    highs = np.full(BIN_COUNT, -np.inf)
+    np.minimum.at(lows, bins, scores)
+    np.maximum.at(highs, bins, scores)
+    return lows, highs
+
+
+def add_counts(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Add two count arrays of possibly different lengths."""
+    if len(a) < len(b):
+        a, b = b, a
+    merged = a.copy()
+    merged[: len(b)] += b
+    return merged
+
+
+def bin_lower_edge(index: int) -> float:
+    """Smallest score that falls in a bin."""
+    return round(MIN_SCORE + index * BIN_WIDTH, 6)
+
+
+@dataclass(slots=True)
+class ScoreHistogram:
+    """Counts of toxic score bins and filter violation values, merged over all shards."""
+    toxic_counts: np.ndarray
+    filter_counts: np.ndarray
+    count: int = 0
+    _toxic_below: Optional[np.ndarray] = None
+    _filter_below: Optional[np.ndarray] = None
+
+    @classmethod
+    def empty(cls) -> "ScoreHistogram":
+        return cls(np.zeros(BIN_COUNT, dtype=np.int64), np.zeros(1, dtype=np.int64))
+
+    @classmethod
+    def from_records(cls, records) -> "ScoreHistogram":
+        """Build a histogram from Score_Histogram records (one per shard)."""
+        histogram = cls.empty()
+        for record in records:
+            histogram.merge_record(record)
+        return histogram
+
+    def merge_record(self, record: dict) -> None:
+        """Add the counters of one stored record."""
+        for field, value in record.items():
+            if value is None or not isinstance(field, str):
+                continue
+            try:
+                amount = int(float(value))
+            except (TypeError, ValueError):
+                continue
+            if amount == 0:
+                continue
+            if field == "count":
+                self.count += amount
+            elif field.startswith("t_") and field[2:].isdigit():
+                index = int(field[2:])
+                if index < BIN_COUNT:
+                    self.toxic_counts[index] += amount
+            elif field.startswith("f_") and field[2:].isdigit():
+                violations = int(field[2:])
+                if violations >= len(self.filter_counts):
+                    self.filter_counts = np.pad(self.filter_counts, (0, violations + 1 - len(self.filter_counts)))
+                self.filter_counts[violations] += amount
+        self._toxic_below = None
+        self._filter_below = None
+
+    @staticmethod
+    def _below(counts: np.ndarray) -> np.ndarray:
+        """below[i] = number of sessions in bins before i (one extra entry for the total)."""
+        return np.concatenate(([0], np.cumsum(np.clip(counts, 0, None))))
+
+    def percentile_rank(self, toxic_score: float) -> Optional[float]:
+        """
+        Share of sessions with a lower toxic score, in percent (0-100).
+
+        Sessions in the same bin count as half, so the rank of a typical score is not biased
+        by the bin width. Returns None if no session has been recorded.
+        """
+        if self._toxic_below is None:
+            self._toxic_below = self._below(self.toxic_counts)
+        total = self._toxic_below[-1]
+        if total <= 0:
+            return None
+        index = score_bin(toxic_score)
+        below = self._toxic_below[index]
+        same = self._toxic_below[index + 1] - below
+        return 100.0 * (below + 0.5 * same) / total
+
+    def filter_percentile_rank(self, filter_violations: int) -> Optional[float]:
+        """Share of sessions with fewer filter violations, in percent (ties count as half)."""
+        if self._filter_below is None:
+            self._filter_below = self._below(self.filter_counts)
+        total = self._filter_below[-1]
+        if total <= 0:
+            return None
+        index = min(max(int(filter_violations), 0), len(self.filter_counts))
+        below = self._filter_below[index]
+        same = self._filter_below[index + 1] - below if index < len(self.filter_counts) else 0
+        return 100.0 * (below + 0.5 * same) / total
+
+    def min_score(self) -> Optional[float]:
+        """Lower edge of the lowest non-empty bin (None if empty)."""
+        used = np.flatnonzero(self.toxic_counts > 0)
+        return bin_lower_edge(int(used[0])) if len(used) else None
+
+    def max_score(self) -> Optional[float]:
+        """Lower edge of the highest non-empty bin (None if empty)."""
+        used = np.flatnonzero(self.toxic_counts > 0)
+        return bin_lower_edge(int(used[-1])) if len(used) else None
+
+
+def _cache_key(db_handler) -> tuple:
+    backend = db_handler.backend
+    return (type(backend).__name__, getattr(backend, "data_dir", ""), getattr(backend, "db_path", ""))
+
+
+def _invalidate(db_handler) -> None:
+    with _cache_lock:
+        _cache.pop(_cache_key(db_handler), None)
+
+
+def record_score_histogram(db_handler, toxic_score, filter_violations, count: int = 1) -> bool:
+    """
+    Add a session to the histograms (use count=-1 to remove a deleted session).
+
+    Args:
+        db_handler: DatabaseHandler instance
+        toxic_score: Toxic score of the session
+        filter_violations: Number of filter violations of the session
+        count: Number of sessions to add (negative to remove)
+
+    Returns:
+        True if the counters were updated, False otherwise
+    """
+    index = score_bin(float(toxic_score or 0))
+    if count > 0:
+        # min/max are idempotent, so they go first: a retried step only repeats the counters
+        score = _to_decimal(toxic_score)
+        db_handler.update_aggregates(
+            EXTREMES_TABLE,
+            {"bin_id": index},
+            minimums={"min_toxic_score": score},
+            maximums={"max_toxic_score": score},
+        )
+    increments = {
+        "count": count,
+        f"t_{index}": count,
+        f"f_{max(int(filter_violations or 0), 0)}": count,
+    }
+    item = db_handler.update_aggregates(
+        HISTOGRAM_TABLE, {"histogram_id": random.choice(get_shard_ids())}, increments=increments
+    )
+    _invalidate(db_handler)
+    if count < 0:
+        _release_extremes(db_handler, [float(toxic_score or 0)])
+    return item is not None
+
+
+def histogram_exists(db_handler) -> bool:
+    """True if any histogram record has been written."""
+    return any(db_handler.exists(HISTOGRAM_TABLE, {"histogram_id": s}) for s in get_shard_ids())
+
+
+def remove_from_score_histogram(db_handler, toxic_scores, filter_violations) -> bool:
+    """
+    Remove many deleted sessions from the histograms with one set of counter updates.
+
+    If no histogram exists yet it is seeded from session_responses instead, which must
+    no longer contain the deleted sessions.
+
+    Args:
+        db_handler: DatabaseHandler instance
+        toxic_scores: Toxic scores of the deleted sessions
+        filter_violations: Filter violations of the deleted sessions (same length)
+
+    Returns:
+        True if the counters were updated, False otherwise
+    """
+    if not histogram_exists(db_handler):
+        seed_score_histogram(db_handler)
+        return True
+
+    toxic_counts, filter_counts = histogram_counts(toxic_scores, filter_violations)
+    increments = {"count": -int(toxic_counts.sum())}
+    increments.update({f"t_{i}": -int(c) for i, c in enumerate(toxic_counts) if c})
+    increments.update({f"f_{i}": -int(c) for i, c in enumerate(filter_counts) if c})
+
+    fields = list(increments.items())
+    updated = True
+    for start in range(0, len(fields), MAX_FIELDS_PER_UPDATE):
+        item = db_handler.update_aggregates(
+            HISTOGRAM_TABLE,
+            {"histogram_id": 1},
+            increments=dict(fields[start:start + MAX_FIELDS_PER_UPDATE]),
+        )
+        updated = item is not None and updated
+    _invalidate(db_handler)
+    _release_extremes(db_handler, toxic_scores)
+    return updated
+
+
+def _known_extremes(record: Optional[dict]) -> Optional[tuple]:
+    """(min, max) of a Score_Bin_Extremes record, or None if it is missing, empty or stale."""
+    if not record:
+        return None
+    try:
+        low = float(record.get("min_toxic_score"))
+        high = float(record.get("max_toxic_score"))
+        stale = float(record.get("stale") or 0)
+    except (TypeError, ValueError):
+        return None
+    if stale == 1 or not low <= high:
+        return None
+    return low, high
+
+
+def _release_extremes(db_handler, toxic_scores) -> None:
+    """
+    Update the bin extremes after sessions were removed from the counters.
+
+    Bins left empty are reset; bins whose lowest or highest score was removed while other
+    sessions remain are flagged stale.
+    """
+    histogram = load_score_histogram(db_handler)
+    lows, highs = histogram_extremes(toxic_scores)
+    for index in np.flatnonzero(np.isfinite(lows)):
+        key = {"bin_id": int(index)}
+        if histogram.toxic_counts[index] <= 0:
+            sets = {"min_toxic_score": EMPTY_MIN_TOXIC_SCORE, "max_toxic_score": EMPTY_MAX_TOXIC_SCORE, "stale": 0}
+        else:
+            known = _known_extremes(db_handler.get_record(EXTREMES_TABLE, key))
+            if known and lows[index] > known[0] + SCORE_TOLERANCE and highs[index] < known[1] - SCORE_TOLERANCE:
+                continue
+            sets = {"stale": 1}
+        db_handler.update_aggregates(EXTREMES_TABLE, key, sets=sets)
+
+
+def rebuild_score_histogram(db_handler, toxic_counts, filter_counts, lows, highs) -> bool:
+    """
+    Overwrite the histograms and bin extremes with values recomputed from all sessions.
+
+    Shard 1 receives the counts and the other shards are reset.
+
+    Args:
+        db_handler: DatabaseHandler instance
+        toxic_counts: Sessions per toxic score bin (length BIN_COUNT)
+        filter_counts: Sessions per number of filter violations
+        lows: Lowest score per bin (see histogram_extremes)
+        highs: Highest score per bin
+
+    Returns:
+        True if every record was written, False otherwise
+    """
+    record = {"count": int(np.sum(toxic_counts))}
+    record.update({f"t_{i}": int(c) for i, c in enumerate(toxic_counts) if c})
+    record.update({f"f_{i}": int(c) for i, c in enumerate(filter_counts) if c})
+
+    written = True
+    for shard_id in get_shard_ids():
+        row = dict(record) if shard_id == 1 else {"count": 0}
+        row["histogram_id"] = shard_id
+        # Drop the old record first so bins that are now empty don't survive the rebuild
+        db_handler.delete_record(HISTOGRAM_TABLE, shard_id, id_column="histogram_id")
+        written = db_handler.upsert_record(HISTOGRAM_TABLE, row, key_column="histogram_id") and written
+    written = _write_extremes(db_handler, np.flatnonzero(np.isfinite(lows)), lows, highs, reset=True) and written
+    _invalidate(db_handler)
+    return written
+
+
+def _write_extremes(db_handler, bins, lows, highs, reset: bool = False) -> bool:
+    """
+    Store exact extremes for some bins.
+
+    Args:
+        db_handler: DatabaseHandler instance
+        bins: Bin indexes to write (bins without scores are reset)
+        lows: Lowest score per bin (see histogram_extremes)
+        highs: Highest score per bin
+        reset: Also reset every other stored bin
+    """
+    bins = {int(index) for index in bins}
+    if reset:
+        try:
+            stored = db_handler.load_table(EXTREMES_TABLE, columns=["bin_id"])
+        except FileNotFoundError:
+            stored = None
+        if stored is not None and "bin_id" in stored.columns:
+            bins.update(int(index) for index in stored["bin_id"].dropna())
+
+    written = True
+    for index in sorted(bins):
+        if np.isfinite(lows[index]):
+            row = {"min_toxic_score": _to_decimal(lows[index]), "max_toxic_score": _to_decimal(highs[index])}
+        else:
+            row = {"min_toxic_score": EMPTY_MIN_TOXIC_SCORE, "max_toxic_score": EMPTY_MAX_TOXIC_SCORE}
+        row.update({"bin_id": index, "stale": 0})
+        written = db_handler.upsert_record(EXTREMES_TABLE, row, key_column="bin_id") and written
+    return written
+
+
+def exact_score_range(db_handler, histogram: "ScoreHistogram"):
+    """
+    Lowest and highest toxic score of all sessions in the histogram.
+
+    Reads the extremes of the lowest and highest non-empty bins; a bin that is stale or
+    was never recorded is recomputed from the toxic_score column of session_responses.
+
+    Args:
+        db_handler: DatabaseHandler instance
+        histogram: Current histogram (see load_score_histogram)
+
+    Returns:
+        (min_score, max_score), or (None, None) if the histogram is empty
+    """
+    used = np.flatnonzero(histogram.toxic_counts > 0)
+    if not len(used):
+        return None, None
+    first, last = int(used[0]), int(used[-1])
+
+    extremes = {
+        index: _known_extremes(db_handler.get_record(EXTREMES_TABLE, {"bin_id": index}))
+        for index in {first, last}
+    }
+    unknown = [index for index, known in extremes.items() if known is None]
+    if unknown:
+        try:
+            df = db_handler.load_table("session_responses", columns=["toxic_score"])
+        except FileNotFoundError:
+            df = None
+        scores = [] if df is None or "toxic_score" not in df.columns else df["toxic_score"].dropna().astype(float)
+        lows, highs = histogram_extremes(scores)
+        _write_extremes(db_handler, unknown, lows, highs)
+        for index in unknown:
+            extremes[index] = (float(lows[index]), float(highs[index]))
+        print(f"[INFO] Recomputed the extremes of {len(unknown)} score bin(s) from session_responses")
+
+    low, high = extremes[first][0], extremes[last][1]
+    if not (np.isfinite(low) and np.isfinite(high)):
+        return None, None
+    return low, high
+
+
+def seed_score_histogram(db_handler) -> ScoreHistogram:
+    """
+    Build the histograms from session_responses (one-time migration).
+
+    Only the toxic_score and filter_violations columns are read.
+    """
+    try:
+        df = db_handler.load_table("session_responses", columns=["toxic_score", "filter_violations"])
+    except FileNotFoundError:
+        return ScoreHistogram.empty()
+    if df.empty or "toxic_score" not in df.columns:
+        return ScoreHistogram.empty()
+    df = df.dropna(subset=["toxic_score"])
+    violations = df["filter_violations"] if "filter_violations" in df.columns else np.zeros(len(df))
+    toxic_scores = df["toxic_score"].astype(float).to_numpy()
+    toxic_counts, filter_counts = histogram_counts(toxic_scores, np.asarray(violations, dtype=np.float64))
+    rebuild_score_histogram(db_handler, toxic_counts, filter_counts, *histogram_extremes(toxic_scores))
+    return ScoreHistogram(toxic_counts, filter_counts, int(toxic_counts.sum()))
+
+
+def load_score_histogram(db_handler) -> ScoreHistogram:
+    """
+    Read and merge the histogram records of all shards (cached in-process for a few seconds).
+
+    The histograms are seeded from session_responses the first time.
+
+    Args:
+        db_handler: DatabaseHandler instance
+    """
+    key = _cache_key(db_handler)
+    now = time.monotonic()
+    cached = _cache.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    records = []
+    for shard_id in get_shard_ids():
+        record = db_handler.get_record(HISTOGRAM_TABLE, {"histogram_id": shard_id})
+        if record:
+            records.append(record)
+    histogram = ScoreHistogram.from_records(records) if records else seed_score_histogram(db_handler)
+
+    try:
+        ttl = float(os.getenv("SCORE_HISTOGRAM_TTL", DEFAULT_TTL_SECONDS))
+    except ValueError:
+        ttl = DEFAULT_TTL_SECONDS
+    with _cache_lock:
+        _cache[key] = (now + ttl, histogram)
+    return histogram
@@ -45,7 +45,10 @@ def find_existing_session_id(
 ) -> int:
     """
     Find existing session_id for a user_id + boyfriend_name combination.
-    
+
+    The lookup is a single query on the (user_id, boyfriend_name) secondary index, so no
+    table scan is needed. If several records match, the generated id is preferred.
+
     Args:
         db_handler: DatabaseHandler instance
         table_name: Name of the table to search
@@ -56,19 +59,14 @@ def find_existing_session_id(
         Existing session_id if found, None otherwise
     """
     try:
-        existing = db_handler.load_table(table_name)
-        if existing.empty:
+        records = db_handler.query_index(
+            table_name, {"user_id": user_id, "boyfriend_name": boyfriend_name}
+        )
+        ids = [int(record["id"]) for record in records if record.get("id") is not None]
+        if not ids:
             return None
-        
-        # Search for matching user_id and boyfriend_name
-        mask = (existing["user_id"] == user_id) & (existing["boyfriend_name"] == boyfriend_name)
-        matching = existing[mask]
-        
-        if not matching.empty:
-            # Return the first matching ID
-            return int(matching.iloc[0]["id"])
-        
-        return None
+        generated = generate_session_id(user_id, boyfriend_name)
+        return generated if generated in ids else min(ids)
     except Exception as e:
         print(f"[WARNING] Could not search for existing session_id: {e}")
         return None
@@ -106,19 +104,16 @@ def get_or_create_session_id(
     new_id = generate_session_id(user_id, boyfriend_name)
     print(f"[INFO] Generated new session_id {new_id} for user_id={user_id}, boyfriend_name={boyfriend_name}")
     
-    # Check if this ID already exists (collision check)
+    # Check if this ID already exists (collision check) with key lookups
     try:
-        existing = db_handler.load_table(table_name)
-        if not existing.empty:
-            if new_id in existing["id"].values:
-                # Collision detected - append a counter
-                counter = 1
-                while new_id + counter in existing["id"].values:
-                    counter += 1
-                new_id = new_id + counter
-                print(f"[WARNING] Session ID collision detected, using {new_id} instead")
+        if db_handler.exists(table_name, {"id": new_id}):
+            # Collision detected - probe the next ids
+            counter = 1
+            while db_handler.exists(table_name, {"id": new_id + counter}):
+                counter += 1
+            new_id = new_id + counter
+            print(f"[WARNING] Session ID collision detected, using {new_id} instead")
     except Exception:
         pass  # If we can't check, just use the generated ID
     
     return new_id
-
@@ -0,0 +1,201 @@
+"""Atomic, optionally sharded aggregate counters for the Summary_Sessions table.
+
+Each completed session is folded into one counter row with server-side increments
+(DynamoDB ``ADD``, or a file-locked read-modify-write for CSV) instead of writing back
+totals cached in session state, so concurrent completions never overwrite each other.
+
+To spread write load the counters can be sharded across several rows
+(``summary_id`` 1..N, env: SUMMARY_SHARD_COUNT). Shard 1 is the original summary row,
+so a single shard keeps the existing layout. Readers merge all shards with
+``load_summary``.
+"""
+import os
+import random
+from datetime import datetime
+from decimal import Decimal
+from src.utils.constants import DATE_FORMAT
+
+SUMMARY_TABLE = "Summary_Sessions"
+DEFAULT_SHARD_COUNT = 1
+
+# Values reported when no session has been recorded yet
+DEFAULT_SUMMARY = {
+    "sum_toxic_score": Decimal("0"),
+    "max_toxic_score": Decimal("1"),
+    "min_toxic_score": Decimal("0"),
+    "avg_toxic_score": Decimal("0.5"),
+    "sum_filter_violations": 0,
+    "avg_filter_violations": Decimal("0"),
+    "count_guys": 0,
+}
+
+# Stored min/max of a counter row without sessions. They lose every comparison, so the
+# first session's conditional min/max updates always win (DynamoDB has no infinity).
+EMPTY_MIN_TOXIC_SCORE = Decimal("1E+9")
+EMPTY_MAX_TOXIC_SCORE = Decimal("-1E+9")
+EMPTY_COUNTERS = {
+    **DEFAULT_SUMMARY,
+    "min_toxic_score": EMPTY_MIN_TOXIC_SCORE,
+    "max_toxic_score": EMPTY_MAX_TOXIC_SCORE,
+}
+
+
+def get_shard_count() -> int:
+    """Number of Summary_Sessions counter rows (env: SUMMARY_SHARD_COUNT, default 1)."""
+    try:
+        return max(1, int(os.getenv("SUMMARY_SHARD_COUNT", DEFAULT_SHARD_COUNT)))
+    except ValueError:
+        return DEFAULT_SHARD_COUNT
+
+
+def get_shard_ids() -> list:
+    """Return the summary_id of every counter row."""
+    return list(range(1, get_shard_count() + 1))
+
+
+def _to_decimal(value, default="0") -> Decimal:
+    if value is None:
+        return Decimal(default)
+    try:
+        return Decimal(str(value))
+    except Exception:
+        return Decimal(default)
+
+
+def record_session_aggregate(db_handler, toxic_score, filter_violations) -> bool:
+    """
+    Add one completed session to the summary counters.
+
+    Args:
+        db_handler: DatabaseHandler instance
+        toxic_score: Toxic score of the session
+        filter_violations: Number of filter violations of the session
+
+    Returns:
+        True if the counters were updated, False otherwise
+    """
+    score = _to_decimal(toxic_score)
+    key = {"summary_id": random.choice(get_shard_ids())}
+
+    item = db_handler.update_aggregates(
+        SUMMARY_TABLE,
+        key,
+        increments={
+            "sum_toxic_score": score,
+            "count_guys": 1,
+            "sum_filter_violations": int(filter_violations or 0),
+        },
+        minimums={"min_toxic_score": score},
+        maximums={"max_toxic_score": score},
+        sets={"last_update_date": datetime.now().strftime(DATE_FORMAT)},
+    )
+    if item is None:
+        return False
+
+    count = int(_to_decimal(item.get("count_guys")))
+    informational = {
+        # Per-row averages are informational only; readers recompute them from the sums
+        "avg_toxic_score": _to_decimal(item.get("sum_toxic_score")) / max(count, 1),
+        "avg_filter_violations": _to_decimal(item.get("sum_filter_violations")) / max(count, 1),
+    }
+    db_handler.update_aggregates(SUMMARY_TABLE, key, sets=informational)
+    return True
+
+
+def rebuild_summary(
+    db_handler,
+    sum_toxic_score,
+    count_guys,
+    sum_filter_violations,
+    min_toxic_score=None,
+    max_toxic_score=None,
+) -> bool:
+    """
+    Overwrite the summary counters with totals recomputed from all sessions.
+
+    Shard 1 receives the totals and the other shards are reset, so ``load_summary`` returns
+    exactly the given values. Sessions completed while a rebuild is running can be lost;
+    run it during maintenance (e.g. from the re-scoring job).
+
+    Args:
+        db_handler: DatabaseHandler instance
+        sum_toxic_score: Sum of the toxic scores of all sessions
+        count_guys: Number of sessions
+        sum_filter_violations: Sum of the filter violations of all sessions
+        min_toxic_score: Smallest toxic score (None if there are no sessions)
+        max_toxic_score: Largest toxic score (None if there are no sessions)
+
+    Returns:
+        True if every counter row was written, False otherwise
+    """
+    count = int(count_guys)
+    now = datetime.now().strftime(DATE_FORMAT)
+    if count > 0:
+        sum_toxic = _to_decimal(sum_toxic_score)
+        sum_filters = int(sum_filter_violations)
+        totals = {
+            "sum_toxic_score": sum_toxic,
+            "max_toxic_score": _to_decimal(max_toxic_score, DEFAULT_SUMMARY["max_toxic_score"]),
+            "min_toxic_score": _to_decimal(min_toxic_score, DEFAULT_SUMMARY["min_toxic_score"]),
+            "avg_toxic_score": sum_toxic / count,
+            "sum_filter_violations": sum_filters,
+            "avg_filter_violations": Decimal(sum_filters) / count,
+            "count_guys": count,
+        }
+    else:
+        totals = dict(EMPTY_COUNTERS)
+
+    written = True
+    for shard_id in get_shard_ids():
+        record = dict(totals) if shard_id == 1 else dict(EMPTY_COUNTERS)
+        record.update({"summary_id": shard_id, "last_update_date": now})
+        written = db_handler.upsert_record(SUMMARY_TABLE, record, key_column="summary_id") and written
+    return written
+
+
+def load_summary(db_handler) -> dict:
+    """
+    Read and merge all summary counter rows.
+
+    Args:
+        db_handler: DatabaseHandler instance
+
+    Returns:
+        Dictionary with sum/max/min/avg_toxic_score, sum/avg_filter_violations and count_guys
+    """
+    count = 0
+    sum_toxic = Decimal("0")
+    sum_filters = Decimal("0")
+    min_toxic = None
+    max_toxic = None
+
+    for shard_id in get_shard_ids():
+        row = db_handler.get_record(SUMMARY_TABLE, {"summary_id": shard_id})
+        if not row:
+            continue
+        row_count = int(_to_decimal(row.get("count_guys")))
+        # Deletes are subtracted from shard 1, so a shard can hold a negative share of the totals
+        count += row_count
+        sum_toxic += _to_decimal(row.get("sum_toxic_score"))
+        sum_filters += _to_decimal(row.get("sum_filter_violations"))
+        if row_count <= 0:
+            continue
+        if row.get("min_toxic_score") is not None:
+            row_min = _to_decimal(row.get("min_toxic_score"))
+            min_toxic = row_min if min_toxic is None else min(min_toxic, row_min)
+        if row.get("max_toxic_score") is not None:
+            row_max = _to_decimal(row.get("max_toxic_score"))
+            max_toxic = row_max if max_toxic is None else max(max_toxic, row_max)
+
+    if count <= 0:
+        return dict(DEFAULT_SUMMARY)
+
+    return {
+        "sum_toxic_score": sum_toxic,
+        "max_toxic_score": max_toxic if max_toxic is not None else DEFAULT_SUMMARY["max_toxic_score"],
+        "min_toxic_score": min_toxic if min_toxic is not None else DEFAULT_SUMMARY["min_toxic_score"],
+        "avg_toxic_score": sum_toxic / count,
+        "sum_filter_violations": int(sum_filters),
+        "avg_filter_violations": sum_filters / count,
+        "count_guys": count,
+    }
@@ -3,6 +3,7 @@ from decimal import Decimal
 from datetime import datetime
 from src.adapters.database.database_handler import DatabaseHandler
 from src.utils.constants import DATE_FORMAT
+from src.utils.summary_aggregates import EMPTY_MAX_TOXIC_SCORE, EMPTY_MIN_TOXIC_SCORE
 
 
 def initialize_summary_sessions(db_handler: DatabaseHandler) -> bool:
@@ -17,9 +18,7 @@ def initialize_summary_sessions(db_handler: DatabaseHandler) -> bool:
     """
     try:
         # Check if Summary_Sessions exists and has data
-        summary = db_handler.load_table("Summary_Sessions")
-        
-        if not summary.empty:
+        if db_handler.exists("Summary_Sessions", {"summary_id": 1}):
             print("[INFO] Summary_Sessions already has data, skipping initialization")
             return True
         
@@ -27,8 +26,9 @@ def initialize_summary_sessions(db_handler: DatabaseHandler) -> bool:
         default_record = {
             "summary_id": 1,
             "sum_toxic_score": Decimal("0"),
-            "max_toxic_score": Decimal("1"),  # Start at 1 (max possible is 1.0) - will be updated when real data comes
-            "min_toxic_score": Decimal("0"),  # Start at 0 (min possible is 0.0) - will be updated when real data comes
+            # Sentinels replaced by the first session's score (load_summary reports 0/1 until then)
+            "max_toxic_score": EMPTY_MAX_TOXIC_SCORE,
+            "min_toxic_score": EMPTY_MIN_TOXIC_SCORE,
             "avg_toxic_score": Decimal("0.5"),  # Default average
             "sum_filter_violations": 0,
             "avg_filter_violations": Decimal("0"),
@@ -1,179 +1,230 @@
-"""Utility functions for updating Summary_Sessions table when records are deleted."""
-from decimal import Decimal
-from typing import Optional
+"""Utility functions for updating Summary_Sessions table when records are deleted.
+
+Deleted sessions are subtracted from the aggregates instead of recomputing them from
+session_responses: sums and counts with negative increments, and the score histograms
+(``src/utils/score_histogram.py``) with negative bin counts. The histograms and their
+per-bin extremes give the lowest and highest remaining scores, so min/max move to the
+next real score when the session holding them is deleted. ``delete_sessions`` removes many sessions and updates the
+aggregates once for the whole batch.
+"""
+import math
+from datetime import datetime
+from typing import Iterable, Optional, Tuple
+import numpy as np
 from src.adapters.database.database_handler import DatabaseHandler
+from src.utils.constants import DATE_FORMAT
+from src.utils.recent_scores import remove_from_recent_scores
+from src.utils.score_histogram import (
+    exact_score_range,
+    histogram_counts,
+    histogram_extremes,
+    load_score_histogram,
+    rebuild_score_histogram,
+    remove_from_score_histogram,
+)
+from src.utils.summary_aggregates import (
+    SUMMARY_TABLE,
+    _to_decimal,
+    get_shard_ids,
+    load_summary,
+    rebuild_summary,
+)
 
+# Only these session_responses columns are needed to recompute the summary
+SCORE_COLUMNS = ["toxic_score", "filter_violations"]
 
-def update_summary_after_delete(
-    db_handler: DatabaseHandler,
-    deleted_toxic_score: Optional[float] = None,
-    deleted_filter_violations: Optional[int] = None,
+# Tables holding a row per session, keyed by the session id in the 'id' column
+SESSION_TABLES = [
+    "session_responses",
+    "session_gtk_responses",
+    "session_feedback",
+    "session_toxicity_rating",
+    "session_insights",
+]
+
+
+def _to_number(value, default: float = 0.0) -> float:
+    """Stored score as float (default if missing or not numeric)."""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return default
+    return default if math.isnan(number) else number
+
+
+def update_summary_after_deletes(
+    db_handler: DatabaseHandler, deleted_sessions: Iterable[Tuple[float, int]]
 ) -> bool:
     """
-    Update Summary_Sessions table after a record is deleted.
-    
+    Remove deleted sessions from Summary_Sessions and the score histograms in one pass.
+
     Args:
         db_handler: DatabaseHandler instance
-        deleted_toxic_score: Toxic score of the deleted record (optional, will be recalculated if None)
-        deleted_filter_violations: Filter violations of the deleted record (optional, will be recalculated if None)
-        
+        deleted_sessions: (toxic_score, filter_violations) of every deleted session
+
     Returns:
         True if update was successful, False otherwise
     """
+    deleted = [(_to_number(t), int(_to_number(f))) for t, f in deleted_sessions]
+    if not deleted:
+        return True
+
     try:
-        # Load current summary
-        summary = db_handler.load_table("Summary_Sessions")
-        
-        if summary.empty:
+        if not db_handler.exists(SUMMARY_TABLE, {"summary_id": 1}):
             print("[WARNING] Summary_Sessions is empty, cannot update after delete")
             return False
-        
-        row = summary.iloc[0]
-        
-        # Get current values
-        sum_toxic_score = Decimal(str(row.get("sum_toxic_score", 0)))
-        count_guys = int(row.get("count_guys", 0))
-        sum_filter_violations = int(row.get("sum_filter_violations", 0))
-        max_toxic_score = Decimal(str(row.get("max_toxic_score", 1)))
-        min_toxic_score = Decimal(str(row.get("min_toxic_score", 0)))
-        
-        # If deleted values not provided, recalculate from remaining records
-        if deleted_toxic_score is None or deleted_filter_violations is None:
-            # Recalculate from all remaining session_responses
-            try:
-                session_responses = db_handler.load_table("session_responses")
-                if not session_responses.empty:
-                    if deleted_toxic_score is None:
-                        # Recalculate sum and averages from remaining records
-                        if "toxic_score" in session_responses.columns:
-                            sum_toxic_score = Decimal(str(session_responses["toxic_score"].sum()))
-                            count_guys = len(session_responses)
-                            if count_guys > 0:
-                                avg_toxic_score = sum_toxic_score / Decimal(str(count_guys))
-                                max_toxic_score = Decimal(str(session_responses["toxic_score"].max()))
-                                min_toxic_score = Decimal(str(session_responses["toxic_score"].min()))
-                            else:
-                                avg_toxic_score = Decimal("0")
-                                max_toxic_score = Decimal("0")
-                                min_toxic_score = Decimal("0")
-                        else:
-                            # No toxic_score column, set to defaults
-                            sum_toxic_score = Decimal("0")
-                            count_guys = len(session_responses)
-                            avg_toxic_score = Decimal("0")
-                            max_toxic_score = Decimal("0")
-                            min_toxic_score = Decimal("0")
-                    else:
-                        # Use provided deleted_toxic_score
-                        sum_toxic_score = sum_toxic_score - Decimal(str(deleted_toxic_score))
-                        count_guys = max(0, count_guys - 1)
-                        if count_guys > 0:
-                            avg_toxic_score = sum_toxic_score / Decimal(str(count_guys))
-                            # Recalculate max/min from remaining records
-                            if "toxic_score" in session_responses.columns:
-                                max_toxic_score = Decimal(str(session_responses["toxic_score"].max()))
-                                min_toxic_score = Decimal(str(session_responses["toxic_score"].min()))
-                        else:
-                            avg_toxic_score = Decimal("0")
-                            max_toxic_score = Decimal("0")
-                            min_toxic_score = Decimal("0")
-                    
-                    if deleted_filter_violations is None:
-                        # Recalculate filter violations from remaining records
-                        if "filter_violations" in session_responses.columns:
-                            sum_filter_violations = int(session_responses["filter_violations"].sum())
-                        else:
-                            sum_filter_violations = 0
-                    else:
-                        # Use provided deleted_filter_violations
-                        sum_filter_violations = max(0, sum_filter_violations - deleted_filter_violations)
-                else:
-                    # No remaining records
-                    count_guys = 0
-                    sum_toxic_score = Decimal("0")
-                    avg_toxic_score = Decimal("0")
-                    max_toxic_score = Decimal("0")
-                    min_toxic_score = Decimal("0")
-                    sum_filter_violations = 0
-            except Exception as e:
-                print(f"[WARNING] Could not recalculate from remaining records: {e}")
-                # Fallback: subtract provided values or set to defaults
-                if deleted_toxic_score is not None:
-                    sum_toxic_score = max(Decimal("0"), sum_toxic_score - Decimal(str(deleted_toxic_score)))
-                count_guys = max(0, count_guys - 1)
-                if count_guys > 0:
-                    avg_toxic_score = sum_toxic_score / Decimal(str(count_guys))
-                else:
-                    avg_toxic_score = Decimal("0")
-                    max_toxic_score = Decimal("0")
-                    min_toxic_score = Decimal("0")
-                
-                if deleted_filter_violations is not None:
-                    sum_filter_violations = max(0, sum_filter_violations - deleted_filter_violations)
-        else:
-            # Use provided deleted values
-            sum_toxic_score = max(Decimal("0"), sum_toxic_score - Decimal(str(deleted_toxic_score)))
-            count_guys = max(0, count_guys - 1)
-            sum_filter_violations = max(0, sum_filter_violations - deleted_filter_violations)
-            
-            if count_guys > 0:
-                avg_toxic_score = sum_toxic_score / Decimal(str(count_guys))
-                avg_filter_violations = Decimal(str(sum_filter_violations)) / Decimal(str(count_guys))
-                
-                # Recalculate max/min from remaining records
-                try:
-                    session_responses = db_handler.load_table("session_responses")
-                    if not session_responses.empty and "toxic_score" in session_responses.columns:
-                        max_toxic_score = Decimal(str(session_responses["toxic_score"].max()))
-                        min_toxic_score = Decimal(str(session_responses["toxic_score"].min()))
-                except:
-                    pass  # Keep existing max/min if recalculation fails
-            else:
-                avg_toxic_score = Decimal("0")
-                avg_filter_violations = Decimal("0")
-                max_toxic_score = Decimal("0")
-                min_toxic_score = Decimal("0")
-        
-        # Calculate avg_filter_violations
-        if count_guys > 0:
-            avg_filter_violations = Decimal(str(sum_filter_violations)) / Decimal(str(count_guys))
-        else:
-            avg_filter_violations = Decimal("0")
-        
-        # Note: max_id tracking removed - IDs are now hash-based and order-agnostic
-        # We no longer need to track max IDs since session_ids are generated deterministically
-        # from user_id + boyfriend_name, not sequentially
-        
-        # Prepare update dictionary
-        # DynamoDB requires Decimal types for numeric values, not float
-        # CSV adapter will handle Decimal conversion automatically
-        from datetime import datetime
-        from src.utils.constants import DATE_FORMAT
-        update_dict = {
-            "sum_toxic_score": sum_toxic_score,  # Keep as Decimal for DynamoDB
-            "max_toxic_score": max_toxic_score,  # Keep as Decimal for DynamoDB
-            "min_toxic_score": min_toxic_score,  # Keep as Decimal for DynamoDB
-            "avg_toxic_score": avg_toxic_score,  # Keep as Decimal for DynamoDB
-            "sum_filter_violations": sum_filter_violations,  # int is fine
-            "avg_filter_violations": avg_filter_violations,  # Keep as Decimal for DynamoDB
-            "count_guys": count_guys,  # int is fine
-            # max_id fields kept for backward compatibility but set to 0 (no longer tracked)
-            "max_id_session_responses": 0,
-            "max_id_gtk_responses": 0,
-            "max_id_feedback": 0,
-            "max_id_session_toxicity_rating": 0,
+
+        toxic_scores = np.array([t for t, _ in deleted], dtype=np.float64)
+        violations = np.array([f for _, f in deleted], dtype=np.int64)
+        previous = load_summary(db_handler)
+
+        remove_from_score_histogram(db_handler, toxic_scores, violations)
+        db_handler.update_aggregates(
+            SUMMARY_TABLE,
+            {"summary_id": 1},
+            increments={
+                "sum_toxic_score": -_to_decimal(float(toxic_scores.sum())),
+                "count_guys": -len(deleted),
+                "sum_filter_violations": -int(violations.sum()),
+            },
+        )
+
+        summary = load_summary(db_handler)
+        count_guys = int(summary["count_guys"])
+        if count_guys <= 0:
+            rebuild_summary(db_handler, 0, 0, 0)
+            print("[OK] Updated Summary_Sessions after delete. New count_guys: 0")
+            return True
+
+        # min/max only move if a deleted session held them; the histogram and its bin
+        # extremes then give the lowest/highest remaining score
+        min_toxic_score = previous["min_toxic_score"]
+        max_toxic_score = previous["max_toxic_score"]
+        if toxic_scores.min() <= float(min_toxic_score) or toxic_scores.max() >= float(max_toxic_score):
+            low, high = exact_score_range(db_handler, load_score_histogram(db_handler))
+            if toxic_scores.min() <= float(min_toxic_score) and low is not None:
+                min_toxic_score = _to_decimal(low)
+            if toxic_scores.max() >= float(max_toxic_score) and high is not None:
+                max_toxic_score = _to_decimal(high)
+
+        # Every shard gets the merged min/max, so load_summary returns them whatever shard
+        # the deleted sessions were counted in
+        sets = {
+            "min_toxic_score": min_toxic_score,
+            "max_toxic_score": max_toxic_score,
             "last_update_date": datetime.now().strftime(DATE_FORMAT),
         }
-        
-        # Update Summary_Sessions
-        db_handler.update_record("Summary_Sessions", {"summary_id": 1}, update_dict)
-        print(f"[OK] Updated Summary_Sessions after delete. New count_guys: {count_guys}, avg_toxic_score: {float(avg_toxic_score):.4f}")
-        
+        for shard_id in get_shard_ids():
+            if db_handler.exists(SUMMARY_TABLE, {"summary_id": shard_id}):
+                db_handler.update_aggregates(SUMMARY_TABLE, {"summary_id": shard_id}, sets=sets)
+
+        print(
+            f"[OK] Updated Summary_Sessions after deleting {len(deleted)} session(s). "
+            f"New count_guys: {count_guys}, avg_toxic_score: {float(summary['avg_toxic_score']):.4f}"
+        )
         return True
-        
+
     except Exception as e:
         print(f"[ERROR] Failed to update Summary_Sessions after delete: {e}")
         import traceback
         print(f"[ERROR] Traceback: {traceback.format_exc()}")
         return False
 
+
+def rebuild_summary_from_sessions(db_handler: DatabaseHandler) -> bool:
+    """
+    Recompute Summary_Sessions and the score histograms from session_responses.
+
+    This reads the toxic_score and filter_violations columns of every session; use it
+    only when the scores of deleted sessions are unknown.
+    """
+    try:
+        df = db_handler.load_table("session_responses", columns=SCORE_COLUMNS)
+    except FileNotFoundError:
+        df = None
+    if df is None or df.empty or "toxic_score" not in df.columns:
+        toxic_scores = np.empty(0)
+        violations = np.empty(0)
+    else:
+        toxic_scores = np.array([_to_number(v) for v in df["toxic_score"]], dtype=np.float64)
+        column = df["filter_violations"] if "filter_violations" in df.columns else [0] * len(df)
+        violations = np.array([int(_to_number(v)) for v in column], dtype=np.int64)
+
+    count = len(toxic_scores)
+    written = rebuild_summary(
+        db_handler,
+        float(toxic_scores.sum()),
+        count,
+        int(violations.sum()),
+        float(toxic_scores.min()) if count else None,
+        float(toxic_scores.max()) if count else None,
+    )
+    toxic_counts, filter_counts = histogram_counts(toxic_scores, violations)
+    written = rebuild_score_histogram(
+        db_handler, toxic_counts, filter_counts, *histogram_extremes(toxic_scores)
+    ) and written
+    print(f"[OK] Rebuilt Summary_Sessions from session_responses. New count_guys: {count}")
+    return written
+
+
+def update_summary_after_delete(
+    db_handler: DatabaseHandler,
+    deleted_toxic_score: Optional[float] = None,
+    deleted_filter_violations: Optional[int] = None,
+) -> bool:
+    """
+    Update Summary_Sessions table after a record is deleted.
+
+    Args:
+        db_handler: DatabaseHandler instance
+        deleted_toxic_score: Toxic score of the deleted record (optional, will be recalculated if None)
+        deleted_filter_violations: Filter violations of the deleted record (optional, will be recalculated if None)
+
+    Returns:
+        True if update was successful, False otherwise
+    """
+    if deleted_toxic_score is None or deleted_filter_violations is None:
+        # Nothing to subtract; recompute from the remaining records
+        try:
+            return rebuild_summary_from_sessions(db_handler)
+        except Exception as e:
+            print(f"[ERROR] Failed to update Summary_Sessions after delete: {e}")
+            return False
+    return update_summary_after_deletes(db_handler, [(deleted_toxic_score, deleted_filter_violations)])
+
+
+def delete_sessions(db_handler: DatabaseHandler, session_ids: Iterable) -> int:
+    """
+    Delete sessions from all session tables and update the aggregates once for the batch.
+
+    Each session's scores are read with a key lookup before its rows are deleted, so the
+    session_responses table is never scanned. The sessions are also cleared from the
+    recent-scores ring shown on the results graph.
+
+    Args:
+        db_handler: DatabaseHandler instance
+        session_ids: Session ids (the 'id' column of the session tables)
+
+    Returns:
+        Number of sessions deleted from session_responses
+    """
+    # Make sure the histograms exist before rows disappear (they are seeded on first load)
+    load_score_histogram(db_handler)
+
+    session_ids = [int(session_id) for session_id in session_ids]
+    deleted = []
+    for session_id in session_ids:
+        record = db_handler.get_record("session_responses", {"id": session_id})
+        for table_name in SESSION_TABLES:
+            try:
+                removed = db_handler.delete_record(table_name, session_id, id_column="id")
+            except Exception as e:
+                print(f"[WARNING] Could not delete {session_id} from {table_name}: {e}")
+                continue
+            if removed and table_name == "session_responses" and record is not None:
+                deleted.append((record.get("toxic_score"), record.get("filter_violations")))
+
+    if deleted:
+        update_summary_after_deletes(db_handler, deleted)
+    remove_from_recent_scores(db_handler, session_ids)
+    return len(deleted)
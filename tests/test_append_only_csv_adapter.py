@@ -0,0 +1,57 @@
+"""Tests for the append-only CSV adapter."""
+import os
+import pytest
+from src.adapters.database.append_only_csv_adapter import AppendOnlyCSVAdapter
+
+
+@pytest.fixture
+def adapter(tmp_path):
+    csv_adapter = AppendOnlyCSVAdapter(compact_bytes=10 * 1024 * 1024)
+    csv_adapter.data_dir = str(tmp_path)
+    return csv_adapter
+
+
+def test_log_is_folded_into_view(adapter, tmp_path):
+    adapter.add_record("session_feedback", {"id": 1, "user_id": "u1", "rating": 4})
+    adapter.add_record("session_feedback", {"id": 2, "user_id": "u2", "rating": 5})
+    adapter.update_record("session_feedback", {"id": 1}, {"rating": 2})
+    assert adapter.delete_record("session_feedback", 2)
+    assert not adapter.delete_record("session_feedback", 3)
+
+    # Writes only touch the log until compaction
+    assert not os.path.exists(tmp_path / "session_feedback.csv")
+    df = adapter.load_table("session_feedback")
+    assert df["id"].tolist() == [1]
+    assert adapter.get_record("session_feedback", {"id": 1})["rating"] == 2
+
+
+def test_compact_rewrites_snapshot(adapter, tmp_path):
+    adapter.add_record("session_feedback", {"id": 1, "user_id": "u1", "rating": 4})
+    adapter.upsert_record("session_feedback", {"id": 1, "user_id": "u1", "rating": 3})
+    adapter.add_record("session_feedback", {"id": 2, "user_id": "u2", "rating": 5})
+    adapter.compact("session_feedback")
+
+    assert not os.path.exists(tmp_path / "session_feedback.log")
+    df = adapter.load_table("session_feedback")
+    assert df.sort_values("id")["rating"].tolist() == [3, 5]
+
+
+def test_writes_do_not_fold_the_view(adapter, monkeypatch):
+    adapter.add_record("session_feedback", {"id": 1, "user_id": "u1", "rating": 4})
+    adapter.compact("session_feedback")
+    adapter.add_record("session_feedback", {"id": 2, "user_id": "u2", "rating": 5})
+
+    def fail(table_name):
+        raise AssertionError("write loaded the whole table")
+
+    monkeypatch.setattr(adapter, "_load_view", fail)
+    assert adapter.upsert_record("session_feedback", {"id": 2, "user_id": "u2", "rating": 1})
+    assert not adapter.upsert_record("session_feedback", {"id": 1, "rating": 1}, overwrite=False)
+    assert adapter.write_batch([("session_feedback", {"id": 3, "user_id": "u3", "rating": 2})])
+    assert adapter.delete_record("session_feedback", 1)
+    assert not adapter.delete_record("session_feedback", 1)
+    monkeypatch.undo()
+
+    df = adapter.load_table("session_feedback").sort_values("id")
+    assert df["id"].tolist() == [2, 3]
+    assert df["rating"].tolist() == [1, 2]
@@ -0,0 +1,110 @@
+"""Tests for the process-wide DynamoDB connection pool."""
+import threading
+from src.infrastructure import connection_manager
+from src.infrastructure.connection_manager import ConnectionManager, ConnectionPool
+
+
+class _FakeMeta:
+    client = None
+
+
+class _FakeTable:
+    def __init__(self, resource):
+        self.resource = resource
+
+    def scan(self, Segment=0, **kwargs):
+        self.resource.scans.append(threading.get_ident())
+        return {"Items": [{"id": Segment}]}
+
+
+class _FakeResource:
+    instances = []
+
+    def __init__(self):
+        self.meta = _FakeMeta()
+        self.thread = threading.get_ident()
+        self.scans = []
+        _FakeResource.instances.append(self)
+
+    def Table(self, table_name):
+        return _FakeTable(self)
+
+
+class _FakeSession:
+    created = 0
+
+    def __init__(self, **kwargs):
+        _FakeSession.created += 1
+        self.kwargs = kwargs
+
+    def client(self, service_name, config=None):
+        return ("client", service_name, config)
+
+    def resource(self, service_name, config=None):
+        return _FakeResource()
+
+
+def _make_manager(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test-key")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test-secret")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-west-1")
+    return ConnectionManager()
+
+
+def test_pool_reuses_session(monkeypatch):
+    monkeypatch.setattr(connection_manager.boto3, "Session", _FakeSession)
+    _FakeSession.created = 0
+    pool = ConnectionPool(max_pool_connections=7)
+    monkeypatch.setattr(connection_manager, "_pool", pool)
+
+    first = _make_manager(monkeypatch).connect()
+    second = _make_manager(monkeypatch).connect()
+
+    assert first is second
+    assert first.meta.client[0] == "client"
+    assert _FakeSession.created == 1
+    stats = pool.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+    assert pool.build_config().max_pool_connections == 7
+
+
+def test_pool_is_thread_safe(monkeypatch):
+    monkeypatch.setattr(connection_manager.boto3, "Session", _FakeSession)
+    _FakeSession.created = 0
+    pool = ConnectionPool()
+    monkeypatch.setattr(connection_manager, "_pool", pool)
+    _make_manager(monkeypatch)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(ConnectionManager().connect()))
+        for _ in range(16)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert _FakeSession.created == 1
+    # One resource per thread, all bound to the single shared client
+    assert len({id(r) for r in results}) == 16
+    assert all(r.meta.client is results[0].meta.client for r in results)
+    assert pool.stats()["hits"] + pool.stats()["misses"] == 16
+
+
+def test_parallel_scan_uses_a_resource_per_thread(monkeypatch):
+    from src.adapters.database.dynamodb_adapter import DynamoDBAdapter
+
+    monkeypatch.setattr(connection_manager.boto3, "Session", _FakeSession)
+    monkeypatch.setattr(_FakeResource, "instances", [])
+    monkeypatch.setattr(connection_manager, "_pool", ConnectionPool())
+    _make_manager(monkeypatch)
+
+    df = DynamoDBAdapter(scan_segments=4).load_table("session_responses")
+
+    assert sorted(df["id"]) == [0, 1, 2, 3]
+    # Every scan ran on the thread that created its resource
+    resources = _FakeResource.instances
+    assert sum(len(r.scans) for r in resources) == 4
+    assert all(thread == r.thread for r in resources for thread in r.scans)
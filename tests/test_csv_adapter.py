@@ -0,0 +1,152 @@
+"""Tests for key-based lookups in the CSV adapter."""
+import pytest
+from src.adapters.database.csv_adapter import CSVAdapter
+
+
+@pytest.fixture
+def adapter(tmp_path):
+    csv_adapter = CSVAdapter()
+    csv_adapter.data_dir = str(tmp_path)
+    return csv_adapter
+
+
+def test_get_record_and_exists(adapter):
+    adapter.add_record("session_feedback", {"id": 11, "user_id": "u1", "rating": 4})
+    adapter.add_record("session_feedback", {"id": 12, "user_id": "u2", "rating": 5})
+
+    assert adapter.exists("session_feedback", {"id": 12})
+    assert not adapter.exists("session_feedback", {"id": 13})
+    record = adapter.get_record("session_feedback", {"id": "12"})
+    assert record["user_id"] == "u2"
+    assert record["rating"] == 5
+    assert adapter.get_record("missing_table", {"id": 1}) is None
+
+
+def test_upsert_record_replaces_existing(adapter):
+    assert adapter.upsert_record("session_feedback", {"id": 21, "user_id": "u1", "rating": 1})
+    assert adapter.upsert_record("session_feedback", {"id": 21, "user_id": "u1", "rating": 3})
+    assert not adapter.upsert_record(
+        "session_feedback", {"id": 21, "user_id": "u1", "rating": 5}, overwrite=False
+    )
+
+    df = adapter.load_table("session_feedback")
+    assert len(df) == 1
+    assert adapter.get_record("session_feedback", {"id": 21})["rating"] == 3
+
+    # The key is matched like the key index matches it, whatever its type
+    assert adapter.upsert_record("session_feedback", {"id": "21", "feedback_rating": 9})
+    assert len(adapter.load_table("session_feedback")) == 1
+    assert adapter.get_record("session_feedback", {"id": 21})["feedback_rating"] == 9
+
+
+def test_update_aggregates_concurrent_increments(adapter):
+    import threading
+
+    def worker(score):
+        for _ in range(10):
+            adapter.update_aggregates(
+                "Summary_Sessions",
+                {"summary_id": 1},
+                increments={"count_guys": 1, "sum_toxic_score": score},
+                minimums={"min_toxic_score": score},
+                maximums={"max_toxic_score": score},
+            )
+
+    threads = [threading.Thread(target=worker, args=(s,)) for s in (-0.5, 0.25, 0.75)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    record = adapter.get_record("Summary_Sessions", {"summary_id": 1})
+    assert record["count_guys"] == 30
+    assert record["sum_toxic_score"] == pytest.approx(5.0)
+    assert record["min_toxic_score"] == -0.5
+    assert record["max_toxic_score"] == 0.75
+
+
+def test_question_repository_caches_catalogs(adapter, monkeypatch):
+    from src.adapters.database.catalog_cache import CatalogCache
+    from src.adapters.database.database_handler import DatabaseHandler
+    from src.adapters.database import question_repository
+
+    cache = CatalogCache(ttl_seconds=60)
+    monkeypatch.setattr(question_repository, "get_catalog_cache", lambda: cache)
+    handler = DatabaseHandler()
+    handler.backend = adapter
+    adapter.add_record("RedFlagCategories", {"Category_ID": 1, "Category_Name_EN": "Control", "Category_Name_TR": "Kontrol"})
+
+    repository = question_repository.QuestionRepository(handler)
+    assert repository.get_category_names("EN") == {1: "Control"}
+    assert repository.get_category_names("EN") == {1: "Control"}
+    assert cache.stats()["hits"] == 1
+
+    # A changed file is noticed through the version token before the TTL expires
+    adapter.update_record("RedFlagCategories", {"Category_ID": 1}, {"Category_Name_EN": "Isolation"})
+    assert repository.get_category_names("EN") == {1: "Isolation"}
+
+
+def test_update_records_and_iter_table(adapter):
+    for session_id in range(1, 6):
+        adapter.add_record("session_responses", {"id": session_id, "toxic_score": 0.0, "Q1": session_id})
+
+    applied = adapter.update_records(
+        "session_responses",
+        [({"id": 2}, {"toxic_score": 0.5}), ({"id": "4"}, {"toxic_score": 0.75}), ({"id": 99}, {"toxic_score": 1})],
+    )
+
+    assert applied == 2
+    chunks = list(adapter.iter_table("session_responses", chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert adapter.get_record("session_responses", {"id": 4})["toxic_score"] == 0.75
+    assert adapter.get_record("session_responses", {"id": 3})["toxic_score"] == 0.0
+
+
+def test_query_index_by_user_and_boyfriend(adapter):
+    adapter.add_record("session_responses", {"id": 1, "user_id": "u1", "boyfriend_name": "Ali"})
+    adapter.add_record("session_responses", {"id": 2, "user_id": "u1", "boyfriend_name": "Veli"})
+    adapter.add_record("session_responses", {"id": 3, "user_id": "u2", "boyfriend_name": "Ali"})
+
+    records = adapter.query_index("session_responses", {"user_id": "u1", "boyfriend_name": "Veli"})
+    assert [r["id"] for r in records] == [2]
+    assert adapter.query_index("session_responses", {"user_id": "u3", "boyfriend_name": "Ali"}) == []
+    assert adapter.query_index("missing_table", {"user_id": "u1"}) == []
+
+
+def test_load_table_with_columns_and_dtypes(adapter):
+    adapter.add_record("session_responses", {"id": 1, "email": "a@b.c", "toxic_score": 0.25, "Q1": 3})
+    adapter.add_record("session_responses", {"id": 2, "email": "d@e.f", "toxic_score": 0.5, "Q1": 7})
+
+    df = adapter.load_table("session_responses", columns=["toxic_score", "id", "missing"], dtypes={"id": "float64"})
+
+    assert list(df.columns) == ["toxic_score", "id", "missing"]
+    assert str(df["id"].dtype) == "float64"
+    assert df["missing"].isna().all()
+    assert df["toxic_score"].tolist() == [0.25, 0.5]
+
+
+def test_write_batch_upserts_into_several_tables(adapter):
+    adapter.add_record("session_responses", {"id": 1, "toxic_score": 0.1})
+
+    assert adapter.write_batch([
+        ("session_responses", {"id": 1, "toxic_score": 0.4, "filter_violations": 2}),
+        ("session_responses", {"id": 2, "toxic_score": 0.6}),
+        ("session_toxicity_rating", {"id": 1, "toxicity_rating": 8}),
+    ])
+
+    assert adapter.get_record("session_responses", {"id": 1})["toxic_score"] == 0.4
+    assert adapter.get_record("session_responses", {"id": 1})["filter_violations"] == 2
+    assert adapter.get_record("session_responses", {"id": 2})["toxic_score"] == 0.6
+    assert adapter.get_record("session_toxicity_rating", {"id": 1})["toxicity_rating"] == 8
+
+
+def test_lookups_with_multiline_fields(adapter):
+    adapter.add_record("session_insights", {"id": 1, "user_id": "u1", "insights": "first\nsecond\nthird"})
+    adapter.add_record("session_insights", {"id": 2, "user_id": "u2", "insights": "plain"})
+    adapter.add_record("session_insights", {"id": 3, "user_id": "u1", "insights": "a;b\n\"quoted\""})
+
+    assert adapter.get_record("session_insights", {"id": 1})["insights"] == "first\nsecond\nthird"
+    assert adapter.get_record("session_insights", {"id": 2})["insights"] == "plain"
+    assert adapter.get_record("session_insights", {"id": 3})["insights"] == 'a;b\n"quoted"'
+    rows = adapter.query_index("session_insights", {"user_id": "u1"})
+    assert [row["id"] for row in rows] == [1, 3]
@@ -0,0 +1,46 @@
+"""Tests for the content-addressed insight cache."""
+from src.services.insight_cache import (
+    InsightCache,
+    bucket_score,
+    insight_cache_key,
+    personalize,
+    to_template,
+)
+
+
+def test_similar_prompts_share_a_key():
+    assert bucket_score(0.431, step=0.02) == bucket_score(0.438, step=0.02) == 0.44
+    assert insight_cache_key("groq: m", "EN", "Score:  44%\n") == insight_cache_key("groq: m", "EN", "Score: 44%")
+    assert insight_cache_key("groq: m", "EN", "Score: 44%") != insight_cache_key("groq: m", "TR", "Score: 44%")
+
+
+def test_names_are_templated_and_restored():
+    template = to_template("Ann, Annabel is not the one.", user_name="Ann", bf_name="Annabel")
+    assert template == "{{user_name}}, {{bf_name}} is not the one."
+    assert personalize(template, "Eve", "Bob") == "Eve, Bob is not the one."
+
+
+def test_lru_eviction_ttl_and_metrics():
+    cache = InsightCache(max_entries=2, ttl_seconds=60, persistent=False)
+    cache.put("a", "insight a")
+    cache.put("b", "insight b")
+    assert cache.get("a") == "insight a"
+    cache.put("c", "insight c")  # evicts "b", the least recently used
+
+    assert cache.get("b") is None
+    assert cache.get("c") == "insight c"
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+
+    expired = InsightCache(max_entries=2, ttl_seconds=-1, persistent=False)
+    expired.put("a", "insight a")
+    assert expired.get("a") is None
+    assert expired.stats()["expired"] == 1
+
+
+def test_names_are_matched_case_insensitively_or_not_cached():
+    assert to_template("Ahmet seems controlling.", user_name="ayse", bf_name="ahmet") == "{{bf_name}} seems controlling."
+    assert to_template("İREM, irem", user_name="irem", bf_name="Bob") == "{{user_name}}, {{user_name}}"
+    # A suffixed form is left in the text, and a one-letter name cannot be replaced safely
+    assert to_template("Ahmetle konuş.", user_name="Ayşe", bf_name="Ahmet") is None
+    assert to_template("A is fine.", user_name="A", bf_name="Bob") is None
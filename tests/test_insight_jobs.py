@@ -0,0 +1,81 @@
+"""Tests for starting background insight generation."""
+import pytest
+from concurrent.futures import Future
+from types import SimpleNamespace
+from src.adapters.database.database_handler import DatabaseHandler
+from src.adapters.database.question_repository import QuestionRepository
+from src.application import insight_jobs
+from src.application.insight_jobs import start_insight_generation
+from src.services import insight_service
+from src.services.insight_cache import InsightCache
+from src.utils.summary_aggregates import record_session_aggregate
+
+
+class FakeInsightService:
+    submitted = {}
+
+    def __init__(self, enabled, db_handler=None):
+        pass
+
+    def streams(self, language):
+        return False
+
+    def submit_survey_insights(self, **kwargs):
+        FakeInsightService.submitted = kwargs
+        return None
+
+    def close(self):
+        pass
+
+
+def test_prompt_uses_average_of_stored_sessions(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOCAL_DB_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_DB_PATH", str(tmp_path / "test.db"))
+    monkeypatch.setattr(insight_service, "InsightService", FakeInsightService)
+    record_session_aggregate(DatabaseHandler(), 0.2, 0)
+    record_session_aggregate(DatabaseHandler(), 0.6, 1)
+
+    # The results page hasn't loaded the summary yet
+    session = SimpleNamespace(state={"llm_enabled": True}, user_details={"language": "EN", "name": "Ann"})
+    start_insight_generation(session)
+
+    assert FakeInsightService.submitted["avg_toxic_score"] == pytest.approx(0.4)
+    assert float(session.state["avg_toxic_score"]) == pytest.approx(0.4)
+
+
+def test_database_handlers_are_closed(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOCAL_DB_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_DB_PATH", str(tmp_path / "test.db"))
+    opened = []
+
+    class TrackedHandler(DatabaseHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.closed = False
+            opened.append(self)
+
+        def close(self):
+            self.closed = True
+            super().close()
+
+    class CompletedInsightService(FakeInsightService):
+        def submit_survey_insights(self, **kwargs):
+            future = Future()
+            future.set_result(("insights", {}))
+            return future
+
+    monkeypatch.setattr(QuestionRepository, "get_redflag_questions", lambda self, order=None: [])
+    monkeypatch.setattr(QuestionRepository, "get_filter_questions", lambda self, order=None: [])
+    monkeypatch.setattr(insight_jobs, "DatabaseHandler", TrackedHandler)
+    monkeypatch.setattr(insight_jobs, "get_insight_cache", lambda: InsightCache(persistent=True))
+    monkeypatch.setattr(insight_service, "InsightService", CompletedInsightService)
+
+    session = SimpleNamespace(
+        state={"llm_enabled": True, "redflag_responses": {"1": 4}, "filter_responses": {"1": 1}},
+        user_details={"language": "EN", "name": "Ann"},
+    )
+    assert start_insight_generation(session)
+
+    # Summary, red flag questions, filter questions and the insight cache
+    assert len(opened) == 4
+    assert all(handler.closed for handler in opened)
@@ -0,0 +1,107 @@
+"""Tests for streaming insights through the insight service."""
+import threading
+import time
+import pytest
+from src.services.insight_prompt_builder import InsightPromptBuilder
+from src.services.insight_service import InsightService, InsightStream, get_insight_latency_stats
+
+
+def test_stream_yields_chunks_as_they_arrive():
+    stream = InsightStream()
+    stream.append("Hello")
+
+    def produce():
+        time.sleep(0.05)
+        stream.append(", world")
+        stream.finish()
+
+    threading.Thread(target=produce).start()
+    assert "".join(stream.iter_chunks(first_chunk_deadline=time.time() + 5)) == "Hello, world"
+    assert stream.finished
+
+
+def test_stream_stops_at_deadline_without_chunks():
+    stream = InsightStream()
+    assert list(stream.iter_chunks(first_chunk_deadline=time.time() + 0.05)) == []
+
+
+def test_bilingual_response_is_split_without_translation():
+    service = InsightService.__new__(InsightService)
+    service.language_mode = "bilingual"
+    service._translate_to_turkish = lambda text: pytest.fail("translator should not be used")
+    response = 'Sure! {"EN": "Take care.", "TR": "Kendine iyi bak."}'
+
+    assert InsightPromptBuilder.parse_bilingual(response) == {"EN": "Take care.", "TR": "Kendine iyi bak."}
+    assert service._localize(response, "TR", service._llm_language("TR")) == "Kendine iyi bak."
+    assert get_insight_latency_stats()["TR:bilingual"]["translations"] == 0
+
+
+def test_failover_result_is_cached_under_answering_model(monkeypatch):
+    from src.adapters.llm import llm_router
+    from src.ports.llm_port import LLMPort
+    from src.services import insight_service
+    from src.services.insight_cache import PARTNER_PLACEHOLDER, USER_PLACEHOLDER, InsightCache, insight_cache_key
+
+    class FakeAdapter(LLMPort):
+        provider = "fake"
+
+        def __init__(self, model_name, answer=None):
+            self.model_name = model_name
+            self.answer = answer
+
+        def generate_insights(self, **kwargs):
+            return self.answer
+
+    llm_router._health.clear()
+    router = llm_router.LLMRouter(
+        [FakeAdapter("broken-model"), FakeAdapter("working-model", "Ann, Bob is fine.")],
+        hedge_after=0, failure_threshold=3, cooldown=60,
+    )
+    cache = InsightCache(max_entries=10, ttl_seconds=60, persistent=False)
+    monkeypatch.setattr(insight_service.LLMFactory, "create", staticmethod(lambda: router))
+    monkeypatch.setattr(insight_service, "get_insight_cache", lambda: cache)
+
+    service = InsightService(enabled=True)
+    args = dict(toxic_score=0.4, avg_toxic_score=0.5, filter_violations=0)
+    insights, metadata = service.submit_survey_insights(user_name="Ann", bf_name="Bob", **args).result(timeout=10)
+
+    assert insights == "Ann, Bob is fine."
+    assert metadata["model_name"] == "fake: working-model"
+    prompt = service._build_prompt_text(USER_PLACEHOLDER, PARTNER_PLACEHOLDER, 0.4, 0.5, 0, None, None, "EN")
+    assert cache.get(insight_cache_key("fake: working-model", "EN", prompt)) == "{{user_name}}, {{bf_name}} is fine."
+    assert cache.get(insight_cache_key("fake: broken-model", "EN", prompt)) is None
+
+
+def test_interrupted_stream_is_a_failed_generation(monkeypatch):
+    from src.adapters.llm import llm_router
+    from src.ports.llm_port import LLMPort
+    from src.services import insight_service
+    from src.services.insight_cache import InsightCache
+
+    class BrokenStreamAdapter(LLMPort):
+        provider = "fake"
+        model_name = "broken-stream"
+
+        def generate_insights(self, **kwargs):
+            return None
+
+        def stream_insights(self, **kwargs):
+            yield "Ann, Bob "
+            raise ConnectionError("connection reset")
+
+    llm_router._health.clear()
+    router = llm_router.LLMRouter([BrokenStreamAdapter()], hedge_after=0, failure_threshold=3, cooldown=60)
+    cache = InsightCache(max_entries=10, ttl_seconds=60, persistent=False)
+    monkeypatch.setattr(insight_service.LLMFactory, "create", staticmethod(lambda: router))
+    monkeypatch.setattr(insight_service, "get_insight_cache", lambda: cache)
+
+    stream = InsightStream()
+    service = InsightService(enabled=True)
+    future = service.submit_survey_insights(
+        user_name="Ann", bf_name="Bob", toxic_score=0.4, avg_toxic_score=0.5, filter_violations=0, stream=stream,
+    )
+
+    assert future.result(timeout=10) == (None, None)
+    assert stream.text == "Ann, Bob "
+    assert cache.stats()["stores"] == 0
+    assert llm_router.get_provider_health()["fake:broken-stream"].consecutive_failures == 1
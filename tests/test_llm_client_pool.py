@@ -0,0 +1,39 @@
+"""Tests for the process-wide LLM client pool."""
+import threading
+from src.infrastructure.llm_connection_manager import LLMClientPool
+
+
+def test_pool_reuses_client_across_threads():
+    pool = LLMClientPool(max_age=60, max_failures=3)
+    key = pool.pool_key("groq", "model", "secret-key", 20)
+    built = []
+
+    def build():
+        built.append(object())
+        return built[-1]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.acquire(key, build))) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(built) == 1
+    assert all(client is built[0] for client in results)
+    assert "secret-key" not in repr(key)
+    assert pool.stats()["misses"] == 1
+
+
+def test_client_is_rebuilt_after_failures():
+    pool = LLMClientPool(max_age=60, max_failures=2)
+    key = pool.pool_key("huggingface", "model", "secret-key")
+    first = pool.acquire(key, object)
+
+    pool.report_failure(key)
+    assert pool.acquire(key, object) is first
+    pool.report_failure(key)
+    second = pool.acquire(key, object)
+
+    assert second is not first
+    assert pool.stats()["refreshes"] == 1
@@ -0,0 +1,33 @@
+"""Tests for the LLM rate limiter."""
+import pytest
+from src.services.llm_rate_limiter import ProviderLimits, RateLimiter, RateLimitExceeded
+
+
+def _limiter(requests_per_minute, tokens_per_minute, **kwargs):
+    limiter = RateLimiter(**kwargs)
+    limiter._limits["groq"] = ProviderLimits(requests_per_minute, tokens_per_minute)
+    return limiter
+
+
+def test_requests_over_budget_wait_then_fail_fast():
+    # 600 requests/minute refills one request every 0.1s; a burst of 600 is allowed
+    limiter = _limiter(600, 0, max_wait=1)
+    for _ in range(600):
+        assert limiter.acquire("groq") < 0.05
+
+    assert 0.05 < limiter.acquire("groq") < 0.5
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire("groq", max_wait=0.01)
+
+    stats = limiter.stats("groq")["groq"]
+    assert (stats["granted"], stats["rejected"], stats["waited"]) == (601, 1, 1)
+
+
+def test_token_budget_is_shared_across_processes(tmp_path):
+    state_file = str(tmp_path / "llm_rate_limit.json")
+    first = _limiter(0, 1000, max_wait=0, state_file=state_file)
+    second = _limiter(0, 1000, max_wait=0, state_file=state_file)
+
+    first.acquire("groq", tokens=800)
+    with pytest.raises(RateLimitExceeded):
+        second.acquire("groq", tokens=800)
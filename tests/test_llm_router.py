@@ -0,0 +1,59 @@
+"""Tests for routing LLM requests over several providers."""
+import time
+from src.adapters.llm import llm_router
+from src.adapters.llm.llm_router import LLMRouter
+from src.ports.llm_port import LLMPort
+
+
+class FakeAdapter(LLMPort):
+    def __init__(self, model_name, answer=None, delay=0.0):
+        self.provider = "fake"
+        self.model_name = model_name
+        self.answer = answer
+        self.delay = delay
+        self.calls = 0
+
+    def generate_insights(self, user_name, bf_name, toxic_score, avg_toxic_score, filter_violations,
+                          violated_filter_questions=None, language="EN", top_redflag_questions=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.answer
+
+
+ARGS = dict(user_name="Ann", bf_name="Bob", toxic_score=0.4, avg_toxic_score=0.5, filter_violations=0)
+
+
+def setup_function():
+    llm_router._health.clear()
+
+
+def test_fails_over_and_ranks_failing_provider_last():
+    broken = FakeAdapter("broken-model")
+    working = FakeAdapter("working-model", answer="insights")
+    router = LLMRouter([broken, working], hedge_after=0, failure_threshold=2, cooldown=60)
+
+    assert router.generate_insights(**ARGS) == "insights"
+    assert router.model_name == "working-model"
+    assert router.generate_insights(**ARGS) == "insights"
+    assert (broken.calls, working.calls) == (1, 2)
+
+
+def test_circuit_opens_after_consecutive_failures():
+    broken = FakeAdapter("broken-model")
+    router = LLMRouter([broken], hedge_after=0, failure_threshold=2, cooldown=60)
+
+    assert router.generate_insights(**ARGS) is None
+    assert router.generate_insights(**ARGS) is None
+    assert router.generate_insights(**ARGS) is None
+    assert broken.calls == 2
+    assert llm_router.get_provider_health()["fake:broken-model"].open_until > time.time()
+
+
+def test_slow_provider_is_hedged():
+    slow = FakeAdapter("slow-model", answer="slow insights", delay=1.0)
+    fast = FakeAdapter("fast-model", answer="fast insights")
+    router = LLMRouter([slow, fast], hedge_after=0.05, failure_threshold=3, cooldown=60)
+
+    start = time.perf_counter()
+    assert router.generate_insights(**ARGS) == "fast insights"
+    assert time.perf_counter() - start < 0.9
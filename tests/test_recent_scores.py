@@ -0,0 +1,42 @@
+"""Tests for the recent-scores ring used by the results graph."""
+import pytest
+from src.adapters.database.database_handler import DatabaseHandler
+from src.utils.recent_scores import load_recent_scores, record_recent_score
+
+
+@pytest.fixture
+def db_handler(tmp_path):
+    handler = DatabaseHandler(local_backend="csv")
+    handler.backend.data_dir = str(tmp_path)
+    return handler
+
+
+def test_ring_keeps_latest_scores_in_order(db_handler, monkeypatch):
+    monkeypatch.setenv("RECENT_SCORES_SIZE", "5")
+    for session_id in range(1, 9):
+        assert record_recent_score(db_handler, session_id, session_id / 10)
+
+    assert load_recent_scores(db_handler) == [(4, 0.4), (5, 0.5), (6, 0.6), (7, 0.7), (8, 0.8)]
+
+
+def test_ring_is_seeded_from_session_responses(db_handler):
+    for session_id, end_time in ((11, "2025-01-03 10:00:00"), (12, "2025-01-01 10:00:00")):
+        db_handler.add_record(
+            "session_responses", {"id": session_id, "toxic_score": 0.5, "session_end_time": end_time}
+        )
+
+    assert load_recent_scores(db_handler) == [(12, 0.5), (11, 0.5)]
+    assert db_handler.get_record("Recent_Scores", {"recent_id": 1})["cursor"] == 2
+
+
+def test_deleted_and_rescored_sessions_leave_the_ring(db_handler):
+    from src.utils.recent_scores import update_recent_scores
+    from src.utils.summary_updater import delete_sessions
+
+    for session_id in (1, 2, 3):
+        db_handler.add_record("session_responses", {"id": session_id, "toxic_score": 0.5, "filter_violations": 0})
+        record_recent_score(db_handler, session_id, 0.5)
+
+    assert delete_sessions(db_handler, [2]) == 1
+    assert update_recent_scores(db_handler, {3: 0.9, 7: 0.1}) == 1
+    assert load_recent_scores(db_handler) == [(1, 0.5), (3, 0.9)]
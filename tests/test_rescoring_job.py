@@ -0,0 +1,44 @@
+"""Tests for the batch re-scoring job."""
+import pytest
+from src.adapters.database.database_handler import DatabaseHandler
+from src.domain.value_objects import FilterQuestion, RedFlagQuestion
+from src.services import rescoring_job
+from src.utils.summary_aggregates import load_summary
+
+
+class FakeRepository:
+    def __init__(self, db_handler):
+        pass
+
+    def get_redflag_questions(self):
+        return [RedFlagQuestion(question_id=1, weight=1.0)]
+
+    def get_filter_questions(self):
+        return [FilterQuestion(filter_id=1, filter_name="a", scoring="Limit", upper_limit=5, question_tr="", question_en="")]
+
+
+@pytest.fixture
+def db_handler(tmp_path, monkeypatch):
+    monkeypatch.setattr(rescoring_job, "QuestionRepository", FakeRepository)
+    handler = DatabaseHandler(local_backend="csv")
+    handler.backend.data_dir = str(tmp_path)
+    return handler
+
+
+def test_csv_rescoring_over_several_chunks(db_handler):
+    sessions = [
+        {"id": i, "name": f"guy {i}", "Q1": i % 11, "F1": i % 7, "toxic_score": -1, "filter_violations": 9}
+        for i in range(1, 251)
+    ]
+    db_handler.write_batch([(rescoring_job.SESSION_TABLE, session) for session in sessions])
+
+    stats = rescoring_job.rescore_sessions(db_handler, chunk_size=60)
+
+    assert (stats.rows, stats.changed, stats.written) == (250, 250, 250)
+    df = db_handler.load_table(rescoring_job.SESSION_TABLE).sort_values("id")
+    assert df["id"].tolist() == list(range(1, 251))
+    assert df["toxic_score"].astype(float).tolist() == pytest.approx([(i % 11) / 10 for i in range(1, 251)])
+    assert df["filter_violations"].astype(int).tolist() == [int(i % 7 >= 5) for i in range(1, 251)]
+    summary = load_summary(db_handler)
+    assert summary["count_guys"] == 250
+    assert float(summary["sum_toxic_score"]) == pytest.approx(sum((i % 11) / 10 for i in range(1, 251)))
@@ -0,0 +1,38 @@
+"""Tests for the score histograms used for percentile ranks."""
+import pytest
+from src.adapters.database.database_handler import DatabaseHandler
+from src.utils.score_histogram import load_score_histogram, record_score_histogram
+
+
+@pytest.fixture
+def db_handler(tmp_path):
+    handler = DatabaseHandler(local_backend="csv")
+    handler.backend.data_dir = str(tmp_path)
+    return handler
+
+
+def test_percentile_rank_across_shards(db_handler, monkeypatch):
+    monkeypatch.setenv("SUMMARY_SHARD_COUNT", "3")
+    for score, violations in ((-0.2, 0), (0.1, 1), (0.3, 1), (0.5, 2)):
+        assert record_score_histogram(db_handler, score, violations)
+    record_score_histogram(db_handler, 0.5, 2, count=-1)
+
+    histogram = load_score_histogram(db_handler)
+    assert histogram.count == 3
+    assert histogram.percentile_rank(0.9) == 100.0
+    assert histogram.percentile_rank(0.2) == pytest.approx(200 / 3)
+    assert histogram.percentile_rank(0.1) == pytest.approx(50.0)
+    assert histogram.filter_percentile_rank(1) == pytest.approx(200 / 3)
+    assert histogram.max_score() == pytest.approx(0.3)
+
+
+def test_histogram_is_seeded_from_session_responses(db_handler):
+    for session_id, score in ((1, 0.2), (2, 0.4)):
+        db_handler.add_record(
+            "session_responses", {"id": session_id, "toxic_score": score, "filter_violations": 0}
+        )
+
+    histogram = load_score_histogram(db_handler)
+    assert histogram.count == 2
+    assert histogram.percentile_rank(0.3) == 50.0
+    assert db_handler.get_record("Score_Histogram", {"histogram_id": 1})["count"] == 2
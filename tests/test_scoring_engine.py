@@ -0,0 +1,40 @@
+"""Tests for the vectorized scoring engine."""
+import math
+import numpy as np
+import pytest
+from src.domain.value_objects import FilterQuestion, RedFlagQuestion
+from src.services.scoring_engine import ScoringEngine
+
+
+QUESTIONS = [
+    RedFlagQuestion(question_id=1, category_id=1, category_name="Control", scoring="Range(0-10)", weight=2.0),
+    RedFlagQuestion(question_id=2, category_id=1, category_name="Control", scoring="YES/NO", weight=-1.0),
+    RedFlagQuestion(question_id=3, category_id=2, category_name="Respect", scoring="Range(0-10)", weight=0.0),
+]
+FILTERS = [
+    FilterQuestion(filter_id=1, filter_name="a", scoring="YES/NO", upper_limit=1, question_tr="", question_en=""),
+    FilterQuestion(filter_id=2, filter_name="b", scoring="Limit", upper_limit=3, question_tr="", question_en=""),
+]
+
+
+def test_toxic_score_matches_step_formula():
+    engine = ScoringEngine(QUESTIONS)
+    responses = {"Q1": 8, "Q2": 7, "Q3": math.nan}
+    # (2*8 - 1*7) / (2*10 + 1*7)
+    assert engine.toxic_score(responses) == pytest.approx(9 / 27)
+    assert engine.toxic_score({"Q1": math.nan}) == 0.0
+
+    matrix = engine.answers_matrix([responses, {"Q1": 10, "Q2": 0, "Q3": 5}])
+    np.testing.assert_allclose(engine.toxic_scores(matrix), [9 / 27, 20 / 27])
+
+
+def test_category_scores_and_filter_violations():
+    engine = ScoringEngine(QUESTIONS, FILTERS)
+    scores = engine.category_scores({"Q1": 8, "Q2": 7, "Q3": 4}, {1: "Kontrol", 2: "Saygi"})
+    # Control: weights 2 and -1 sum to 1 -> (16 - 7) / 1; Respect: weight 0 counts as 1
+    assert scores == {"Kontrol": (9.0, 2), "Saygi": (4.0, 1)}
+    assert engine.category_scores({"Q3": 4}) == {"Respect": (4.0, 1)}
+    assert engine.filter_violations({"F1": 1, "F2": 2}) == 1
+    np.testing.assert_array_equal(
+        engine.filter_violations_batch(engine.filter_matrix([{"F1": 0}, {"F1": 1, "F2": 3}])), [0, 2]
+    )
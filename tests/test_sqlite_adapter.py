@@ -0,0 +1,64 @@
+"""Tests for the SQLite adapter."""
+import threading
+from decimal import Decimal
+import pytest
+from src.adapters.database.sqlite_adapter import SQLiteAdapter
+
+
+@pytest.fixture
+def adapter(tmp_path):
+    sqlite_adapter = SQLiteAdapter(db_path=str(tmp_path / "test.db"))
+    sqlite_adapter.data_dir = str(tmp_path)
+    return sqlite_adapter
+
+
+def test_records_round_trip(adapter):
+    assert adapter.upsert_record("session_feedback", {"id": 1, "user_id": "u1", "rating": 3})
+    assert not adapter.upsert_record(
+        "session_feedback", {"id": 1, "user_id": "u1", "rating": 5}, overwrite=False
+    )
+    adapter.update_record("session_feedback", {"id": "1"}, {"rating": 4, "comment": "ok"})
+
+    record = adapter.get_record("session_feedback", {"id": 1})
+    assert record["rating"] == 4
+    assert record["comment"] == "ok"
+    assert adapter.exists("session_feedback", {"id": 1})
+    assert adapter.delete_record("session_feedback", 1)
+    assert not adapter.exists("session_feedback", {"id": 1})
+    assert adapter.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_update_aggregates_is_atomic(adapter):
+    def worker(score):
+        other = SQLiteAdapter(db_path=adapter.db_path)
+        for _ in range(20):
+            other.update_aggregates(
+                "Summary_Sessions",
+                {"summary_id": 1},
+                increments={"count_guys": 1, "sum_toxic_score": Decimal(str(score))},
+                minimums={"min_toxic_score": score},
+                maximums={"max_toxic_score": score},
+            )
+
+    threads = [threading.Thread(target=worker, args=(s,)) for s in (-0.5, 0.25, 0.75)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    record = adapter.get_record("Summary_Sessions", {"summary_id": 1})
+    assert record["count_guys"] == 60
+    assert record["sum_toxic_score"] == pytest.approx(10.0)
+    assert record["min_toxic_score"] == -0.5
+    assert record["max_toxic_score"] == 0.75
+
+
+def test_rolled_back_columns_are_not_cached(adapter):
+    adapter.upsert_record("session_feedback", {"id": 1, "rating": 3})
+    assert not adapter.write_batch([
+        ("session_feedback", {"id": 2, "newcol": "x"}),
+        ("session_feedback", {"id": "not-a-number", "rating": 1}),
+    ])
+
+    assert adapter.upsert_record("session_feedback", {"id": 4, "newcol": "y"})
+    assert adapter.get_record("session_feedback", {"id": 4})["newcol"] == "y"
@@ -0,0 +1,66 @@
+"""Tests for the incremental Summary_Sessions delete path."""
+import pytest
+from src.adapters.database.database_handler import DatabaseHandler
+from src.utils.score_histogram import load_score_histogram, record_score_histogram
+from src.utils.summary_aggregates import load_summary, record_session_aggregate
+from src.utils.summary_updater import delete_sessions
+
+
+@pytest.fixture
+def db_handler(tmp_path):
+    handler = DatabaseHandler(local_backend="csv")
+    handler.backend.data_dir = str(tmp_path)
+    return handler
+
+
+def test_delete_sessions_updates_aggregates_once(db_handler, monkeypatch):
+    monkeypatch.setenv("SUMMARY_SHARD_COUNT", "2")
+    sessions = {1: (0.1, 0), 2: (0.4, 1), 3: (0.8, 2), 4: (-0.3, 0)}
+    for session_id, (score, violations) in sessions.items():
+        db_handler.add_record(
+            "session_responses", {"id": session_id, "toxic_score": score, "filter_violations": violations}
+        )
+        record_session_aggregate(db_handler, score, violations)
+        record_score_histogram(db_handler, score, violations)
+
+    assert delete_sessions(db_handler, [3, 4, 99]) == 2
+
+    summary = load_summary(db_handler)
+    assert summary["count_guys"] == 2
+    assert float(summary["sum_toxic_score"]) == pytest.approx(0.5)
+    assert summary["sum_filter_violations"] == 1
+    assert float(summary["max_toxic_score"]) == pytest.approx(0.4)
+    assert float(summary["min_toxic_score"]) == pytest.approx(0.1)
+    assert load_score_histogram(db_handler).count == 2
+    assert db_handler.get_record("session_responses", {"id": 3}) is None
+
+
+def test_first_sessions_replace_initial_min_max(db_handler):
+    from src.utils.summary_initializer import initialize_summary_sessions
+
+    initialize_summary_sessions(db_handler)
+    assert load_summary(db_handler)["max_toxic_score"] == 1
+    record_session_aggregate(db_handler, 0.3, 0)
+    record_session_aggregate(db_handler, 0.6, 0)
+
+    summary = load_summary(db_handler)
+    assert float(summary["min_toxic_score"]) == pytest.approx(0.3)
+    assert float(summary["max_toxic_score"]) == pytest.approx(0.6)
+
+
+def test_deleting_the_max_keeps_exact_extremes(db_handler):
+    # 0.4013 and 0.4017 share a histogram bin; 0.7 and -0.2 are the current extremes
+    sessions = {1: 0.4013, 2: 0.4017, 3: 0.7, 4: -0.2, 5: 0.1}
+    for session_id, score in sessions.items():
+        db_handler.add_record("session_responses", {"id": session_id, "toxic_score": score, "filter_violations": 0})
+        record_session_aggregate(db_handler, score, 0)
+        record_score_histogram(db_handler, score, 0)
+
+    delete_sessions(db_handler, [3, 4])
+    summary = load_summary(db_handler)
+    assert float(summary["max_toxic_score"]) == pytest.approx(0.4017, abs=1e-9)
+    assert float(summary["min_toxic_score"]) == pytest.approx(0.1, abs=1e-9)
+
+    # The bin keeps another session, so its extreme is recomputed from session_responses
+    delete_sessions(db_handler, [2])
+    assert float(load_summary(db_handler)["max_toxic_score"]) == pytest.approx(0.4013, abs=1e-9)
@@ -0,0 +1,69 @@
+"""Tests for the write-behind queue."""
+import json
+import os
+import pytest
+from src.adapters.database.database_handler import DatabaseHandler
+from src.services.write_behind import WriteBehindQueue, WriteJob
+
+
+@pytest.fixture
+def sqlite_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOCAL_DB_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_DB_PATH", str(tmp_path / "test.db"))
+    return tmp_path
+
+
+def test_jobs_are_written_and_journal_compacted(sqlite_env):
+    write_queue = WriteBehindQueue(spill_dir=str(sqlite_env / "spill"))
+    write_queue.submit(WriteJob(records=[("session_feedback", {"id": 7, "rating": 4})]))
+
+    assert write_queue.drain(timeout=10)
+    write_queue.close()
+    assert write_queue.pending == 0
+    assert not os.path.exists(write_queue.journal_path)
+    assert DatabaseHandler().get_record("session_feedback", {"id": 7})["rating"] == 4
+
+
+def test_journal_of_dead_process_is_replayed(sqlite_env):
+    spill_dir = sqlite_env / "spill"
+    spill_dir.mkdir()
+    orphan = {"op": "put", "job": {"records": [["session_feedback", {"id": 8, "rating": 2}]], "job_id": "a"}}
+    done = {"op": "put", "job": {"records": [["session_feedback", {"id": 9, "rating": 5}]], "job_id": "b"}}
+    lines = [orphan, done, {"op": "done", "job_id": "b"}]
+    (spill_dir / "999999999.jsonl").write_text("".join(json.dumps(line) + "\n" for line in lines))
+
+    write_queue = WriteBehindQueue(spill_dir=str(spill_dir))
+    write_queue.submit(WriteJob(records=[("session_feedback", {"id": 10, "rating": 3})]))
+    assert write_queue.drain(timeout=10)
+    write_queue.close()
+
+    db_handler = DatabaseHandler()
+    assert db_handler.get_record("session_feedback", {"id": 8})["rating"] == 2
+    assert db_handler.get_record("session_feedback", {"id": 9}) is None
+    assert not (spill_dir / "999999999.jsonl").exists()
+
+
+def test_replay_skips_journaled_steps(sqlite_env, monkeypatch):
+    from src.services import write_behind
+
+    applied = []
+    monkeypatch.setitem(write_behind.AGGREGATE_STEPS, "summary", lambda db, s: applied.append("summary") or True)
+    monkeypatch.setitem(write_behind.AGGREGATE_STEPS, "recent_scores", lambda db, s: applied.append("recent") or True)
+    monkeypatch.setitem(write_behind.AGGREGATE_STEPS, "score_histogram", lambda db, s: applied.append("hist") or True)
+
+    spill_dir = sqlite_env / "spill"
+    spill_dir.mkdir()
+    scores = {"session_id": 11, "toxic_score": 0.4, "filter_violations": 0}
+    put = {"op": "put", "job": {"records": [["session_feedback", {"id": 11, "rating": 1}]],
+                                "session_scores": scores, "job_id": "c"}}
+    lines = [put, {"op": "step", "job_id": "c", "step": "records"}, {"op": "step", "job_id": "c", "step": "summary"}]
+    (spill_dir / "999999999.jsonl").write_text("".join(json.dumps(line) + "\n" for line in lines))
+
+    write_queue = WriteBehindQueue(spill_dir=str(spill_dir))
+    write_queue.submit(WriteJob(records=[]))
+    assert write_queue.drain(timeout=10)
+    write_queue.close()
+
+    # The crashed run wrote the records and the summary; only the other steps are replayed
+    assert applied == ["recent", "hist"]
+    assert DatabaseHandler().get_record("session_feedback", {"id": 11}) is None